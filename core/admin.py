@@ -1,12 +1,20 @@
+from collections import Counter, defaultdict
+
 from django.contrib import admin
-import csv
-from django.http import HttpResponse
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.urls import path
 from django.utils import timezone
 from django.db.models import Q
 from django.contrib.admin import SimpleListFilter
 
 # Register your models here.
-from core.models import WorkShop, WorkshopRegistration
+from core.models import EmailStatus, OutboxEmail, WaitlistEntry, WorkShop, WorkshopRegistration
+from core.waitlist import promote_from_waitlist
+from core.streaming import streaming_csv_response
+from core.forms import INGESTED_IMAGE_OVERRIDES, RegistrationImportForm
+from core.importers import import_registrations
+from core.search import filter_workshops
 
 
 class WorkshopStatusFilter(SimpleListFilter):
@@ -49,6 +57,7 @@ class AttendanceFilter(SimpleListFilter):
 
 @admin.register(WorkShop)
 class WorkShopAdmin(admin.ModelAdmin):
+    formfield_overrides = INGESTED_IMAGE_OVERRIDES
     list_display = (
         'workshop_name', 
         'workshop_date', 
@@ -71,6 +80,9 @@ class WorkShopAdmin(admin.ModelAdmin):
         ('Media', {
             'fields': ('workshop_image_header',)
         }),
+        ('Capacity', {
+            'fields': ('physical_capacity', 'virtual_capacity')
+        }),
         ('Status', {
             'fields': ('is_ended',)
         }),
@@ -80,17 +92,37 @@ class WorkShopAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text index instead of icontains scans over three columns
+        if not search_term:
+            return queryset, False
+        return filter_workshops(queryset, search_term), False
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # A raised capacity frees seats for people on the waitlist
+        if change and {'physical_capacity', 'virtual_capacity'} & set(form.changed_data):
+            promoted = promote_from_waitlist(obj.pk)
+            if promoted:
+                self.message_user(request, f"{len(promoted)} waitlisted attendee(s) promoted.")
+    
+    # The counts come from the denormalized counters on the workshop row
+    # itself, so the changelist needs no per-row COUNT queries and the
+    # columns sort on plain columns
     def get_registrations_count(self, obj):
-        return obj.registrations.count()
+        return obj.registrations_count
     get_registrations_count.short_description = 'Total Registrations'
+    get_registrations_count.admin_order_field = 'registrations_count'
     
     def get_physical_attendees(self, obj):
-        return obj.registrations.filter(will_attend_physical=True).count()
+        return obj.physical_registrations_count
     get_physical_attendees.short_description = 'Physical'
+    get_physical_attendees.admin_order_field = 'physical_registrations_count'
     
     def get_virtual_attendees(self, obj):
-        return obj.registrations.filter(will_attend_physical=False).count()
+        return obj.virtual_registrations_count
     get_virtual_attendees.short_description = 'Virtual'
+    get_virtual_attendees.admin_order_field = 'virtual_registrations_count'
 
 
 @admin.register(WorkshopRegistration)
@@ -119,6 +151,7 @@ class WorkshopRegistrationAdmin(admin.ModelAdmin):
     )
     ordering = ('-registration_date',)
     date_hierarchy = 'registration_date'
+    list_select_related = ('workshop',)
     
     fieldsets = (
         ('Participant Information', {
@@ -140,6 +173,57 @@ class WorkshopRegistrationAdmin(admin.ModelAdmin):
     
     actions = ['export_as_csv', 'export_workshop_specific_csv']
     
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                'import-csv/',
+                self.admin_site.admin_view(self.import_csv_view),
+                name=f'{opts.app_label}_{opts.model_name}_import_csv',
+            ),
+        ] + super().get_urls()
+    
+    def import_csv_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        
+        result = None
+        form = RegistrationImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            try:
+                result = import_registrations(form.cleaned_data['csv_file'].file)
+            except (ValueError, UnicodeDecodeError) as e:
+                form.add_error('csv_file', str(e))
+            else:
+                self.message_user(
+                    request,
+                    f"Imported {result.created} registration(s); "
+                    f"{result.error_count} row(s) had errors."
+                )
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import registrations from CSV',
+            'form': form,
+            'result': result,
+        }
+        return TemplateResponse(
+            request, 'admin/core/workshopregistration/import_csv.html', context
+        )
+    
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        promote_from_waitlist(obj.workshop_id, {obj.will_attend_physical: 1})
+    
+    def delete_queryset(self, request, queryset):
+        freed = defaultdict(Counter)
+        for workshop_id, physical in queryset.values_list('workshop_id', 'will_attend_physical'):
+            freed[workshop_id][physical] += 1
+        super().delete_queryset(request, queryset)
+        for workshop_id, seats in freed.items():
+            promote_from_waitlist(workshop_id, seats)
+    
     def get_workshop_status(self, obj):
         if obj.workshop.is_ended:
             return "Completed"
@@ -151,6 +235,10 @@ class WorkshopRegistrationAdmin(admin.ModelAdmin):
             return "Upcoming"
     get_workshop_status.short_description = 'Workshop Status'
     
+    # Rows are read in chunks straight from a values_list() join, so an
+    # export holds one chunk in memory however many registrations it covers
+    export_chunk_size = 2000
+    
     def export_as_csv(self, request, queryset):
         meta = self.model._meta
         field_names = [
@@ -160,74 +248,132 @@ class WorkshopRegistrationAdmin(admin.ModelAdmin):
             'will_attend_physical', 'registration_date'
         ]
         
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename={}.csv'.format(
-            meta.verbose_name_plural.replace(' ', '_').lower()
-        )
-        writer = csv.writer(response)
-        
-        # Write header
+        # Header
         header = [
             'Name', 'Email', 'Phone', 'Workshop', 'Workshop Date',
             'Location', 'Experience', 'Physical Attendance', 'Registration Date'
         ]
-        writer.writerow(header)
+        values = queryset.values_list(*field_names).iterator(
+            chunk_size=self.export_chunk_size
+        )
         
-        # Write data rows
-        for obj in queryset:
-            row = [
-                obj.user_name,
-                obj.user_email,
-                obj.phone_number or 'N/A',
-                obj.workshop.workshop_name,
-                obj.workshop.workshop_date.strftime('%Y-%m-%d'),
-                obj.workshop.workshop_location,
-                obj.django_experience,
-                'Yes' if obj.will_attend_physical else 'No',
-                obj.registration_date.strftime('%Y-%m-%d %H:%M:%S')
-            ]
-            writer.writerow(row)
+        def rows():
+            yield header
+            for (user_name, user_email, phone_number, workshop_name,
+                 workshop_date, workshop_location, django_experience,
+                 will_attend_physical, registration_date) in values:
+                yield [
+                    user_name,
+                    user_email,
+                    phone_number or 'N/A',
+                    workshop_name,
+                    workshop_date.strftime('%Y-%m-%d'),
+                    workshop_location,
+                    django_experience,
+                    'Yes' if will_attend_physical else 'No',
+                    registration_date.strftime('%Y-%m-%d %H:%M:%S')
+                ]
         
-        return response
+        return streaming_csv_response(
+            rows(),
+            '{}.csv'.format(meta.verbose_name_plural.replace(' ', '_').lower())
+        )
     
     export_as_csv.short_description = "Export selected registrations as CSV"
     
     def export_workshop_specific_csv(self, request, queryset):
-        # Group by workshop for better organization
-        workshops = {}
-        for registration in queryset:
-            workshop_name = registration.workshop.workshop_name
-            if workshop_name not in workshops:
-                workshops[workshop_name] = []
-            workshops[workshop_name].append(registration)
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename=workshop_registrations_by_event.csv'
-        writer = csv.writer(response)
+        # Group by workshop for better organization: the database returns
+        # each workshop's registrations together, so a new group starts
+        # whenever the workshop name changes
+        values = queryset.order_by(
+            'workshop__workshop_name', 'registration_date', 'id'
+        ).values_list(
+            'workshop__workshop_name', 'user_name', 'user_email',
+            'phone_number', 'django_experience', 'will_attend_physical',
+            'registration_date'
+        ).iterator(chunk_size=self.export_chunk_size)
         
-        for workshop_name, registrations in workshops.items():
-            # Write workshop header
-            writer.writerow([f"Workshop: {workshop_name}"])
-            writer.writerow([
-                'Name', 'Email', 'Phone', 'Experience',
-                'Physical Attendance', 'Registration Date'
-            ])
-            
-            # Write registrations for this workshop
-            for reg in registrations:
-                row = [
-                    reg.user_name,
-                    reg.user_email,
-                    reg.phone_number or 'N/A',
-                    reg.django_experience,
-                    'Yes' if reg.will_attend_physical else 'No',
-                    reg.registration_date.strftime('%Y-%m-%d %H:%M:%S')
+        def rows():
+            current_workshop = None
+            for (workshop_name, user_name, user_email, phone_number,
+                 django_experience, will_attend_physical,
+                 registration_date) in values:
+                if workshop_name != current_workshop:
+                    if current_workshop is not None:
+                        # Add empty row between workshops
+                        yield []
+                    current_workshop = workshop_name
+                    # Write workshop header
+                    yield [f"Workshop: {workshop_name}"]
+                    yield [
+                        'Name', 'Email', 'Phone', 'Experience',
+                        'Physical Attendance', 'Registration Date'
+                    ]
+                yield [
+                    user_name,
+                    user_email,
+                    phone_number or 'N/A',
+                    django_experience,
+                    'Yes' if will_attend_physical else 'No',
+                    registration_date.strftime('%Y-%m-%d %H:%M:%S')
                 ]
-                writer.writerow(row)
-            
-            # Add empty row between workshops
-            writer.writerow([])
+            if current_workshop is not None:
+                yield []
         
-        return response
+        return streaming_csv_response(rows(), 'workshop_registrations_by_event.csv')
+    
+    export_workshop_specific_csv.short_description = "Export by workshop (grouped CSV)"
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = (
+        'user_name',
+        'workshop',
+        'user_email',
+        'joined_at',
+        'will_attend_physical',
+        'django_experience'
+    )
+    search_fields = (
+        'user_name',
+        'user_email',
+        'workshop__workshop_name'
+    )
+    list_filter = ('workshop', 'will_attend_physical', 'django_experience')
+    list_select_related = ('workshop',)
+    ordering = ('workshop', 'joined_at')
+    readonly_fields = ('joined_at',)
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'subject',
+        'to_email',
+        'status',
+        'attempts',
+        'next_attempt_at',
+        'created_at',
+        'sent_at'
+    )
+    search_fields = ('subject', 'to_email')
+    list_filter = ('status', 'created_at')
+    ordering = ('-created_at',)
+    date_hierarchy = 'created_at'
+    readonly_fields = (
+        'subject', 'body', 'content_subtype', 'from_email', 'to_email',
+        'headers', 'attachments', 'attempts', 'last_error',
+        'created_at', 'sent_at'
+    )
+    
+    actions = ['retry_now']
+    
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status=EmailStatus.SENT).update(
+            status=EmailStatus.PENDING,
+            next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f"{updated} email(s) queued for another attempt.")
     
-    export_workshop_specific_csv.short_description = "Export by workshop (grouped CSV)"
\ No newline at end of file
+    retry_now.short_description = "Retry selected emails now"
@@ -4,3 +4,24 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        # Register signal handlers
+        from core import signals  # noqa: F401
+        from core.cache_versions import track_collection
+        from core.images import register_image_variants
+        from core.models import WorkShop, WorkshopRegistration
+        from core.search import ensure_search_index
+
+        # Registrations change the counters shown in workshop responses
+        track_collection('workshops', WorkShop, WorkshopRegistration)
+        track_collection('workshop-calendar', WorkShop)
+        register_image_variants(WorkShop, 'workshop_image_header')
+
+        # Table rebuilds in later migrations drop the search triggers
+        post_migrate.connect(ensure_search_index, sender=self)
+
+        # Rebuilds the landing-page snapshot when its collections change
+        from core import site_snapshot  # noqa: F401
@@ -0,0 +1,117 @@
+"""
+Version stamps for the public API collections.
+
+Each collection ("workshops", "sponsors", ...) has a version stored in the
+configured cache. It is bumped by post_save/post_delete signals of every
+model that feeds the collection, once the writing transaction commits.
+The versions are what conditional GETs and cached responses are
+validated against, so checking freshness never touches the database.
+"""
+
+import logging
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY_PREFIX = 'core:collection-version:'
+
+# model class -> names of the collections it feeds
+_tracked_models = defaultdict(set)
+# callables notified with the collection name after each bump
+_version_listeners = []
+
+
+def _version_key(name):
+    return f'{VERSION_KEY_PREFIX}{name}'
+
+
+def _new_version():
+    # Nanosecond wall-clock stamps: unique per bump and usable as a
+    # Last-Modified time
+    return time.time_ns()
+
+
+def bump_version(name):
+    """Invalidate everything validated against the collection ``name``."""
+    cache.set(_version_key(name), _new_version(), None)
+    for listener in _version_listeners:
+        try:
+            listener(name)
+        except Exception:
+            logger.exception('Collection version listener %r failed', listener)
+
+
+def add_version_listener(listener):
+    """Call ``listener(name)`` whenever a collection version is bumped."""
+    if listener not in _version_listeners:
+        _version_listeners.append(listener)
+
+
+def bump_versions_for(model):
+    """
+    Bump every collection fed by ``model`` when the current transaction
+    commits (immediately in autocommit mode).
+
+    Bumping after commit means a reader can never see the new version while
+    the old data is still all it can read.
+    """
+    for name in _tracked_models.get(model, ()):
+        transaction.on_commit(lambda name=name: bump_version(name))
+
+
+def _bump_for_sender(sender, **kwargs):
+    if kwargs.get('raw'):
+        return
+    bump_versions_for(sender)
+
+
+def track_collection(name, *models):
+    """
+    Bump collection ``name`` whenever one of ``models`` is saved or deleted.
+
+    Writes that bypass model signals (queryset.update(), bulk_create())
+    must call bump_versions_for() themselves.
+    """
+    for model in models:
+        _tracked_models[model].add(name)
+        post_save.connect(
+            _bump_for_sender, sender=model, dispatch_uid=f'collection-version-save-{model._meta.label}'
+        )
+        post_delete.connect(
+            _bump_for_sender, sender=model, dispatch_uid=f'collection-version-delete-{model._meta.label}'
+        )
+
+
+def tracked_collections():
+    """Names of every registered collection, sorted."""
+    return sorted(set().union(*_tracked_models.values()))
+
+
+def get_versions(names):
+    """
+    Return {name: version} for the given collections.
+
+    A collection with no stored version (cold or evicted cache) starts a new
+    one, so a response cached against a lost version is never reused.
+    """
+    keys = {_version_key(name): name for name in names}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, name in keys.items():
+        version = found.get(key)
+        if version is None:
+            cache.add(key, _new_version(), None)
+            # Without a working cache every request gets a fresh version
+            version = cache.get(key) or _new_version()
+        versions[name] = version
+    return versions
+
+
+def version_timestamp(version):
+    """Convert a version stamp to whole epoch seconds (for Last-Modified)."""
+    return version // 1_000_000_000
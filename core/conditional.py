@@ -0,0 +1,67 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from core.cache_versions import get_versions, version_timestamp
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag/Last-Modified validators to a read-only API view and answers
+    matching If-None-Match/If-Modified-Since requests with 304.
+
+    The validators come from the version stamps of ``cache_collections``
+    (see core.cache_versions), so a 304 costs a cache lookup and neither
+    queries the database nor runs the serializer.
+    """
+    cache_collections = ()
+
+    def get_collection_versions(self):
+        return get_versions(self.cache_collections)
+
+    def get_etag_extra(self, request):
+        """
+        Extra values the response depends on besides the collections, e.g.
+        the current date for a view that filters on it.
+        """
+        return []
+
+    def get_validators(self, request):
+        versions = self.get_collection_versions()
+        # The same collection version renders differently per URL and per
+        # negotiated media type (JSON vs browsable API). The URL includes
+        # scheme and host: pagination links and media URLs are absolute.
+        fingerprint = '|'.join([
+            request.build_absolute_uri(),
+            request.accepted_media_type or '',
+            *(f'{name}={version}' for name, version in sorted(versions.items())),
+            *self.get_etag_extra(request),
+        ])
+        etag = '"%s"' % hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest()
+        last_modified = version_timestamp(max(versions.values())) if versions else None
+        return etag, last_modified
+
+    def set_validator_headers(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            return self.set_validator_headers(not_modified, etag, last_modified)
+
+        response = self.get_modified_response(request, etag, *args, **kwargs)
+        if 200 <= response.status_code < 300:
+            self.set_validator_headers(response, etag, last_modified)
+        return response
+
+    def get_modified_response(self, request, etag, *args, **kwargs):
+        """Build the full response when the client's copy is stale."""
+        return super().get(request, *args, **kwargs)
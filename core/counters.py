@@ -0,0 +1,178 @@
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from core.cache_versions import bump_versions_for
+from core.models import DjangoExperience, WorkShop, WorkshopRegistration
+
+
+class WorkshopFull(Exception):
+    """
+    Raised when a registration finds no free seat for its attendance type.
+    """
+
+
+# Errors raised when concurrent transactions lock each other out: MySQL
+# deadlock and lock wait timeout, PostgreSQL deadlock and serialization failure
+LOCK_CONFLICT_CODES = frozenset({1213, 1205, '40P01', '40001'})
+
+
+def is_lock_conflict(exc):
+    """Whether a database error is a deadlock or lock timeout."""
+    cause = exc.__cause__ or exc
+    code = getattr(cause, 'pgcode', None) or getattr(cause, 'sqlstate', None)
+    if code is None and cause.args:
+        code = cause.args[0]
+    return code in LOCK_CONFLICT_CODES
+
+
+# WorkShop counter field for each Django experience level
+EXPERIENCE_COUNTER_FIELDS = {
+    DjangoExperience.BEGINNER: 'beginner_registrations_count',
+    DjangoExperience.INTERMEDIATE: 'intermediate_registrations_count',
+    DjangoExperience.ADVANCED: 'advanced_registrations_count',
+}
+
+COUNTER_FIELDS = WorkShop.COUNTER_FIELDS
+
+
+def registration_counter_fields(will_attend_physical, django_experience):
+    """
+    Return the WorkShop counter fields a registration is counted in.
+    """
+    fields = ['registrations_count']
+    if will_attend_physical:
+        fields.append('physical_registrations_count')
+    else:
+        fields.append('virtual_registrations_count')
+    experience_field = EXPERIENCE_COUNTER_FIELDS.get(django_experience)
+    if experience_field:
+        fields.append(experience_field)
+    return fields
+
+
+def apply_counter_deltas(workshop_id, deltas):
+    """
+    Atomically add ``deltas`` ({field: amount}) to a workshop's counters.
+
+    The arithmetic happens in the database through F() expressions, so
+    concurrent registrations never overwrite each other's increments.
+    Decrements are clamped at zero so a drifted counter cannot block a
+    delete; ``reconcile_registration_counts`` repairs it afterwards.
+    """
+    updates = {}
+    for field, amount in deltas.items():
+        if amount > 0:
+            updates[field] = F(field) + amount
+        elif amount < 0:
+            updates[field] = Case(
+                When(**{f'{field}__gte': -amount}, then=F(field) + amount),
+                default=Value(0),
+            )
+    if not updates:
+        return 0
+    updated = WorkShop.objects.filter(pk=workshop_id).update(**updates)
+    bump_versions_for(WorkshopRegistration)
+    return updated
+
+
+def claim_registration_seat(workshop_id, will_attend_physical, django_experience):
+    """
+    Claim a seat and count the registration in one conditional UPDATE.
+
+    The UPDATE only matches the workshop while the attendance type's
+    counter is below its capacity (or no capacity is set). The database
+    serializes concurrent UPDATEs on the row, so the capacity can never be
+    exceeded however many registrations race for the last seat.
+    """
+    if will_attend_physical:
+        capacity_field, count_field = 'physical_capacity', 'physical_registrations_count'
+    else:
+        capacity_field, count_field = 'virtual_capacity', 'virtual_registrations_count'
+
+    seat_available = (
+        Q(**{f'{capacity_field}__isnull': True})
+        | Q(**{f'{count_field}__lt': F(capacity_field)})
+    )
+    fields = registration_counter_fields(will_attend_physical, django_experience)
+    claimed = WorkShop.objects.filter(seat_available, pk=workshop_id).update(**{
+        field: F(field) + 1 for field in fields
+    })
+    if not claimed:
+        raise WorkshopFull(
+            f"No {'physical' if will_attend_physical else 'virtual'} seats "
+            f"left for workshop {workshop_id}."
+        )
+    bump_versions_for(WorkshopRegistration)
+
+
+def _counter_filters():
+    """
+    Map each counter field to the registration filter it counts.
+    """
+    filters = {
+        'registrations_count': {},
+        'physical_registrations_count': {'will_attend_physical': True},
+        'virtual_registrations_count': {'will_attend_physical': False},
+    }
+    for experience, field in EXPERIENCE_COUNTER_FIELDS.items():
+        filters[field] = {'django_experience': experience}
+    return filters
+
+
+def registration_counts_annotations():
+    """
+    Aggregates that recompute every counter from WorkshopRegistration rows.
+    """
+    return {
+        f'actual_{field}': Count('registrations', filter=Q(**{
+            f'registrations__{key}': value for key, value in condition.items()
+        }))
+        for field, condition in _counter_filters().items()
+    }
+
+
+def _counter_subqueries():
+    """
+    Correlated COUNT subqueries, so a fix is computed at UPDATE time.
+    """
+    subqueries = {}
+    for field, condition in _counter_filters().items():
+        counted = (
+            WorkshopRegistration.objects
+            .filter(workshop=OuterRef('pk'), **condition)
+            .order_by()
+            .values('workshop')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        subqueries[field] = Coalesce(Subquery(counted), Value(0))
+    return subqueries
+
+
+def reconcile_registration_counts(workshop_ids=None, using=DEFAULT_DB_ALIAS):
+    """
+    Recompute the denormalized counters and fix any that have drifted.
+
+    Returns the list of workshops whose counters were corrected.
+    """
+    queryset = WorkShop.objects.using(using).order_by().annotate(**registration_counts_annotations())
+    if workshop_ids is not None:
+        queryset = queryset.filter(pk__in=workshop_ids)
+
+    fixed = []
+    for workshop in queryset.iterator():
+        if any(
+            getattr(workshop, field) != getattr(workshop, f'actual_{field}')
+            for field in COUNTER_FIELDS
+        ):
+            fixed.append(workshop)
+
+    if fixed:
+        # Recount in the UPDATE itself so registrations that land between
+        # the check above and this write are not lost.
+        WorkShop.objects.using(using).filter(pk__in=[workshop.pk for workshop in fixed]).update(
+            **_counter_subqueries()
+        )
+        bump_versions_for(WorkshopRegistration)
+    return fixed
@@ -1,56 +1,21 @@
-from ics import Calendar, Event
 from datetime import datetime, timedelta
 from django.core.mail import EmailMessage
 from django.template.loader import render_to_string
 from django.conf import settings
 from urllib.parse import urlencode
+from core.outbox import enqueue_email
+from core.ics_writer import registration_calendar
+from core.tokens import cancel_url
 
 
-def send_workshop_registration_email(registration):
+def build_workshop_registration_email(registration):
     """
-    Send workshop registration confirmation email with calendar invite
+    Build the workshop registration confirmation email with calendar invite
     """
     workshop = registration.workshop
     
-    # Create calendar event
-    c = Calendar()
-    e = Event()
-    e.name = workshop.workshop_name
-    
-    # Combine date and time
-    if workshop.workshop_time:
-        start_datetime = datetime.combine(
-            workshop.workshop_date,
-            workshop.workshop_time
-        )
-    else:
-        start_datetime = datetime.combine(
-            workshop.workshop_date,
-            datetime.min.time().replace(hour=9)
-        )
-    
-    # Set event duration (default 2 hours)
-    end_datetime = start_datetime + timedelta(hours=2)
-    
-    e.begin = start_datetime
-    e.end = end_datetime
-    e.location = workshop.workshop_location
-    
-    # Create description
-    attendance_type = (
-        "Physical" if registration.will_attend_physical else "Virtual"
-    )
-    e.description = (
-        f"Workshop: {workshop.workshop_name}\n"
-        f"Location: {workshop.workshop_location}\n"
-        f"Attendance: {attendance_type}\n\n"
-        f"{workshop.workshop_description or ''}\n\n"
-        f"Organized by Django Campus\n"
-        f"We look forward to seeing you!"
-    )
-    
-    c.events.add(e)
-    ics_content = str(c)
+    # Create calendar invite (workshop part is cached per revision)
+    ics_content = registration_calendar(registration)
     
     # Prepare email context
     context = {
@@ -59,7 +24,8 @@ def send_workshop_registration_email(registration):
         'registration': registration,
         'add_to_google_calendar_url': generate_google_calendar_link(
             workshop, registration
-        )
+        ),
+        'cancel_url': cancel_url(registration),
     }
     
     # Render email templates
@@ -91,6 +57,8 @@ Location: {workshop.workshop_location}
 
 Add to Google Calendar: {context['add_to_google_calendar_url']}
 
+Can't make it? Cancel your registration: {context['cancel_url']}
+
 Best regards,
 Django Campus Team
         """
@@ -121,13 +89,29 @@ Django Campus Team
         mimetype="text/calendar"
     )
     
-    # Send email
-    try:
-        email.send()
-        return True
-    except Exception as e:
-        print(f"Error sending email: {e}")
-        return False
+    return email
+
+
+def build_waitlist_promotion_email(registration):
+    """
+    Build the email telling a waitlisted person they now have a seat
+    """
+    email = build_workshop_registration_email(registration)
+    email.subject = (
+        f"A seat opened up: {registration.workshop.workshop_name}"
+    )
+    return email
+
+
+def queue_workshop_registration_email(registration):
+    """
+    Queue the registration confirmation email for the outbox worker.
+
+    Returns True once the email is queued; delivery happens later in the
+    send_queued_emails management command.
+    """
+    enqueue_email(build_workshop_registration_email(registration))
+    return True
 
 
 def generate_google_calendar_link(workshop, registration):
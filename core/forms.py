@@ -0,0 +1,42 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import models
+
+from core.uploads import ingest_image
+
+
+class IngestedImageField(forms.ImageField):
+    """
+    ImageField that downsamples uploads and strips their metadata before
+    they are stored (see core.uploads).
+    """
+
+    def to_python(self, data):
+        if data in self.empty_values:
+            return super().to_python(data)
+        # Checked from the header before Django's own validation opens it
+        try:
+            ingested = ingest_image(data)
+        except ValidationError:
+            raise
+        except Exception:
+            # Not a readable image: let Django report it as such
+            return super().to_python(data)
+        return super().to_python(ingested)
+
+
+# ModelAdmin.formfield_overrides routing image uploads through ingestion
+INGESTED_IMAGE_OVERRIDES = {
+    models.ImageField: {'form_class': IngestedImageField},
+}
+
+
+class RegistrationImportForm(forms.Form):
+    csv_file = forms.FileField(
+        label="CSV file",
+        help_text=(
+            "Use the columns written by \"Export selected registrations as CSV\": "
+            "Name, Email, Phone, Workshop, Workshop Date, Location, Experience, "
+            "Physical Attendance, Registration Date."
+        ),
+    )
@@ -0,0 +1,208 @@
+"""
+Minimal iCalendar (RFC 5545) writer for workshop events.
+
+Everything in a workshop's VEVENT except the attendance line of the
+description is the same for every registrant, so that part is rendered
+once, cached per workshop revision and only the DESCRIPTION line is
+built per registrant. The public feed caches whole VEVENT blocks the same
+way, so regenerating it only renders workshops that changed.
+"""
+
+from collections import namedtuple
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.utils import timezone
+
+PRODID = '-//Django Campus//Workshops//EN'
+UID_DOMAIN = 'djangocampus.com'
+
+# Workshops without a time start at 09:00 and all last two hours
+DEFAULT_START_TIME = time(hour=9)
+EVENT_DURATION = timedelta(hours=2)
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+EventTemplate = namedtuple(
+    'EventTemplate', ['head', 'description_prefix', 'description_suffix', 'tail']
+)
+
+
+def escape_text(value):
+    """Escape a TEXT property value."""
+    return (
+        value.replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold_line(line):
+    """
+    Fold a content line to 75 octets per physical line and terminate it.
+
+    Continuation lines start with a single space. Multi-byte UTF-8
+    characters are never split.
+    """
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+
+    parts = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Step back off UTF-8 continuation bytes
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode('utf-8'))
+        start = end
+        limit = 74  # leave room for the leading space
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def format_datetime(value):
+    """Format an aware datetime as a UTC DATE-TIME value."""
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def workshop_start_end(workshop):
+    """Return the aware start and end datetimes of a workshop."""
+    start = datetime.combine(
+        workshop.workshop_date, workshop.workshop_time or DEFAULT_START_TIME
+    )
+    start = timezone.make_aware(start, timezone.get_default_timezone())
+    return start, start + EVENT_DURATION
+
+
+def workshop_uid(workshop):
+    """Stable UID so every invite for a workshop updates the same event."""
+    return f'workshop-{workshop.pk}@{UID_DOMAIN}'
+
+
+def attendance_line(will_attend_physical):
+    return f"Attendance: {'Physical' if will_attend_physical else 'Virtual'}"
+
+
+def _property(name, value):
+    return fold_line(f'{name}:{value}')
+
+
+def render_event_template(workshop):
+    """Render the registrant-independent parts of a workshop VEVENT."""
+    start, end = workshop_start_end(workshop)
+    stamp = workshop.updated_at or timezone.now()
+
+    head = ''.join([
+        'BEGIN:VEVENT\r\n',
+        _property('UID', workshop_uid(workshop)),
+        _property('DTSTAMP', format_datetime(stamp)),
+        _property('SEQUENCE', workshop.sequence),
+        _property('DTSTART', format_datetime(start)),
+        _property('DTEND', format_datetime(end)),
+        _property('SUMMARY', escape_text(workshop.workshop_name)),
+        _property('LOCATION', escape_text(workshop.workshop_location)),
+    ])
+    description_prefix = (
+        f"Workshop: {workshop.workshop_name}\n"
+        f"Location: {workshop.workshop_location}\n"
+    )
+    description_suffix = (
+        f"\n\n{workshop.workshop_description or ''}\n\n"
+        f"Organized by Django Campus\n"
+        f"We look forward to seeing you!"
+    )
+    return EventTemplate(head, description_prefix, description_suffix, 'END:VEVENT\r\n')
+
+
+def _cache_key(workshop):
+    modified = workshop.updated_at.timestamp() if workshop.updated_at else 0
+    return f'core:ics:event:{workshop.pk}:{workshop.sequence}:{modified}'
+
+
+def get_event_template(workshop):
+    """Return the cached event template for the workshop's current revision."""
+    key = _cache_key(workshop)
+    template = cache.get(key)
+    if template is None:
+        template = render_event_template(workshop)
+        cache.set(key, tuple(template), CACHE_TIMEOUT)
+        return template
+    return EventTemplate(*template)
+
+
+def render_event(workshop, will_attend_physical=None):
+    """
+    Render a workshop VEVENT block.
+
+    With ``will_attend_physical`` the description includes the registrant's
+    attendance line; without it the block is suitable for public feeds.
+    """
+    return _assemble_event(get_event_template(workshop), will_attend_physical)
+
+
+def _assemble_event(template, will_attend_physical):
+    if will_attend_physical is None:
+        description = template.description_prefix.rstrip('\n') + template.description_suffix
+    else:
+        description = (
+            template.description_prefix
+            + attendance_line(will_attend_physical)
+            + template.description_suffix
+        )
+    return template.head + _property('DESCRIPTION', escape_text(description)) + template.tail
+
+
+def render_calendar(events, name=None):
+    """Wrap rendered VEVENT blocks in a VCALENDAR."""
+    return (
+        'BEGIN:VCALENDAR\r\n'
+        'VERSION:2.0\r\n'
+        + _property('PRODID', PRODID)
+        + 'CALSCALE:GREGORIAN\r\n'
+        + (_property('X-WR-CALNAME', escape_text(name)) if name else '')
+        + ''.join(events)
+        + 'END:VCALENDAR\r\n'
+    )
+
+
+def _feed_event_key(pk, sequence, updated_at):
+    modified = updated_at.timestamp() if updated_at else 0
+    return f'core:ics:feed-event:{pk}:{sequence}:{modified}'
+
+
+def render_feed(workshops, name=None):
+    """
+    Render a public calendar of the ``workshops`` queryset.
+
+    A first query reads only each row's revision (pk, sequence,
+    updated_at); VEVENT blocks cached for those revisions are fetched in one
+    round trip and full rows are loaded and rendered only for the misses.
+    """
+    revisions = list(workshops.values_list('pk', 'sequence', 'updated_at'))
+    keys = [_feed_event_key(*revision) for revision in revisions]
+    blocks = cache.get_many(keys)
+
+    missing = {
+        revision[0]: key for revision, key in zip(revisions, keys) if key not in blocks
+    }
+    if missing:
+        rendered = {
+            missing[workshop.pk]: _assemble_event(render_event_template(workshop), None)
+            for workshop in workshops.filter(pk__in=list(missing))
+        }
+        cache.set_many(rendered, CACHE_TIMEOUT)
+        blocks.update(rendered)
+
+    # A row changed between the two queries is left out until the next poll
+    return render_calendar((blocks[key] for key in keys if key in blocks), name)
+
+
+def registration_calendar(registration):
+    """Render the calendar invite attached to a registration email."""
+    return render_calendar([
+        render_event(registration.workshop, registration.will_attend_physical)
+    ])
@@ -0,0 +1,233 @@
+"""
+Resized WebP/JPEG variants of uploaded images.
+
+Each registered image field has a JSON companion field ``<field>_variants``
+holding {'source': <original name>, 'webp': {width: name}, 'jpeg': {...}}.
+Variants are stored next to the original (``logo.jpg`` ->
+``logo.w640.webp``) and generated in a process pool once the upload's
+transaction commits, so neither the request nor the web process pays for
+the resizing. Serializers expose them as srcset strings through
+ImageSrcsetField.
+"""
+
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from drf_spectacular.utils import extend_schema_field
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+from core.cache_versions import bump_versions_for
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = (320, 640, 1024, 1600)
+# format -> (Pillow format, file extension, save options)
+VARIANT_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# model -> names of its image fields with variants
+_registered_fields = {}
+_executor = None
+
+
+def variants_field_name(field_name):
+    return f'{field_name}_variants'
+
+
+def variant_name(name, width, extension):
+    root, _ = os.path.splitext(name)
+    return f'{root}.w{width}.{extension}'
+
+
+def _flatten(image, background=(255, 255, 255)):
+    """RGB copy of ``image`` with any transparency laid over white."""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        flat = Image.new('RGB', image.size, background)
+        flat.paste(image, mask=image.getchannel('A'))
+        return flat
+    return image.convert('RGB')
+
+
+def generate_variants(name, widths=VARIANT_WIDTHS):
+    """
+    Write every variant of the stored image ``name`` and return the
+    variants map. Runs in the worker processes: no database access.
+
+    Widths above the original's are capped to it; images are never
+    upscaled.
+    """
+    with default_storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        image.load()
+    # Phone photos are often stored sideways with an EXIF rotation
+    image = ImageOps.exif_transpose(image)
+    keeps_alpha = image.mode in ('RGBA', 'LA', 'P')
+
+    variants = {'source': name, **{key: {} for key in VARIANT_FORMATS}}
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(round(image.height * width / image.width), 1)
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for key, (image_format, extension, options) in VARIANT_FORMATS.items():
+            if image_format == 'JPEG' or not keeps_alpha:
+                output_image = _flatten(resized)
+            else:
+                output_image = resized.convert('RGBA')
+            buffer = io.BytesIO()
+            output_image.save(buffer, image_format, **options)
+            target = variant_name(name, width, extension)
+            # Same name on regeneration instead of a suffixed copy
+            default_storage.delete(target)
+            variants[key][str(width)] = default_storage.save(target, ContentFile(buffer.getvalue()))
+    return variants
+
+
+def store_variants(model, pk, field_name, variants):
+    """
+    Save a variants map unless the image was replaced in the meantime.
+    Returns True if it was saved.
+    """
+    updated = model.objects.filter(pk=pk, **{field_name: variants['source']}).update(
+        **{variants_field_name(field_name): variants}
+    )
+    if updated:
+        # update() sends no signals; cached responses embed the srcset
+        bump_versions_for(model)
+    return bool(updated)
+
+
+def init_worker():
+    """Process-pool initializer: spawned workers start without Django set up."""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def get_executor(max_workers=None):
+    """The process pool generating variants of new uploads."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=max_workers or getattr(settings, 'IMAGE_VARIANT_WORKERS', 2),
+            initializer=init_worker,
+        )
+    return _executor
+
+
+def _store_future_result(model, pk, field_name, future):
+    # Runs on the pool's result thread
+    try:
+        store_variants(model, pk, field_name, future.result())
+    except Exception:
+        logger.exception(
+            'Generating image variants failed for %s %s.%s', model._meta.label, pk, field_name
+        )
+    finally:
+        connection.close()
+
+
+def schedule_variants(model, pk, field_name, name):
+    """Generate the variants of a new upload off the request path."""
+    if not getattr(settings, 'IMAGE_VARIANTS_BACKGROUND', True):
+        try:
+            store_variants(model, pk, field_name, generate_variants(name))
+        except Exception:
+            logger.exception(
+                'Generating image variants failed for %s %s.%s', model._meta.label, pk, field_name
+            )
+        return
+    future = get_executor().submit(generate_variants, name)
+    future.add_done_callback(
+        lambda future: _store_future_result(model, pk, field_name, future)
+    )
+
+
+def needs_variants(instance, field_name):
+    name = getattr(instance, field_name).name or ''
+    variants = getattr(instance, variants_field_name(field_name)) or {}
+    return variants.get('source', '') != name
+
+
+def _image_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    for field_name in _registered_fields.get(sender, ()):
+        if not needs_variants(instance, field_name):
+            continue
+        name = getattr(instance, field_name).name
+        if name:
+            transaction.on_commit(
+                lambda field_name=field_name, name=name: schedule_variants(
+                    sender, instance.pk, field_name, name
+                )
+            )
+        else:
+            # Image removed: drop the stale variants map
+            setattr(instance, variants_field_name(field_name), {})
+            sender.objects.filter(pk=instance.pk).update(
+                **{variants_field_name(field_name): {}}
+            )
+
+
+def register_image_variants(model, *field_names):
+    """Generate variants whenever one of ``field_names`` gets a new image."""
+    _registered_fields.setdefault(model, set()).update(field_names)
+    post_save.connect(
+        _image_saved, sender=model, dispatch_uid=f'image-variants-{model._meta.label}'
+    )
+
+
+def registered_image_fields():
+    """[(model, field name)] of every field with variants."""
+    return [
+        (model, field_name)
+        for model, field_names in _registered_fields.items()
+        for field_name in sorted(field_names)
+    ]
+
+
+@extend_schema_field({
+    'type': 'object',
+    'nullable': True,
+    'additionalProperties': {'type': 'string'},
+})
+class ImageSrcsetField(serializers.Field):
+    """
+    Read-only {format: srcset} built from an image's variants map, e.g.
+    {"webp": "/media/logo.w320.webp 320w, /media/logo.w640.webp 640w",
+    "jpeg": "..."}; null until the variants exist.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, variants):
+        if not variants or not variants.get('source'):
+            return None
+        request = self.context.get('request')
+
+        def url(name):
+            url = default_storage.url(name)
+            return request.build_absolute_uri(url) if request else url
+
+        return {
+            key: ', '.join(
+                f'{url(name)} {width}w'
+                for width, name in sorted(variants[key].items(), key=lambda item: int(item[0]))
+            )
+            for key in VARIANT_FORMATS
+            if variants.get(key)
+        }
@@ -0,0 +1,201 @@
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from rest_framework.exceptions import ValidationError
+
+from core.counters import reconcile_registration_counts
+from core.models import DjangoExperience, WorkShop, WorkshopRegistration
+from core.serializers import WorkshopRegistrationSerializer
+
+# Same columns export_as_csv writes; Location and Registration Date are
+# accepted but not imported (the workshop is matched on name and date)
+IMPORT_COLUMNS = {
+    'name': 'Name',
+    'email': 'Email',
+    'phone': 'Phone',
+    'workshop': 'Workshop',
+    'workshop_date': 'Workshop Date',
+    'experience': 'Experience',
+    'physical': 'Physical Attendance',
+}
+REQUIRED_COLUMNS = ('name', 'email', 'workshop', 'workshop_date')
+
+TRUE_VALUES = {'yes', 'y', 'true', '1', 'physical'}
+FALSE_VALUES = {'no', 'n', 'false', '0', 'virtual'}
+
+# Keep the report bounded too; later errors are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    valid: int = 0
+    created: int = 0
+    error_count: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, line, messages):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, messages))
+
+
+class RegistrationRowValidator:
+    """
+    Applies WorkshopRegistrationSerializer rules to one CSV row without a
+    query per row: workshops are looked up in a dict built once.
+    """
+
+    def __init__(self):
+        self.serializer = WorkshopRegistrationSerializer()
+        self.workshops = {
+            (name.strip().lower(), date): pk
+            for pk, name, date in WorkShop.objects.values_list(
+                'pk', 'workshop_name', 'workshop_date'
+            )
+        }
+
+    def _run(self, errors, label, check, value):
+        try:
+            return check(value)
+        except ValidationError as e:
+            errors.extend(f'{label}: {message}' for message in e.detail)
+        except (DjangoValidationError, ValueError) as e:
+            messages = getattr(e, 'messages', None) or [str(e)]
+            errors.extend(f'{label}: {message}' for message in messages)
+        return None
+
+    def _email(self, value):
+        value = self.serializer.validate_user_email(value)
+        validate_email(value)
+        return value
+
+    def _phone(self, value):
+        value = value.strip()
+        if not value or value.upper() == 'N/A':
+            return None
+        max_length = WorkshopRegistration._meta.get_field('phone_number').max_length
+        if len(value) > max_length:
+            raise ValueError(f'Ensure this field has no more than {max_length} characters.')
+        return value
+
+    def _workshop(self, value):
+        name, date = value
+        try:
+            date = datetime.strptime(date.strip(), '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError('Workshop Date must be in YYYY-MM-DD format.')
+        try:
+            return self.workshops[(name.strip().lower(), date)]
+        except KeyError:
+            raise ValueError(f'No workshop named "{name}" on {date}.')
+
+    def _experience(self, value):
+        value = value.strip()
+        if not value:
+            return DjangoExperience.BEGINNER
+        for choice in DjangoExperience.values:
+            if choice.lower() == value.lower():
+                return choice
+        raise ValueError(f'"{value}" is not one of {", ".join(DjangoExperience.values)}.')
+
+    def _physical(self, value):
+        value = value.strip().lower()
+        if not value or value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+        raise ValueError('Use Yes or No.')
+
+    def validate(self, row):
+        """Return (WorkshopRegistration, []) or (None, error messages)."""
+        errors = []
+        values = {
+            'user_name': self._run(
+                errors, 'Name', self.serializer.validate_user_name, row['name']
+            ),
+            'user_email': self._run(errors, 'Email', self._email, row['email']),
+            'phone_number': self._run(errors, 'Phone', self._phone, row['phone']),
+            'workshop_id': self._run(
+                errors, 'Workshop', self._workshop, (row['workshop'], row['workshop_date'])
+            ),
+            'django_experience': self._run(
+                errors, 'Experience', self._experience, row['experience']
+            ),
+            'will_attend_physical': self._run(
+                errors, 'Physical Attendance', self._physical, row['physical']
+            ),
+        }
+        if errors:
+            return None, errors
+        return WorkshopRegistration(**values), []
+
+
+def _column_positions(header):
+    positions = {}
+    normalized = [column.strip().lower() for column in header]
+    for key, column in IMPORT_COLUMNS.items():
+        if column.lower() in normalized:
+            positions[key] = normalized.index(column.lower())
+    missing = [IMPORT_COLUMNS[key] for key in REQUIRED_COLUMNS if key not in positions]
+    if missing:
+        raise ValueError(f'Missing required column(s): {", ".join(missing)}')
+    return positions
+
+
+def import_registrations(binary_file, chunk_size=1000):
+    """
+    Stream registrations from a CSV file into the database.
+
+    Rows are validated one at a time and inserted in chunks with
+    bulk_create(ignore_conflicts=True), so memory stays bounded by the chunk
+    size and rows already registered are skipped. Counters of the affected
+    workshops are reconciled once at the end, since bulk inserts bypass the
+    per-registration seat claim. Raises ValueError for an unusable header.
+    """
+    text = io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.reader(text)
+        positions = _column_positions(next(reader, []))
+        validator = RegistrationRowValidator()
+        result = ImportResult()
+        workshop_ids = set()
+        chunk = []
+        before = WorkshopRegistration.objects.count()
+
+        for line, values in enumerate(reader, start=2):
+            if not any(value.strip() for value in values):
+                continue
+            result.rows += 1
+            row = {
+                key: values[position] if position < len(values) else ''
+                for key, position in positions.items()
+            }
+            for key in IMPORT_COLUMNS:
+                row.setdefault(key, '')
+
+            registration, errors = validator.validate(row)
+            if errors:
+                result.add_error(line, errors)
+                continue
+            result.valid += 1
+            workshop_ids.add(registration.workshop_id)
+            chunk.append(registration)
+            if len(chunk) >= chunk_size:
+                WorkshopRegistration.objects.bulk_create(chunk, ignore_conflicts=True)
+                chunk = []
+
+        if chunk:
+            WorkshopRegistration.objects.bulk_create(chunk, ignore_conflicts=True)
+        if workshop_ids:
+            reconcile_registration_counts(workshop_ids)
+        result.created = WorkshopRegistration.objects.count() - before
+        return result
+    finally:
+        # Leave the uploaded file open for Django to clean up
+        text.detach()
@@ -0,0 +1,114 @@
+import subprocess
+import sys
+import timeit
+import warnings
+from datetime import date, datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.ics_writer import registration_calendar
+from core.models import WorkShop, WorkshopRegistration
+
+
+def legacy_registration_calendar(registration):
+    """The ics.Calendar based invite that registration emails used to build."""
+    from ics import Calendar, Event
+
+    workshop = registration.workshop
+    c = Calendar()
+    e = Event()
+    e.name = workshop.workshop_name
+    start_datetime = datetime.combine(
+        workshop.workshop_date,
+        workshop.workshop_time or datetime.min.time().replace(hour=9)
+    )
+    e.begin = start_datetime
+    e.end = start_datetime + timedelta(hours=2)
+    e.location = workshop.workshop_location
+    attendance_type = (
+        "Physical" if registration.will_attend_physical else "Virtual"
+    )
+    e.description = (
+        f"Workshop: {workshop.workshop_name}\n"
+        f"Location: {workshop.workshop_location}\n"
+        f"Attendance: {attendance_type}\n\n"
+        f"{workshop.workshop_description or ''}\n\n"
+        f"Organized by Django Campus\n"
+        f"We look forward to seeing you!"
+    )
+    c.events.add(e)
+    return str(c)
+
+
+def import_time(module):
+    """Seconds a fresh interpreter spends importing ``module``."""
+    code = (
+        'import time; start = time.perf_counter(); '
+        f'import {module}; print(time.perf_counter() - start)'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True
+    )
+    return float(result.stdout)
+
+
+class Command(BaseCommand):
+    help = 'Compare the cached ICS writer against the old ics.Calendar invite path'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=2000,
+            help='Invites to render per implementation (default: 2000)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            import ics  # noqa: F401
+        except ImportError:
+            raise CommandError('The ics package is required to run the comparison.')
+
+        # ics warns that str(Calendar) is changing; the old path relied on it
+        warnings.simplefilter('ignore', FutureWarning)
+        iterations = options['iterations']
+        workshop = WorkShop(
+            pk=1,
+            workshop_name='Django REST API Development',
+            workshop_date=date(2030, 1, 15),
+            workshop_time=time(14, 30),
+            workshop_location='Innovation Center, Auditorium A',
+            workshop_description='Build robust REST APIs using Django REST Framework.',
+            updated_at=timezone.now(),
+        )
+        registration = WorkshopRegistration(
+            workshop=workshop,
+            user_name='Alice Johnson',
+            user_email='alice@example.com',
+        )
+
+        # Warm the cache the way the first registrant of a workshop would
+        registration_calendar(registration)
+
+        timings = {
+            'ics.Calendar': timeit.timeit(
+                lambda: legacy_registration_calendar(registration), number=iterations
+            ),
+            'ics_writer (cached)': timeit.timeit(
+                lambda: registration_calendar(registration), number=iterations
+            ),
+        }
+
+        for name, seconds in timings.items():
+            self.stdout.write(
+                f'{name:<22} {seconds / iterations * 1e6:>10.1f} us/invite'
+            )
+        self.stdout.write(
+            f"{'import ics':<22} {import_time('ics') * 1e3:>10.1f} ms (fresh interpreter)"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Speedup: {timings['ics.Calendar'] / timings['ics_writer (cached)']:.1f}x"
+            )
+        )
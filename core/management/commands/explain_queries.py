@@ -0,0 +1,297 @@
+import json
+import re
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from core.counters import reconcile_registration_counts, registration_counts_annotations
+from core.models import DjangoExperience, WorkShop, WorkshopRegistration
+
+# SQLite reports a table scan as "SCAN <table>" and an index scan as
+# "SCAN <table> USING [COVERING] INDEX <name>"
+SQLITE_FULL_SCAN = re.compile(r'\bSCAN (\w+)\s*$', re.MULTILINE)
+SQLITE_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+
+
+def _sample_ids(using):
+    workshop = WorkShop.objects.using(using).order_by('pk').values_list('pk', flat=True).first() or 0
+    registration = (
+        WorkshopRegistration.objects.using(using).order_by('pk')
+        .values_list('user_email', 'registration_date').first()
+    )
+    return workshop, registration or ('', timezone.now())
+
+
+def query_plan(using=DEFAULT_DB_ALIAS):
+    """
+    (label, queryset) for each query the API and admin run against the
+    workshop and registration tables.
+    """
+    today = timezone.localdate()
+    workshop_id, (email, registered_at) = _sample_ids(using)
+    registrations = WorkshopRegistration.objects.using(using)
+    workshops = WorkShop.objects.using(using)
+    return [
+        ('api: workshop list page', workshops[:20]),
+        ('api: workshop detail', workshops.filter(pk=workshop_id)),
+        (
+            'api: calendar feed revisions',
+            workshops.filter(is_ended=False, workshop_date__gte=today)
+            .order_by('workshop_date', 'workshop_time', 'id')
+            .values_list('pk', 'sequence', 'updated_at'),
+        ),
+        ('api: registration list page', registrations.select_related('workshop')[:20]),
+        (
+            'api: registration cursor page',
+            registrations.filter(registration_date__gt=registered_at)
+            .order_by('registration_date', 'id')[:20],
+        ),
+        (
+            'api: registrations for workshop',
+            registrations.filter(workshop_id=workshop_id).order_by('registration_date')[:20],
+        ),
+        (
+            'api: duplicate registration check',
+            registrations.filter(workshop_id=workshop_id, user_email=email),
+        ),
+        (
+            'admin: upcoming workshops',
+            workshops.filter(workshop_date__gt=today, is_ended=False)[:100],
+        ),
+        (
+            'admin: ongoing workshops',
+            workshops.filter(workshop_date=today, is_ended=False)[:100],
+        ),
+        ('admin: ended workshops', workshops.filter(is_ended=True)[:100]),
+        (
+            'admin: registration changelist',
+            registrations.select_related('workshop').order_by('-registration_date')[:100],
+        ),
+        (
+            'admin: registrations by workshop',
+            registrations.filter(workshop_id=workshop_id).order_by('-registration_date')[:100],
+        ),
+        (
+            'admin: registrations by attendance',
+            registrations.filter(will_attend_physical=False).order_by('-registration_date')[:100],
+        ),
+        (
+            'admin: registrations by experience',
+            registrations.filter(django_experience=DjangoExperience.ADVANCED)
+            .order_by('-registration_date')[:100],
+        ),
+        (
+            'counters: reconcile one workshop',
+            workshops.filter(pk=workshop_id).order_by()
+            .annotate(**registration_counts_annotations()),
+        ),
+    ]
+
+
+def explain(queryset):
+    """Return (plan text, [problems]) for a queryset on its database's backend."""
+    connection = connections[queryset.db]
+    if connection.vendor == 'mysql':
+        plan = queryset.explain(format='json')
+        problems = []
+        if '"access_type": "ALL"' in plan:
+            problems.append('full scan')
+        if '"using_filesort": true' in plan:
+            problems.append('filesort')
+        return json.dumps(json.loads(plan), indent=1), problems
+
+    plan = queryset.explain()
+    problems = []
+    if connection.vendor == 'sqlite':
+        problems += [f'full scan of {table}' for table in SQLITE_FULL_SCAN.findall(plan)]
+        if SQLITE_SORT in plan:
+            problems.append('sort')
+    elif 'Seq Scan' in plan:
+        problems.append('full scan')
+    return plan, problems
+
+
+def best_time(queryset, repeat):
+    """Best wall time of ``repeat`` evaluations, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(queryset.all())
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3
+
+
+def planned_indexes():
+    return [
+        (model, index)
+        for model in (WorkShop, WorkshopRegistration)
+        for index in model._meta.indexes
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN every workshop/registration query of the API and admin, '
+        'flag full scans and sorts, and time them with and without the index plan. '
+        'Seeded rows and dropped indexes are rolled back when the run ends.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            metavar='ROWS',
+            help='First insert ROWS registrations (spread over ROWS/200 workshops)',
+        )
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help='Also time every query with the model indexes dropped (they are restored)',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help=(
+                'Database alias to run against (default: "default"). --compare on '
+                'a backend that cannot roll back schema changes (MySQL) needs the '
+                'alias of a scratch copy'
+            ),
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per query; the best time is reported (default: 5)',
+        )
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Print the full plan of every query',
+        )
+
+    def handle(self, *args, **options):
+        database = options['database']
+        connection = connections[database]
+        self.seeded_workshop_ids = []
+
+        if options['compare'] and not connection.features.can_rollback_ddl:
+            if database == DEFAULT_DB_ALIAS:
+                raise CommandError(
+                    f'--compare drops indexes, which {connection.vendor} cannot roll back; '
+                    'pass --database with the alias of a scratch copy of the database.'
+                )
+            # Dropping an index commits whatever was seeded before it, so
+            # there is no transaction to roll back: remove the rows instead
+            try:
+                self.report(database, options)
+            finally:
+                self.remove_seeded(database)
+            return
+
+        # Nothing seeded or dropped outlives the run. SQLite only lets the
+        # schema editor into a transaction opened with foreign key checks off.
+        with connection.constraint_checks_disabled(), transaction.atomic(using=database):
+            self.report(database, options)
+            transaction.set_rollback(True, using=database)
+
+    def report(self, database, options):
+        if options['seed']:
+            self.seed(options['seed'], database)
+
+        results = self.run_plan(database, options['repeat'], options['verbose_plans'])
+        before = None
+        if options['compare']:
+            before = self.run_without_indexes(database, options['repeat'])
+
+        flagged = 0
+        for label, (problems, after_ms) in results.items():
+            flagged += bool(problems)
+            line = f'{label:<38} {after_ms:>9.2f} ms'
+            if before is not None:
+                before_problems, before_ms = before[label]
+                line = (
+                    f'{label:<38} {before_ms:>9.2f} ms -> {after_ms:>8.2f} ms'
+                    f'  ({", ".join(before_problems) or "ok"} -> {", ".join(problems) or "ok"})'
+                )
+            elif problems:
+                line += f'  {", ".join(problems)}'
+            self.stdout.write(self.style.WARNING(line) if problems else line)
+
+        summary = f'{len(results)} queries explained, {flagged} flagged'
+        if flagged:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+
+    def run_plan(self, database, repeat, verbose=False):
+        results = {}
+        for label, queryset in query_plan(database):
+            plan, problems = explain(queryset)
+            if verbose:
+                self.stdout.write(f'-- {label}\n{plan}\n')
+            results[label] = (problems, best_time(queryset, repeat))
+        return results
+
+    def run_without_indexes(self, database, repeat):
+        connection = connections[database]
+        indexes = planned_indexes()
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.remove_index(model, index)
+        try:
+            return self.run_plan(database, repeat)
+        finally:
+            with connection.schema_editor() as editor:
+                for model, index in indexes:
+                    editor.add_index(model, index)
+
+    def seed(self, rows, database, batch_size=10000):
+        per_workshop = 200
+        today = timezone.localdate()
+        experiences = DjangoExperience.values
+        workshops = WorkShop.objects.using(database).bulk_create([
+            WorkShop(
+                workshop_name=f'Seeded workshop {index}',
+                workshop_date=today + timedelta(days=index % 730 - 365),
+                workshop_location='Seed Hall',
+                is_ended=index % 3 == 0,
+            )
+            for index in range(max(rows // per_workshop, 1))
+        ], batch_size=batch_size)
+        if not workshops[0].pk:
+            raise CommandError('Seeding needs a backend that returns bulk-created primary keys.')
+        self.seeded_workshop_ids = [workshop.pk for workshop in workshops]
+
+        for offset in range(0, rows, batch_size):
+            with transaction.atomic(using=database):
+                WorkshopRegistration.objects.using(database).bulk_create([
+                    WorkshopRegistration(
+                        workshop=workshops[index // per_workshop],
+                        user_name=f'Seeded user {index}',
+                        user_email=f'seed-{index}@example.com',
+                        will_attend_physical=index % 3 != 0,
+                        django_experience=experiences[index % len(experiences)],
+                    )
+                    for index in range(offset, min(offset + batch_size, rows))
+                ])
+        # bulk_create bypasses the signals that maintain the counters
+        reconcile_registration_counts(self.seeded_workshop_ids, using=database)
+        self.stdout.write(
+            self.style.SUCCESS(f'Seeded {len(workshops)} workshops and {rows} registrations')
+        )
+
+    def remove_seeded(self, database):
+        if not self.seeded_workshop_ids:
+            return
+        # Plain DELETEs: the per-row post_delete counter updates would only
+        # adjust workshops that are going away as well
+        registrations = WorkshopRegistration.objects.using(database).filter(
+            workshop_id__in=self.seeded_workshop_ids
+        )
+        registrations._raw_delete(database)
+        WorkShop.objects.using(database).filter(pk__in=self.seeded_workshop_ids)._raw_delete(database)
+        self.stdout.write(f'Removed the {len(self.seeded_workshop_ids)} seeded workshops')
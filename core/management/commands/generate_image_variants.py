@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core.images import (
+    generate_variants, init_worker, registered_image_fields, store_variants,
+    variants_field_name
+)
+
+
+def _generate(name):
+    # Errors are returned, not raised: one bad file must not stop the run
+    try:
+        return generate_variants(name), None
+    except Exception as exc:
+        return None, f'{type(exc).__name__}: {exc}'
+
+
+def pending_images(force=False):
+    """(model, pk, field name, image name) of every image missing variants."""
+    for model, field_name in registered_image_fields():
+        rows = (
+            model.objects.exclude(**{field_name: ''})
+            .exclude(**{f'{field_name}__isnull': True})
+            .order_by('pk')
+            .values_list('pk', field_name, variants_field_name(field_name))
+        )
+        for pk, name, variants in rows.iterator():
+            if force or (variants or {}).get('source') != name:
+                yield model, pk, field_name, name
+
+
+class Command(BaseCommand):
+    help = 'Generate the resized WebP/JPEG variants of existing uploaded images in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes (default: one per CPU; 0 runs in this process)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate variants that already exist',
+        )
+
+    def handle(self, *args, **options):
+        jobs = list(pending_images(options['force']))
+        names = [name for _, _, _, name in jobs]
+        if options['workers'] > 0 and jobs:
+            with ProcessPoolExecutor(
+                max_workers=options['workers'], initializer=init_worker
+            ) as executor:
+                results = list(executor.map(_generate, names, chunksize=4))
+        else:
+            results = [_generate(name) for name in names]
+
+        generated = failed = 0
+        for (model, pk, field_name, name), (variants, error) in zip(jobs, results):
+            if error:
+                failed += 1
+                self.stderr.write(f'{model._meta.label} {pk} {name}: {error}')
+            elif store_variants(model, pk, field_name, variants):
+                generated += 1
+
+        summary = f'Generated variants for {generated} images, {failed} failed'
+        if failed:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,196 @@
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from rest_framework.renderers import JSONRenderer
+
+from core.models import WorkShop
+from core.response_cache import bypass_response_cache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = 'manifest.json'
+
+# (list URL name, detail URL name). Every page of the list is written and
+# a detail file for each object the list contains.
+LIST_TARGETS = [
+    ('partner-list', 'partner-detail'),
+    ('contributor-list', 'contributor-detail'),
+    ('sponsor-list', 'sponsor-detail'),
+    ('supporter-list', 'supporter-detail'),
+    ('team-list-create', 'team-detail'),
+    ('team-active-list', None),
+]
+
+
+def past_workshop_ids():
+    return WorkShop.objects.filter(is_ended=True).order_by('pk').values_list('pk', flat=True)
+
+
+# (detail URL name, callable returning the primary keys to write)
+DETAIL_TARGETS = [
+    ('workshop-detail', past_workshop_ids),
+]
+
+
+def file_path(url_path, page=1):
+    """
+    Static file for an API URL: /api/sponsors/ -> api/sponsors/index.json,
+    page 2 of it -> api/sponsors/page/2/index.json.
+    """
+    path = url_path.strip('/')
+    if page > 1:
+        path += f'/page/{page}'
+    return f'{path}/index.json'
+
+
+def content_hash(body):
+    return hashlib.sha256(body).hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        'Write the JSON of the public partner, sponsor, supporter, contributor, '
+        'team and past-workshop endpoints to a directory for static hosting, '
+        'with .gz/.br siblings and a manifest of content hashes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir', help='Directory to write the files to')
+        parser.add_argument(
+            '--base-url',
+            default='',
+            help='Prefix of the pagination links in the written pages (default: site root)',
+        )
+        parser.add_argument(
+            '--site-url',
+            help=(
+                'Scheme and host the pages are rendered for, used in media and '
+                'other absolute URLs (default: settings.SITE_BASE_URL)'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        self.root = Path(options['output_dir'])
+        self.base_url = options['base_url'].rstrip('/')
+        site = urlsplit(options['site_url'] or settings.SITE_BASE_URL)
+        if site.scheme not in ('http', 'https') or not site.netloc:
+            raise CommandError(f'Not an http(s) site URL: {site.geturl()!r}')
+        self.site = site
+        self.factory = RequestFactory()
+        self.renderer = JSONRenderer()
+        if brotli is None:
+            self.stdout.write(self.style.WARNING(
+                'brotli is not installed; writing .gz files only'
+            ))
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.root / MANIFEST_NAME
+        try:
+            previous = json.loads(manifest_path.read_text())['files']
+        except FileNotFoundError:
+            previous = {}
+
+        files = {}
+        for list_name, detail_name in LIST_TARGETS:
+            for obj_id in self.render_list(reverse(list_name), files):
+                if detail_name:
+                    self.render_detail(reverse(detail_name, args=[obj_id]), files)
+        for detail_name, get_ids in DETAIL_TARGETS:
+            for obj_id in get_ids():
+                self.render_detail(reverse(detail_name, args=[obj_id]), files)
+
+        written = 0
+        manifest = {}
+        for path, body in files.items():
+            digest = content_hash(body)
+            manifest[path] = {'sha256': digest, 'bytes': len(body)}
+            unchanged = (
+                previous.get(path, {}).get('sha256') == digest
+                and (self.root / path).exists()
+            )
+            if not unchanged:
+                self.write(path, body)
+                written += 1
+
+        removed = [path for path in previous if path not in manifest]
+        for path in removed:
+            self.remove(path)
+
+        self.write_file(manifest_path, json.dumps(
+            {'files': dict(sorted(manifest.items()))}, indent=2
+        ).encode())
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(files)} files: {written} written, '
+            f'{len(files) - written} unchanged, {len(removed)} removed'
+        ))
+
+    def get(self, url):
+        path = url.partition('?')[0]
+        request = self.factory.get(
+            url,
+            HTTP_ACCEPT='application/json',
+            HTTP_HOST=self.site.netloc,
+            secure=self.site.scheme == 'https',
+        )
+        # Rendered fresh, and kept out of the cache live requests are served from
+        bypass_response_cache(request)
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        response.render()
+        if response.status_code != 200:
+            raise CommandError(f'GET {url} returned {response.status_code}')
+        return json.loads(response.content)
+
+    def render_list(self, url_path, files):
+        """Render every page of a list endpoint; yields the object ids."""
+        page = 1
+        while True:
+            data = self.get(f'{url_path}?page={page}' if page > 1 else url_path)
+            results = data['results'] if isinstance(data, dict) else data
+            if isinstance(data, dict):
+                # Point the pagination links at the static pages
+                data['next'] = self.page_url(url_path, page + 1) if data['next'] else None
+                data['previous'] = self.page_url(url_path, page - 1) if data['previous'] else None
+            files[file_path(url_path, page)] = self.renderer.render(data)
+            for item in results:
+                yield item['id']
+            if not isinstance(data, dict) or not data['next']:
+                return
+            page += 1
+
+    def render_detail(self, url_path, files):
+        files[file_path(url_path)] = self.renderer.render(self.get(url_path))
+
+    def page_url(self, url_path, page):
+        return f'{self.base_url}/{file_path(url_path, page)}'
+
+    def write(self, path, body):
+        target = self.root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        self.write_file(target, body)
+        # mtime=0 keeps the archive byte-identical for identical content
+        self.write_file(target.with_name(target.name + '.gz'), gzip.compress(body, 9, mtime=0))
+        if brotli is not None:
+            self.write_file(target.with_name(target.name + '.br'), brotli.compress(body))
+
+    def write_file(self, target, data):
+        # Written aside and renamed so the host never serves a partial file
+        temp = target.with_name(target.name + '.tmp')
+        temp.write_bytes(data)
+        os.replace(temp, target)
+
+    def remove(self, path):
+        target = self.root / path
+        for suffix in ('', '.gz', '.br'):
+            target.with_name(target.name + suffix).unlink(missing_ok=True)
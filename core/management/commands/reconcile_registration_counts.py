@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from core.counters import reconcile_registration_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized workshop registration counters and fix any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workshop',
+            type=int,
+            action='append',
+            dest='workshop_ids',
+            help='Only reconcile the given workshop ID (may be repeated)',
+        )
+
+    def handle(self, *args, **options):
+        fixed = reconcile_registration_counts(options['workshop_ids'])
+
+        for workshop in fixed:
+            self.stdout.write(
+                f'Fixed counters for workshop: {workshop.workshop_name} '
+                f'({workshop.registrations_count} -> '
+                f'{workshop.actual_registrations_count} registrations)'
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Reconciled registration counters '
+                f'({len(fixed)} workshop(s) corrected)'
+            )
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from core.cache_versions import tracked_collections
+from core.response_cache import HIT, MISS, get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters of the public API response cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Clear the counters after printing them',
+        )
+
+    def handle(self, *args, **options):
+        collections = tracked_collections()
+        stats = get_stats(collections)
+
+        self.stdout.write(f"{'collection':<14} {'hits':>8} {'misses':>8} {'hit rate':>9}")
+        for collection, counts in stats.items():
+            total = counts[HIT] + counts[MISS]
+            rate = f'{counts[HIT] / total:.1%}' if total else '-'
+            self.stdout.write(
+                f'{collection:<14} {counts[HIT]:>8} {counts[MISS]:>8} {rate:>9}'
+            )
+
+        if options['reset']:
+            reset_stats(collections)
+            self.stdout.write(self.style.SUCCESS('Response cache counters reset'))
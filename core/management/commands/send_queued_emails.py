@@ -0,0 +1,65 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from core.outbox import DEFAULT_MAX_ATTEMPTS, claim_batch, deliver_batch
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbox emails in batches over a reused SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of emails to claim per batch (default: 50)',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=DEFAULT_MAX_ATTEMPTS,
+            help=f'Give up on an email after this many attempts (default: {DEFAULT_MAX_ATTEMPTS})',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the outbox instead of exiting once it is drained',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep between polls in --loop mode (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        connection = get_connection()
+
+        try:
+            while True:
+                batch = claim_batch(options['batch_size'])
+                if not batch:
+                    if not options['loop']:
+                        break
+                    # Don't hold an idle SMTP session open between polls
+                    connection.close()
+                    time.sleep(options['interval'])
+                    continue
+
+                sent, failed = deliver_batch(
+                    batch, connection, max_attempts=options['max_attempts']
+                )
+                total_sent += sent
+                total_failed += failed
+                self.stdout.write(f'Batch delivered: {sent} sent, {failed} failed')
+        finally:
+            connection.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Outbox drained: {total_sent} sent, {total_failed} failed'
+            )
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core import metrics
+from core.throttling import get_rate_scopes, rejected_metric, rejection_counts
+
+
+class Command(BaseCommand):
+    help = 'Show how many requests each throttle rate scope has rejected'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Clear the counters after printing them',
+        )
+
+    def handle(self, *args, **options):
+        scopes = get_rate_scopes()
+        for scope, rejected in rejection_counts(scopes).items():
+            self.stdout.write(f'{scope:<24} {rejected:>8} rejected')
+
+        if options['reset']:
+            metrics.reset([rejected_metric(scope) for scope in scopes])
+            self.stdout.write(self.style.SUCCESS('Throttle counters reset'))
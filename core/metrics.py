@@ -0,0 +1,34 @@
+"""
+Process-independent counters kept in the default cache.
+
+Counters never expire; they are approximate if the cache evicts them.
+"""
+
+from django.core.cache import cache
+
+METRIC_KEY_PREFIX = 'core:metric:'
+
+
+def _key(name):
+    return f'{METRIC_KEY_PREFIX}{name}'
+
+
+def increment(name, amount=1):
+    key = _key(name)
+    if cache.add(key, amount, None):
+        return
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.add(key, amount, None)
+
+
+def get_counts(names):
+    """Return {name: count} for ``names``; missing counters are 0."""
+    found = cache.get_many([_key(name) for name in names])
+    return {name: found.get(_key(name), 0) for name in names}
+
+
+def reset(names):
+    cache.delete_many([_key(name) for name in names])
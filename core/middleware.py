@@ -0,0 +1,128 @@
+"""
+Server-Timing instrumentation of sampled requests.
+
+A fraction SERVER_TIMING_SAMPLE_RATE (0 to 1) of requests is timed. For
+those, every query on every database connection is counted and timed
+through connection.execute_wrapper(), and the response gets a
+Server-Timing header, e.g.::
+
+    Server-Timing: db;dur=4.1;desc="3 queries", paginate;dur=1.2,
+        serialize;dur=3.0, render;dur=0.8, view;dur=9.6, total;dur=10.3
+
+The same numbers, plus the method, path, status and response size, are
+logged as one line on the "core.timing" logger at INFO.
+
+view covers the view call; db, paginate, serialize and render are steps
+inside it (paginate and serialize only for paginated lists, see
+core.pagination; render by core.renderers.TimedJSONRenderer). total spans
+the middlewares below this one too. Unsampled requests pay for one
+random() call.
+"""
+
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core import timing
+
+logger = logging.getLogger('core.timing')
+
+# Server-Timing metric order; steps a request did not go through are left out
+METRICS = ('db', 'paginate', 'serialize', 'render', 'view', 'total')
+
+
+def _milliseconds(seconds):
+    return round(seconds * 1000, 1)
+
+
+def _logfmt(value):
+    if isinstance(value, str) and (not value or any(c in value for c in ' "=')):
+        return json.dumps(value)
+    return value
+
+
+def _response_size(response):
+    if getattr(response, 'streaming', False):
+        return None
+    return len(response.content)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def is_sampled(self, request):
+        rate = getattr(settings, 'SERVER_TIMING_SAMPLE_RATE', 0)
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def __call__(self, request):
+        if not self.is_sampled(request):
+            return self.get_response(request)
+
+        timings = timing.RequestTimings()
+        request.server_timings = timings
+        token = timing.activate(timings)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(timings.execute_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            timing.deactivate(token)
+
+        view_started = getattr(request, '_server_timing_view_started', None)
+        if view_started is not None and 'view' not in timings.durations:
+            # No template response hook ran: the view returned a plain response
+            timings.add('view', time.perf_counter() - view_started)
+        timings.add('total', time.perf_counter() - timings.started)
+        self.report(request, response, timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(request, 'server_timings', None) is not None:
+            request._server_timing_view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Called after the view returns and before the response is rendered
+        view_started = getattr(request, '_server_timing_view_started', None)
+        if view_started is not None:
+            request.server_timings.add('view', time.perf_counter() - view_started)
+        return response
+
+    def report(self, request, response, timings):
+        durations = {**timings.durations, 'db': timings.db_time}
+        metrics = []
+        for name in METRICS:
+            if name == 'db':
+                metrics.append(
+                    f'db;dur={_milliseconds(timings.db_time)};desc="{timings.db_queries} queries"'
+                )
+            elif name in durations:
+                metrics.append(f'{name};dur={_milliseconds(durations[name])}')
+        response['Server-Timing'] = ', '.join(metrics)
+
+        size = _response_size(response)
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'db_queries': timings.db_queries,
+            **{
+                f'{name}_ms': _milliseconds(durations[name])
+                for name in METRICS if name in durations
+            },
+            'size': size,
+        }
+        logger.info(
+            ' '.join(
+                f'{key}={_logfmt(value)}' for key, value in fields.items() if value is not None
+            ),
+            extra={'timing': fields},
+        )
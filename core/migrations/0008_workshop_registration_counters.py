@@ -0,0 +1,86 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:56
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_registration_counters(apps, schema_editor):
+    WorkShop = apps.get_model("core", "WorkShop")
+    experience_fields = {
+        "Beginner": "beginner_registrations_count",
+        "Intermediate": "intermediate_registrations_count",
+        "Advanced": "advanced_registrations_count",
+    }
+    annotations = {
+        "registrations_count": Count("registrations"),
+        "physical_registrations_count": Count(
+            "registrations", filter=Q(registrations__will_attend_physical=True)
+        ),
+        "virtual_registrations_count": Count(
+            "registrations", filter=Q(registrations__will_attend_physical=False)
+        ),
+    }
+    for experience, field in experience_fields.items():
+        annotations[field] = Count(
+            "registrations", filter=Q(registrations__django_experience=experience)
+        )
+    counted = WorkShop.objects.order_by().annotate(
+        **{f"actual_{field}": expression for field, expression in annotations.items()}
+    )
+    for workshop in counted.iterator():
+        WorkShop.objects.filter(pk=workshop.pk).update(
+            **{field: getattr(workshop, f"actual_{field}") for field in annotations}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_alter_workshop_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workshop",
+            name="advanced_registrations_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Advanced Registrations"
+            ),
+        ),
+        migrations.AddField(
+            model_name="workshop",
+            name="beginner_registrations_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Beginner Registrations"
+            ),
+        ),
+        migrations.AddField(
+            model_name="workshop",
+            name="intermediate_registrations_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Intermediate Registrations"
+            ),
+        ),
+        migrations.AddField(
+            model_name="workshop",
+            name="physical_registrations_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Physical Registrations"
+            ),
+        ),
+        migrations.AddField(
+            model_name="workshop",
+            name="registrations_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Total Registrations"
+            ),
+        ),
+        migrations.AddField(
+            model_name="workshop",
+            name="virtual_registrations_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Virtual Registrations"
+            ),
+        ),
+        migrations.RunPython(populate_registration_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:57
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_workshop_registration_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEmail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255, verbose_name="Subject")),
+                ("body", models.TextField(verbose_name="Body")),
+                (
+                    "content_subtype",
+                    models.CharField(
+                        default="plain", max_length=20, verbose_name="Content Subtype"
+                    ),
+                ),
+                ("from_email", models.CharField(max_length=255, verbose_name="From")),
+                ("to_email", models.EmailField(max_length=254, verbose_name="To")),
+                (
+                    "headers",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Extra Headers"
+                    ),
+                ),
+                (
+                    "attachments",
+                    models.JSONField(
+                        blank=True, default=list, verbose_name="Attachments"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sending", "Sending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Attempts"
+                    ),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Next Attempt At",
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, null=True, verbose_name="Last Error"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "sent_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Sent At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Outbox Email",
+                "verbose_name_plural": "Outbox Emails",
+                "ordering": ["created_at", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"], name="core_outbox_due_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_outboxemail"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workshop",
+            name="physical_capacity",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Maximum physical attendees. Leave empty for no limit.",
+                null=True,
+                verbose_name="Physical Capacity",
+            ),
+        ),
+        migrations.AddField(
+            model_name="workshop",
+            name="virtual_capacity",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Maximum virtual attendees. Leave empty for no limit.",
+                null=True,
+                verbose_name="Virtual Capacity",
+            ),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_workshop_capacity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WaitlistEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "user_name",
+                    models.CharField(max_length=255, verbose_name="User Name"),
+                ),
+                (
+                    "user_email",
+                    models.EmailField(max_length=254, verbose_name="User Email"),
+                ),
+                (
+                    "phone_number",
+                    models.CharField(
+                        blank=True,
+                        max_length=13,
+                        null=True,
+                        verbose_name="Phone Number",
+                    ),
+                ),
+                (
+                    "will_attend_physical",
+                    models.BooleanField(
+                        default=True, verbose_name="Will Attend Physically"
+                    ),
+                ),
+                (
+                    "django_experience",
+                    models.CharField(
+                        choices=[
+                            ("Beginner", "Beginner"),
+                            ("Intermediate", "Intermediate"),
+                            ("Advanced", "Advanced"),
+                        ],
+                        default="Beginner",
+                        max_length=20,
+                        verbose_name="Django Experience Level",
+                    ),
+                ),
+                (
+                    "joined_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Joined At"),
+                ),
+                (
+                    "workshop",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="waitlist_entries",
+                        to="core.workshop",
+                        verbose_name="Workshop",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Waitlist Entry",
+                "verbose_name_plural": "Waitlist Entries",
+                "ordering": ["joined_at", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["workshop", "will_attend_physical", "joined_at"],
+                        name="core_waitlist_head_idx",
+                    )
+                ],
+                "unique_together": {("workshop", "user_email")},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_waitlistentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workshop",
+            name="sequence",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Revision"
+            ),
+        ),
+        migrations.AddField(
+            model_name="workshop",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+        ),
+    ]
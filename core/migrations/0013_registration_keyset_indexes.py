@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_workshop_updated_at_sequence"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="workshopregistration",
+            index=models.Index(
+                fields=["registration_date", "id"], name="core_reg_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workshopregistration",
+            index=models.Index(
+                fields=["workshop", "registration_date", "id"],
+                name="core_reg_workshop_date_idx",
+            ),
+        ),
+    ]
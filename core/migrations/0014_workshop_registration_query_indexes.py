@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_registration_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="workshop",
+            index=models.Index(
+                fields=["-workshop_date", "-id"], name="core_workshop_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workshop",
+            index=models.Index(
+                fields=["is_ended", "workshop_date"], name="core_workshop_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workshop",
+            index=models.Index(
+                condition=models.Q(("is_ended", False)),
+                fields=["workshop_date", "workshop_time", "id"],
+                name="core_workshop_upcoming_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workshopregistration",
+            index=models.Index(
+                fields=["workshop", "will_attend_physical", "django_experience"],
+                name="core_reg_bucket_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,99 @@
+from django.db import migrations
+
+# The SQL is spelled out here rather than imported from core.search, so
+# this migration keeps doing what it did when it was written.
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS core_workshop_fts USING fts5(
+        workshop_name, workshop_location, workshop_description,
+        content='core_workshop', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_workshop_fts_insert
+    AFTER INSERT ON core_workshop BEGIN
+        INSERT INTO core_workshop_fts(
+            rowid, workshop_name, workshop_location, workshop_description
+        )
+        VALUES (
+            new.id, new.workshop_name, new.workshop_location, new.workshop_description
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_workshop_fts_delete
+    AFTER DELETE ON core_workshop BEGIN
+        INSERT INTO core_workshop_fts(
+            core_workshop_fts, rowid,
+            workshop_name, workshop_location, workshop_description
+        )
+        VALUES (
+            'delete', old.id,
+            old.workshop_name, old.workshop_location, old.workshop_description
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS core_workshop_fts_update
+    AFTER UPDATE OF workshop_name, workshop_location, workshop_description
+    ON core_workshop BEGIN
+        INSERT INTO core_workshop_fts(
+            core_workshop_fts, rowid,
+            workshop_name, workshop_location, workshop_description
+        )
+        VALUES (
+            'delete', old.id,
+            old.workshop_name, old.workshop_location, old.workshop_description
+        );
+        INSERT INTO core_workshop_fts(
+            rowid, workshop_name, workshop_location, workshop_description
+        )
+        VALUES (
+            new.id, new.workshop_name, new.workshop_location, new.workshop_description
+        );
+    END
+    """,
+    "INSERT INTO core_workshop_fts(core_workshop_fts) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS core_workshop_fts_insert",
+    "DROP TRIGGER IF EXISTS core_workshop_fts_delete",
+    "DROP TRIGGER IF EXISTS core_workshop_fts_update",
+    "DROP TABLE IF EXISTS core_workshop_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for sql in SQLITE_INSTALL:
+            schema_editor.execute(sql)
+    elif vendor == "mysql":
+        schema_editor.execute(
+            "ALTER TABLE core_workshop ADD FULLTEXT INDEX core_workshop_fulltext "
+            "(workshop_name, workshop_location, workshop_description)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for sql in SQLITE_UNINSTALL:
+            schema_editor.execute(sql)
+    elif vendor == "mysql":
+        schema_editor.execute(
+            "ALTER TABLE core_workshop DROP INDEX core_workshop_fulltext"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_workshop_registration_query_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0015_workshop_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workshop",
+            name="workshop_image_header_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
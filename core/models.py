@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 # Create your models here.
 
@@ -10,12 +11,34 @@ WORKSHOP_IMAGE_UPLOAD_PATH = 'header/workshop_images/'
 # Model to add workshops
 class WorkShop(models.Model):
     workshop_image_header = models.ImageField(upload_to=WORKSHOP_IMAGE_UPLOAD_PATH, null=True, blank=True, verbose_name="Workshop Image Header")
+    # Resized copies of the header (core.images)
+    workshop_image_header_variants = models.JSONField(default=dict, blank=True, editable=False)
     workshop_name = models.CharField(max_length=255, verbose_name="Workshop Name", null=False, blank=False)
     workshop_date = models.DateField(verbose_name="Workshop Date", null=False, blank=False)
     workshop_time = models.TimeField(verbose_name="Workshop Time", null=True, blank=True)
     workshop_location = models.CharField(max_length=255, verbose_name="Workshop Location", null=False, blank=False)
     workshop_description = models.TextField(verbose_name="Workshop Description", null=True, blank=True)
     is_ended = models.BooleanField(default=False, verbose_name="Is Ended")
+    physical_capacity = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name="Physical Capacity",
+        help_text="Maximum physical attendees. Leave empty for no limit."
+    )
+    virtual_capacity = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name="Virtual Capacity",
+        help_text="Maximum virtual attendees. Leave empty for no limit."
+    )
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
+    # iCalendar SEQUENCE, bumped on every save so calendar clients apply updates
+    sequence = models.PositiveIntegerField(default=0, editable=False, verbose_name="Revision")
+
+    # Denormalized registration counters, maintained by core.signals
+    registrations_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Total Registrations")
+    physical_registrations_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Physical Registrations")
+    virtual_registrations_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Virtual Registrations")
+    beginner_registrations_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Beginner Registrations")
+    intermediate_registrations_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Intermediate Registrations")
+    advanced_registrations_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Advanced Registrations")
     
     
     class Meta:
@@ -23,10 +46,69 @@ class WorkShop(models.Model):
         verbose_name_plural = "Workshops"
         ordering = ['-workshop_date', '-id']  
         # table_name = 'workshops'
+        indexes = [
+            # Default ordering: workshop list API and admin changelist
+            models.Index(fields=['-workshop_date', '-id'], name='core_workshop_date_idx'),
+            # WorkshopStatusFilter (is_ended + date range)
+            models.Index(fields=['is_ended', 'workshop_date'], name='core_workshop_status_idx'),
+            # Calendar feed: upcoming workshops in start order. Backends
+            # without partial indexes (MySQL) use core_workshop_status_idx.
+            models.Index(
+                fields=['workshop_date', 'workshop_time', 'id'],
+                condition=models.Q(is_ended=False),
+                name='core_workshop_upcoming_idx',
+            ),
+        ]
         
     def __str__(self):
         return f"{self.workshop_name} - {self.workshop_date}"
     
+    # Written only by F() updates in core.counters, never by save()
+    COUNTER_FIELDS = (
+        'registrations_count',
+        'physical_registrations_count',
+        'virtual_registrations_count',
+        'beginner_registrations_count',
+        'intermediate_registrations_count',
+        'advanced_registrations_count',
+    )
+    
+    def save(self, *args, **kwargs):
+        if self.pk is None or self._state.adding or kwargs.get('force_insert'):
+            super().save(*args, **kwargs)
+            return
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            # A full save would write this instance's (possibly stale)
+            # counters back over concurrent registrations
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+                and field.attname not in deferred
+            ]
+        kwargs['update_fields'] = {'sequence', *update_fields}
+        # Bump in the database so concurrent saves each count
+        sequence = self.sequence
+        self.sequence = models.F('sequence') + 1
+        try:
+            super().save(*args, **kwargs)
+        except Exception:
+            self.sequence = sequence
+            raise
+        self.refresh_from_db(fields=['sequence'])
+    
+    def free_seats(self, physical):
+        """Return the seats left for an attendance type, or None if unlimited"""
+        if physical:
+            capacity, taken = self.physical_capacity, self.physical_registrations_count
+        else:
+            capacity, taken = self.virtual_capacity, self.virtual_registrations_count
+        if capacity is None:
+            return None
+        return max(capacity - taken, 0)
+    
     
     
 
@@ -52,15 +134,44 @@ class WorkshopRegistration(models.Model):
     )
     registration_date = models.DateTimeField(auto_now_add=True, verbose_name="Registration Date")
     
+    # Fields that decide which WorkShop counters a registration belongs to
+    COUNTED_FIELDS = ('workshop_id', 'will_attend_physical', 'django_experience')
+    
     class Meta:
         verbose_name = "Workshop Registration"
         verbose_name_plural = "Workshop Registrations"
         ordering = ['registration_date']
         unique_together = ['workshop', 'user_email']
+        indexes = [
+            # Keyset pagination of registration listings, overall and per workshop
+            models.Index(fields=['registration_date', 'id'], name='core_reg_date_idx'),
+            models.Index(fields=['workshop', 'registration_date', 'id'], name='core_reg_workshop_date_idx'),
+            # Covers the per-bucket counts of reconcile_registration_counts
+            models.Index(
+                fields=['workshop', 'will_attend_physical', 'django_experience'],
+                name='core_reg_bucket_idx',
+            ),
+        ]
         
     def __str__(self):
         return f"{self.user_name} registered for {self.workshop.workshop_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded counter buckets so updates can move counts
+        instance._counted_values = {
+            name: getattr(instance, name) for name in cls.COUNTED_FIELDS
+            if name in instance.__dict__
+        }
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # A new registration claims its seat in a pre_save handler; run it
+        # in the same transaction so a failed insert gives the seat back.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+    
     def get_attendance_display(self):
         """Return human-readable attendance type"""
         return "Physical" if self.will_attend_physical else "Virtual"
@@ -68,3 +179,73 @@ class WorkshopRegistration(models.Model):
     def get_experience_display(self):
         """Return human-readable experience level"""
         return self.django_experience
+
+
+# Model for people waiting for a seat at a full workshop
+class WaitlistEntry(models.Model):
+    workshop = models.ForeignKey(WorkShop, on_delete=models.CASCADE, related_name='waitlist_entries', verbose_name="Workshop")
+    user_name = models.CharField(max_length=255, verbose_name="User Name", null=False, blank=False)
+    user_email = models.EmailField(verbose_name="User Email", null=False, blank=False)
+    phone_number = models.CharField(max_length=13, verbose_name="Phone Number", blank=True, null=True)
+    will_attend_physical = models.BooleanField(default=True, verbose_name="Will Attend Physically")
+    django_experience = models.CharField(
+        max_length=20,
+        choices=DjangoExperience.choices,
+        default=DjangoExperience.BEGINNER,
+        verbose_name="Django Experience Level"
+    )
+    joined_at = models.DateTimeField(auto_now_add=True, verbose_name="Joined At")
+    
+    class Meta:
+        verbose_name = "Waitlist Entry"
+        verbose_name_plural = "Waitlist Entries"
+        ordering = ['joined_at', 'id']
+        unique_together = ['workshop', 'user_email']
+        indexes = [
+            # Promotion reads the head of one workshop's queue per attendance type
+            models.Index(fields=['workshop', 'will_attend_physical', 'joined_at'], name='core_waitlist_head_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.user_name} waiting for {self.workshop.workshop_name}"
+
+
+# Delivery state of a queued email
+class EmailStatus(models.TextChoices):
+    PENDING = 'pending', 'Pending'
+    SENDING = 'sending', 'Sending'
+    SENT = 'sent', 'Sent'
+    FAILED = 'failed', 'Failed'
+
+
+# Outbox of emails waiting to be delivered by the send_queued_emails command
+class OutboxEmail(models.Model):
+    subject = models.CharField(max_length=255, verbose_name="Subject")
+    body = models.TextField(verbose_name="Body")
+    content_subtype = models.CharField(max_length=20, default='plain', verbose_name="Content Subtype")
+    from_email = models.CharField(max_length=255, verbose_name="From")
+    to_email = models.EmailField(verbose_name="To")
+    headers = models.JSONField(default=dict, blank=True, verbose_name="Extra Headers")
+    attachments = models.JSONField(default=list, blank=True, verbose_name="Attachments")
+    status = models.CharField(
+        max_length=10,
+        choices=EmailStatus.choices,
+        default=EmailStatus.PENDING,
+        verbose_name="Status"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Attempts")
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name="Next Attempt At")
+    last_error = models.TextField(blank=True, null=True, verbose_name="Last Error")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
+    sent_at = models.DateTimeField(blank=True, null=True, verbose_name="Sent At")
+
+    class Meta:
+        verbose_name = "Outbox Email"
+        verbose_name_plural = "Outbox Emails"
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='core_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
@@ -0,0 +1,157 @@
+import logging
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import EmailStatus, OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed message stays reserved for the worker that claimed it
+CLAIM_LEASE = timedelta(minutes=10)
+
+# Retry delays grow as BACKOFF_BASE * 2 ** (attempts - 1), up to BACKOFF_MAX
+BACKOFF_BASE = timedelta(minutes=1)
+BACKOFF_MAX = timedelta(hours=6)
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+def outbox_email_from_message(message):
+    """
+    Build an unsaved OutboxEmail for every recipient of an EmailMessage.
+    """
+    return [
+        OutboxEmail(
+            subject=message.subject,
+            body=message.body,
+            content_subtype=message.content_subtype,
+            from_email=message.from_email,
+            to_email=recipient,
+            headers=dict(message.extra_headers),
+            attachments=[list(attachment) for attachment in message.attachments],
+        )
+        for recipient in message.to
+    ]
+
+
+def enqueue_email(message):
+    """
+    Queue an EmailMessage for delivery by the worker.
+
+    Call this inside the transaction that produced the email so the row is
+    committed (or rolled back) together with it.
+    """
+    outbox_emails = outbox_email_from_message(message)
+    for outbox_email in outbox_emails:
+        outbox_email.save()
+    return outbox_emails
+
+
+def enqueue_emails(messages):
+    """
+    Queue several EmailMessages with a single INSERT.
+    """
+    outbox_emails = [
+        outbox_email
+        for message in messages
+        for outbox_email in outbox_email_from_message(message)
+    ]
+    return OutboxEmail.objects.bulk_create(outbox_emails)
+
+
+def claim_batch(batch_size):
+    """
+    Reserve up to ``batch_size`` due messages for this worker.
+
+    Pending messages and messages whose previous claim lease expired are
+    both due. Claimed rows are moved to SENDING with a fresh lease so that
+    other workers skip them.
+    """
+    now = timezone.now()
+    due = (
+        OutboxEmail.objects
+        .filter(
+            Q(status=EmailStatus.PENDING) | Q(status=EmailStatus.SENDING),
+            next_attempt_at__lte=now,
+        )
+        .order_by('next_attempt_at', 'id')
+    )
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list('id', flat=True)[:batch_size])
+        OutboxEmail.objects.filter(id__in=ids).update(
+            status=EmailStatus.SENDING,
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + CLAIM_LEASE,
+        )
+    return list(OutboxEmail.objects.filter(id__in=ids).order_by('id'))
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff for the given number of attempts so far.
+    """
+    return min(BACKOFF_BASE * 2 ** max(attempts - 1, 0), BACKOFF_MAX)
+
+
+def _to_message(outbox_email, smtp_connection):
+    message = EmailMessage(
+        subject=outbox_email.subject,
+        body=outbox_email.body,
+        from_email=outbox_email.from_email,
+        to=[outbox_email.to_email],
+        headers=outbox_email.headers,
+        connection=smtp_connection,
+    )
+    message.content_subtype = outbox_email.content_subtype
+    for filename, content, mimetype in outbox_email.attachments:
+        message.attach(filename=filename, content=content, mimetype=mimetype)
+    return message
+
+
+def deliver_batch(outbox_emails, smtp_connection=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    Send claimed messages over one shared connection and record the outcome.
+
+    Returns a (sent, failed) tuple of counts for this batch.
+    """
+    smtp_connection = smtp_connection or get_connection()
+    sent = failed = 0
+
+    for outbox_email in outbox_emails:
+        try:
+            smtp_connection.open()
+            _to_message(outbox_email, smtp_connection).send()
+        except Exception as e:
+            failed += 1
+            logger.warning(
+                "Error sending outbox email %s (attempt %s): %s",
+                outbox_email.pk, outbox_email.attempts, e
+            )
+            # A failed SMTP conversation may leave the socket unusable
+            smtp_connection.close()
+            if outbox_email.attempts >= max_attempts:
+                status = EmailStatus.FAILED
+                next_attempt_at = outbox_email.next_attempt_at
+            else:
+                status = EmailStatus.PENDING
+                next_attempt_at = timezone.now() + retry_delay(outbox_email.attempts)
+            OutboxEmail.objects.filter(pk=outbox_email.pk).update(
+                status=status,
+                next_attempt_at=next_attempt_at,
+                last_error=str(e),
+            )
+        else:
+            sent += 1
+            OutboxEmail.objects.filter(pk=outbox_email.pk).update(
+                status=EmailStatus.SENT,
+                sent_at=timezone.now(),
+                last_error=None,
+            )
+
+    return sent, failed
@@ -0,0 +1,47 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer, TemplateHTMLRenderer
+
+from core.timing import span
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer whose rendering is reported as the "render" step."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with span('render'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class ICalendarRenderer(BaseRenderer):
+    """Passes an already rendered iCalendar string through."""
+    media_type = 'text/calendar'
+    format = 'ics'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            # Error responses (e.g. {'detail': ...}) are sent as plain text
+            data = str(data.get('detail', data))
+        return data.encode(self.charset)
+
+
+class EmailLinkPageRenderer(TemplateHTMLRenderer):
+    """
+    Renders the response of a signed email link as a small HTML page, for
+    people who open the link in a browser.
+
+    A GET only checks the link, so its page carries a button that POSTs
+    back to the same URL. The view names the page (``link_title``) and
+    the button (``link_action``).
+    """
+    template_name = 'links/email_link.html'
+
+    def get_template_context(self, data, renderer_context):
+        view = renderer_context['view']
+        response = renderer_context['response']
+        context = dict(data) if isinstance(data, dict) else {'detail': data}
+        context['title'] = view.link_title
+        if renderer_context['request'].method == 'GET' and response.status_code == 200:
+            context['action'] = view.link_action
+        return context
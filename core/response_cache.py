@@ -0,0 +1,109 @@
+"""
+Rendered-response cache for the public read-only API views.
+
+Responses are stored as the exact bytes the renderer produced, keyed on
+the view's ETag (absolute request URL, negotiated media type and the
+version of every collection the view reads). A post_save/post_delete on
+any model feeding a collection bumps its version (see core.cache_versions),
+so stale entries are never looked up again and simply expire.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from core import metrics
+from core.conditional import ConditionalGetMixin
+
+RESPONSE_KEY_PREFIX = 'core:response:'
+HIT = 'hits'
+MISS = 'misses'
+
+
+def _metric(outcome, collection):
+    return f'response-cache:{outcome}:{collection}'
+
+
+def record(outcome, collections):
+    """Count a cache hit or miss against each of ``collections``."""
+    for collection in collections:
+        metrics.increment(_metric(outcome, collection))
+
+
+def _metrics(collections):
+    return [
+        _metric(outcome, collection)
+        for collection in collections
+        for outcome in (HIT, MISS)
+    ]
+
+
+def get_stats(collections):
+    """Return {collection: {'hits': n, 'misses': n}}."""
+    counts = metrics.get_counts(_metrics(collections))
+    return {
+        collection: {
+            outcome: counts[_metric(outcome, collection)] for outcome in (HIT, MISS)
+        }
+        for collection in collections
+    }
+
+
+def reset_stats(collections):
+    metrics.reset(_metrics(collections))
+
+
+def bypass_response_cache(request):
+    """
+    Mark a Django request to be rendered without reading or filling the
+    response cache, e.g. one built outside the request cycle.
+    """
+    request._bypass_response_cache = True
+    return request
+
+
+class CachedResponseMixin(ConditionalGetMixin):
+    """
+    ConditionalGetMixin that also serves full responses from the cache.
+
+    Only JSON responses are cached; the browsable API embeds per-user
+    content and is always rendered.
+    """
+    cache_timeout = None
+
+    def is_cacheable(self, request):
+        if getattr(request, '_bypass_response_cache', False):
+            return False
+        return getattr(request.accepted_renderer, 'format', None) == 'json'
+
+    def get_cache_key(self, etag):
+        return RESPONSE_KEY_PREFIX + etag.strip('"')
+
+    def get_modified_response(self, request, etag, *args, **kwargs):
+        self.response_cache_key = None
+        if not self.is_cacheable(request):
+            return super().get_modified_response(request, etag, *args, **kwargs)
+
+        key = self.get_cache_key(etag)
+        cached = cache.get(key)
+        if cached is not None:
+            record(HIT, self.cache_collections)
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        record(MISS, self.cache_collections)
+        self.response_cache_key = key
+        return super().get_modified_response(request, etag, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, 'response_cache_key', None)
+        if key and isinstance(response, Response) and response.status_code == 200:
+            response.render()
+            timeout = self.cache_timeout or settings.RESPONSE_CACHE_TIMEOUT
+            cache.set(key, (response.content, response['Content-Type']), timeout)
+            response['X-Cache'] = 'MISS'
+        return response
@@ -0,0 +1,247 @@
+"""
+Full-text search over workshop name, location and description.
+
+SQLite uses an FTS5 table (core_workshop_fts) with core_workshop as its
+external content, kept in sync by triggers, so every write path (save(),
+update(), bulk_create(), raw SQL) updates the index. MySQL uses an InnoDB
+FULLTEXT index, which the engine maintains itself. Other backends fall
+back to icontains matching.
+"""
+
+import html
+import re
+
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from core.models import WorkShop
+
+FTS_TABLE = 'core_workshop_fts'
+FULLTEXT_INDEX = 'core_workshop_fulltext'
+SEARCH_COLUMNS = ('workshop_name', 'workshop_location', 'workshop_description')
+
+# Column weights for ranking: a hit in the name counts most
+NAME_WEIGHT, LOCATION_WEIGHT, DESCRIPTION_WEIGHT = 10.0, 4.0, 1.0
+
+# Tokens taken from a query; the rest is ignored
+MAX_TERMS = 8
+SNIPPET_CHARS = 120
+
+# Placeholders around highlighted terms, replaced after HTML escaping
+_MARK_START, _MARK_END = '\x02', '\x03'
+
+_columns = ', '.join(SEARCH_COLUMNS)
+_new_values = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+_old_values = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+
+SQLITE_TRIGGERS = {
+    f'{FTS_TABLE}_insert': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON core_workshop BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+        END
+    """,
+    f'{FTS_TABLE}_delete': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON core_workshop BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns})
+            VALUES ('delete', old.id, {_old_values});
+        END
+    """,
+    # Only the indexed columns: counter updates do not touch the index
+    f'{FTS_TABLE}_update': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF {_columns} ON core_workshop BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns})
+            VALUES ('delete', old.id, {_old_values});
+            INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+        END
+    """,
+}
+
+
+def install_sqlite_search(connection):
+    """
+    Create the FTS5 table and its triggers if they are missing.
+
+    SQLite drops a table's triggers when Django rebuilds it during a
+    migration; when any trigger had to be recreated the index is rebuilt
+    from core_workshop. Returns True if it was rebuilt.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+            [f'{FTS_TABLE}%'],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if FTS_TABLE in existing and existing.issuperset(SQLITE_TRIGGERS):
+            return False
+
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{_columns}, content='core_workshop', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        for sql in SQLITE_TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def uninstall_sqlite_search(connection):
+    with connection.cursor() as cursor:
+        for name in SQLITE_TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def ensure_search_index(using, **kwargs):
+    """post_migrate handler restoring triggers a table rebuild dropped."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    if WorkShop._meta.db_table in connection.introspection.table_names():
+        install_sqlite_search(connection)
+
+
+def search_terms(text):
+    """Split user input into at most MAX_TERMS lowercase word tokens."""
+    return re.findall(r'\w+', text.lower())[:MAX_TERMS]
+
+
+def fts5_query(terms):
+    """
+    Build an FTS5 MATCH expression requiring every term.
+
+    Terms are quoted so user input can never be parsed as FTS5 syntax; the
+    last one matches as a prefix to support search-as-you-type.
+    """
+    parts = [f'"{term}"' for term in terms]
+    parts[-1] += '*'
+    return ' '.join(parts)
+
+
+def boolean_mode_query(terms):
+    """The MySQL BOOLEAN MODE equivalent of fts5_query()."""
+    parts = [f'+{term}' for term in terms]
+    parts[-1] += '*'
+    return ' '.join(parts)
+
+
+def highlight(text):
+    """HTML-escape a snippet and turn the match placeholders into <mark>."""
+    return (
+        html.escape(text)
+        .replace(_MARK_START, '<mark>')
+        .replace(_MARK_END, '</mark>')
+    )
+
+
+def make_snippet(workshop, terms):
+    """
+    Build a highlighted snippet for a search hit.
+
+    Done in Python for the returned page only: FTS5's snippet() reloads
+    the term's whole doclist per row, which dominates for common terms.
+
+    Takes a window of SNIPPET_CHARS around the first hit, preferring the
+    description over the location and name.
+    """
+    pattern = re.compile(
+        r'\b(' + '|'.join(re.escape(term) for term in terms) + r')\w*', re.IGNORECASE
+    )
+    for column in reversed(SEARCH_COLUMNS):
+        text = getattr(workshop, column) or ''
+        match = pattern.search(text)
+        if match is None:
+            continue
+        start = max(match.start() - SNIPPET_CHARS // 3, 0)
+        end = start + SNIPPET_CHARS
+        window = pattern.sub(
+            lambda m: f'{_MARK_START}{m.group(0)}{_MARK_END}', text[start:end]
+        )
+        prefix = '…' if start else ''
+        suffix = '…' if end < len(text) else ''
+        return highlight(prefix + window + suffix)
+    return ''
+
+
+def _sqlite_search(terms, limit):
+    # Every match is ranked; only the best ``limit`` are joined back to
+    # core_workshop
+    workshops = list(WorkShop.objects.raw(
+        f"""
+        SELECT w.*, top.search_rank
+        FROM (
+            SELECT rowid, bm25({FTS_TABLE}, %s, %s, %s) AS search_rank
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s
+            ORDER BY search_rank
+            LIMIT %s
+        ) AS top
+        JOIN core_workshop w ON w.id = top.rowid
+        ORDER BY top.search_rank
+        """,
+        [NAME_WEIGHT, LOCATION_WEIGHT, DESCRIPTION_WEIGHT, fts5_query(terms), limit],
+    ))
+    for workshop in workshops:
+        # bm25() is lower-is-better; expose higher-is-better like MySQL
+        workshop.rank = -workshop.search_rank
+    return workshops
+
+
+def _mysql_relevance(terms):
+    return RawSQL(
+        f'MATCH ({_columns}) AGAINST (%s IN BOOLEAN MODE)', [boolean_mode_query(terms)]
+    )
+
+
+def _icontains_filter(terms):
+    query = Q()
+    for term in terms:
+        query &= Q(workshop_name__icontains=term) | Q(
+            workshop_location__icontains=term
+        ) | Q(workshop_description__icontains=term)
+    return query
+
+
+def search_workshops(text, limit=20):
+    """
+    Return up to ``limit`` workshops matching ``text``, best match first.
+
+    Each workshop gets a ``rank`` (higher is better) and an HTML-safe
+    ``snippet`` with matches wrapped in <mark>.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return []
+
+    if connection.vendor == 'sqlite':
+        workshops = _sqlite_search(terms, limit)
+    elif connection.vendor == 'mysql':
+        workshops = list(
+            WorkShop.objects.annotate(rank=_mysql_relevance(terms))
+            .filter(rank__gt=0)
+            .order_by('-rank', '-workshop_date')[:limit]
+        )
+    else:
+        workshops = list(WorkShop.objects.filter(_icontains_filter(terms))[:limit])
+        for workshop in workshops:
+            workshop.rank = 0.0
+    for workshop in workshops:
+        workshop.snippet = make_snippet(workshop, terms)
+    return workshops
+
+
+def filter_workshops(queryset, text):
+    """Restrict a WorkShop queryset to rows matching ``text`` (unranked)."""
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+    if connection.vendor == 'sqlite':
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [fts5_query(terms)],
+        ))
+    if connection.vendor == 'mysql':
+        return queryset.annotate(search_rank=_mysql_relevance(terms)).filter(search_rank__gt=0)
+    return queryset.filter(_icontains_filter(terms))
@@ -1,26 +1,21 @@
 from rest_framework import serializers
-from core.models import WorkShop, WorkshopRegistration
-from drf_spectacular.utils import extend_schema_field
+from core.images import ImageSrcsetField
+from core.models import WaitlistEntry, WorkShop, WorkshopRegistration
 
 
 class WorkShopSerializer(serializers.ModelSerializer):
     """
     Serializer for WorkShop model.
     """
-    registrations_count = serializers.SerializerMethodField()
+    workshop_image_header_srcset = ImageSrcsetField(source='workshop_image_header_variants')
     
     class Meta:
         model = WorkShop
         fields = [
-            'id', 'workshop_image_header', 'workshop_name', 'workshop_date','workshop_time', 'workshop_description', 'workshop_location',
-            'is_ended', 'registrations_count'
+            'id', 'workshop_image_header', 'workshop_image_header_srcset', 'workshop_name', 'workshop_date','workshop_time', 'workshop_description', 'workshop_location',
+            'is_ended', 'physical_capacity', 'virtual_capacity', 'registrations_count'
         ]
-        read_only_fields = ['id']
-    
-    @extend_schema_field(serializers.IntegerField)
-    def get_registrations_count(self, obj):
-        """Get the total number of registrations for this workshop."""
-        return obj.registrations.count()
+        read_only_fields = ['id', 'registrations_count']
 
 
 class WorkshopRegistrationSerializer(serializers.ModelSerializer):
@@ -47,6 +42,9 @@ class WorkshopRegistrationSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'id', 'registration_date', 'workshop_name', 'workshop_date'
         ]
+        # Duplicates are rejected by the unique_together constraint at
+        # insert time instead of a pre-query (see WorkshopRegistrationCreateView)
+        validators = []
     
     def validate_user_email(self, value):
         """
@@ -73,17 +71,41 @@ class WorkShopListSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for listing workshops.
     """
-    registrations_count = serializers.SerializerMethodField()
+    workshop_image_header_srcset = ImageSrcsetField(source='workshop_image_header_variants')
     
     class Meta:
         model = WorkShop
         fields = [
-            'id', 'workshop_image_header', 'workshop_name', 'workshop_date', 'workshop_time', 'workshop_description', 'workshop_location',
-            'is_ended', 'registrations_count'
+            'id', 'workshop_image_header', 'workshop_image_header_srcset', 'workshop_name', 'workshop_date', 'workshop_time', 'workshop_description', 'workshop_location',
+            'is_ended', 'physical_capacity', 'virtual_capacity', 'registrations_count'
         ]
-        read_only_fields = ['id']
+        read_only_fields = ['id', 'registrations_count']
+
+
+class WorkshopSearchResultSerializer(WorkShopListSerializer):
+    """
+    Workshop search hit with its relevance and highlighted snippet.
+    """
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
     
-    @extend_schema_field(serializers.IntegerField)
-    def get_registrations_count(self, obj):
-        """Get the total number of registrations for this workshop."""
-        return obj.registrations.count()
\ No newline at end of file
+    class Meta(WorkShopListSerializer.Meta):
+        fields = WorkShopListSerializer.Meta.fields + ['rank', 'snippet']
+
+
+class WaitlistEntrySerializer(WorkshopRegistrationSerializer):
+    """
+    Serializer for joining a workshop waitlist.
+    """
+    
+    class Meta:
+        model = WaitlistEntry
+        fields = [
+            'id', 'workshop', 'workshop_name', 'workshop_date', 'workshop_time', 'user_name',
+            'user_email', 'phone_number', 'will_attend_physical', 'django_experience',
+            'joined_at'
+        ]
+        read_only_fields = [
+            'id', 'joined_at', 'workshop_name', 'workshop_date'
+        ]
+        validators = []
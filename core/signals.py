@@ -0,0 +1,87 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.counters import (
+    apply_counter_deltas, claim_registration_seat, registration_counter_fields
+)
+from core.models import WorkshopRegistration
+
+
+def _counted_values(registration):
+    return {
+        name: getattr(registration, name)
+        for name in WorkshopRegistration.COUNTED_FIELDS
+    }
+
+
+def _deltas(values, amount):
+    return Counter({
+        field: amount for field in registration_counter_fields(
+            values['will_attend_physical'], values['django_experience']
+        )
+    })
+
+
+@receiver(pre_save, sender=WorkshopRegistration)
+def claim_seat_before_insert(sender, instance, raw=False, **kwargs):
+    """
+    Claim a seat for a new registration, raising WorkshopFull when the
+    workshop has none left.
+
+    The claim runs before the INSERT, inside the transaction of
+    WorkshopRegistration.save(): the workshop row is locked by the claim
+    before the insert's foreign key check reads it, so concurrent
+    registrations queue on the row instead of deadlocking (InnoDB), and a
+    failed insert rolls the claim back.
+    """
+    if raw or not instance._state.adding:
+        return
+    claim_registration_seat(
+        instance.workshop_id,
+        instance.will_attend_physical,
+        instance.django_experience,
+    )
+
+
+@receiver(post_save, sender=WorkshopRegistration)
+def update_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep WorkShop registration counters in step with saved registrations.
+
+    New registrations were counted by their seat claim. Later edits (e.g.
+    from the admin) move the registration between counters without
+    enforcing capacity.
+    """
+    if raw:
+        return
+
+    current = _counted_values(instance)
+    previous = getattr(instance, '_counted_values', None)
+    instance._counted_values = current
+
+    if created:
+        return
+
+    if not previous or len(previous) != len(current) or previous == current:
+        return
+
+    # The registration moved between buckets (or workshops): take it out of
+    # the old counters and add it to the new ones.
+    if previous['workshop_id'] == current['workshop_id']:
+        deltas = _deltas(current, 1)
+        deltas.subtract(_deltas(previous, 1))
+        apply_counter_deltas(current['workshop_id'], deltas)
+    else:
+        apply_counter_deltas(previous['workshop_id'], _deltas(previous, -1))
+        apply_counter_deltas(current['workshop_id'], _deltas(current, 1))
+
+
+@receiver(post_delete, sender=WorkshopRegistration)
+def update_counters_on_delete(sender, instance, **kwargs):
+    """
+    Release a deleted registration from its workshop's counters.
+    """
+    values = getattr(instance, '_counted_values', None) or _counted_values(instance)
+    apply_counter_deltas(values['workshop_id'], _deltas(values, -1))
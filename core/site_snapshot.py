@@ -0,0 +1,187 @@
+"""
+Precomputed landing-page payload served by api/site/.
+
+The snapshot is the rendered JSON of everything the homepage shows
+(active team members, partners by tier, sponsors by level, contributors,
+supporters and upcoming workshops), stored in the cache together with the
+collection versions (core.cache_versions) it was built from.
+
+Serving it costs two cache reads and no ORM work. When a collection
+changes, its version bump schedules a rebuild on a background thread; until
+that finishes the previous snapshot keeps being served. Processes that did
+not see the change notice the version mismatch on their next request and
+rebuild as well.
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.cache_versions import add_version_listener, get_versions
+from core.models import WorkShop
+from core.serializers import WorkShopListSerializer
+from partners.models import Contributor, Partner, Sponsor, Supporter
+from partners.serializers import (
+    ContributorSerializer,
+    PartnerSerializer,
+    PartnerTierSerializer,
+    SponsorLevelSerializer,
+    SponsorSerializer,
+    SupporterSerializer,
+)
+from teams.models import TeamModel
+from teams.serializers import TeamSerializer
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = 'core:site-snapshot'
+SITE_COLLECTIONS = ('teams', 'partners', 'sponsors', 'contributors', 'supporters', 'workshops')
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='site-snapshot')
+_lock = threading.Lock()
+_rebuild_queued = False
+
+
+class _PublicURLs:
+    """
+    Stands in for the request in serializer context, so media URLs come
+    out absolute on SITE_BASE_URL rather than relative.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/') + '/'
+
+    def build_absolute_uri(self, location):
+        return urljoin(self.base_url, location)
+
+
+def _grouped(items, group_attr, group_serializer, item_serializer, key, context):
+    """Group ``items`` (already ordered by group) under their group object."""
+    groups = []
+    for group, members in groupby(items, key=lambda item: getattr(item, group_attr)):
+        groups.append({
+            key: group_serializer(group, context=context).data if group else None,
+            'items': item_serializer(list(members), many=True, context=context).data,
+        })
+    return groups
+
+
+def build_payload():
+    """Query and serialize the landing-page content."""
+    context = {'request': _PublicURLs(settings.SITE_BASE_URL)}
+    partners = (
+        Partner.objects.filter(is_active=True)
+        .select_related('tier', 'partner_type')
+        .order_by('tier__order', 'tier_id', 'order', 'name')
+    )
+    sponsors = (
+        Sponsor.objects.filter(is_active=True)
+        .select_related('level')
+        .order_by('level__order', 'level_id', 'order', 'name')
+    )
+    workshops = WorkShop.objects.filter(
+        is_ended=False, workshop_date__gte=timezone.localdate()
+    ).order_by('workshop_date', 'workshop_time', 'id')
+
+    return {
+        'generated_at': timezone.now(),
+        'teams': TeamSerializer(
+            TeamModel.objects.filter(is_active=True).prefetch_related('socials'),
+            many=True, context=context,
+        ).data,
+        'partners': _grouped(
+            partners, 'tier', PartnerTierSerializer, PartnerSerializer, 'tier', context
+        ),
+        'sponsors': _grouped(
+            sponsors, 'level', SponsorLevelSerializer, SponsorSerializer, 'level', context
+        ),
+        'contributors': ContributorSerializer(
+            Contributor.objects.filter(is_active=True).select_related('role'),
+            many=True, context=context,
+        ).data,
+        'supporters': SupporterSerializer(
+            Supporter.objects.filter(is_active=True), many=True, context=context
+        ).data,
+        'workshops': WorkShopListSerializer(workshops, many=True, context=context).data,
+    }
+
+
+def rebuild():
+    """Build a snapshot, store it and return it."""
+    # Versions are read first: a change during the build leaves the new
+    # snapshot already stale, so it is rebuilt again
+    versions = get_versions(SITE_COLLECTIONS)
+    body = JSONRenderer().render(build_payload())
+    snapshot = {
+        'versions': versions,
+        # Upcoming workshops change with the date alone
+        'date': timezone.localdate().isoformat(),
+        'base_url': settings.SITE_BASE_URL,
+        'body': body,
+        'etag': '"%s"' % hashlib.md5(body, usedforsecurity=False).hexdigest(),
+    }
+    cache.set(SNAPSHOT_KEY, snapshot, None)
+    return snapshot
+
+
+def _run_queued_rebuild():
+    global _rebuild_queued
+    with _lock:
+        _rebuild_queued = False
+    try:
+        rebuild()
+    except Exception:
+        logger.exception('Rebuilding the site snapshot failed')
+    finally:
+        # The worker thread's own connection
+        connection.close()
+
+
+def schedule_rebuild():
+    """
+    Rebuild the snapshot in the background, at most one queued at a time.
+    """
+    global _rebuild_queued
+    if not getattr(settings, 'SITE_SNAPSHOT_BACKGROUND', True):
+        rebuild()
+        return
+    with _lock:
+        if _rebuild_queued:
+            return
+        _rebuild_queued = True
+    _executor.submit(_run_queued_rebuild)
+
+
+def get_snapshot():
+    """
+    Return the current snapshot without touching the database, unless none
+    has been built yet (then it is built now).
+    """
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is None:
+        return rebuild()
+    if (
+        snapshot['versions'] != get_versions(SITE_COLLECTIONS)
+        or snapshot['date'] != timezone.localdate().isoformat()
+        or snapshot.get('base_url') != settings.SITE_BASE_URL
+    ):
+        schedule_rebuild()
+    return snapshot
+
+
+def _on_version_bump(name):
+    # Only keep a snapshot fresh once something has asked for it
+    if name in SITE_COLLECTIONS and cache.get(SNAPSHOT_KEY) is not None:
+        schedule_rebuild()
+
+
+add_version_listener(_on_version_bump)
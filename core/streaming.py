@@ -0,0 +1,48 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+
+class Echo:
+    """
+    File-like object whose write() hands the value back instead of
+    buffering it, so csv.writer can feed a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    """Yield each row of ``rows`` as an encoded CSV line."""
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def streaming_csv_response(rows, filename):
+    """
+    Stream ``rows`` as a CSV attachment without building it in memory.
+    """
+    response = StreamingHttpResponse(csv_lines(rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+
+def ndjson_lines(objects):
+    """Yield each of ``objects`` as one line of newline-delimited JSON."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for obj in objects:
+        yield encoder.encode(obj) + '\n'
+
+
+def streaming_ndjson_response(objects, filename):
+    """
+    Stream ``objects`` as an NDJSON attachment without building it in memory.
+    """
+    response = StreamingHttpResponse(
+        ndjson_lines(objects), content_type='application/x-ndjson'
+    )
+    response['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
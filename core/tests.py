@@ -1,3 +1,1550 @@
-from django.test import TestCase
+import gzip
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core import mail, signing
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management.base import CommandError
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient, APITestCase
+
+from core.models import (
+    DjangoExperience, EmailStatus, OutboxEmail, WaitlistEntry, WorkShop,
+    WorkshopRegistration
+)
+from core import ics_writer
+from core.email_utils import build_workshop_registration_email
+from core.forms import IngestedImageField
+from core.images import variant_name
+from core.management.commands.explain_queries import Command as ExplainQueriesCommand
+from core.ics_writer import fold_line, registration_calendar, render_event
+from core.response_cache import get_stats
+from core.site_snapshot import SNAPSHOT_KEY
+from core.throttling import IPTokenBucketThrottle, rejection_counts
+from core.tokens import cancel_url, make_cancel_token
+from core.waitlist import promote_from_waitlist
+from partners.models import (
+    Contributor, Partner, PartnerTier, Sponsor, SponsorLevel, Supporter
+)
+from teams.models import TeamModel
+
+
+def create_workshop(**kwargs):
+    defaults = {
+        'workshop_name': 'Django Fundamentals',
+        'workshop_date': date(2030, 1, 15),
+        'workshop_location': 'Tech Hub Building, Room 101',
+    }
+    defaults.update(kwargs)
+    return WorkShop.objects.create(**defaults)
+
+
+def create_registration(workshop, email, **kwargs):
+    defaults = {
+        'user_name': 'Alice Johnson',
+        'will_attend_physical': True,
+        'django_experience': DjangoExperience.BEGINNER,
+    }
+    defaults.update(kwargs)
+    return WorkshopRegistration.objects.create(
+        workshop=workshop, user_email=email, **defaults
+    )
+
+
+def registration_payload(workshop, email, **kwargs):
+    payload = {
+        'workshop': workshop.pk,
+        'user_name': 'alice johnson',
+        'user_email': email,
+        'will_attend_physical': True,
+        'django_experience': DjangoExperience.BEGINNER,
+    }
+    payload.update(kwargs)
+    return payload
+
+
+class RegistrationCounterTests(TestCase):
+    def setUp(self):
+        self.workshop = create_workshop()
+
+    def test_create_increments_counters(self):
+        create_registration(self.workshop, 'alice@example.com')
+        create_registration(
+            self.workshop, 'bob@example.com',
+            will_attend_physical=False,
+            django_experience=DjangoExperience.ADVANCED,
+        )
+
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.registrations_count, 2)
+        self.assertEqual(self.workshop.physical_registrations_count, 1)
+        self.assertEqual(self.workshop.virtual_registrations_count, 1)
+        self.assertEqual(self.workshop.beginner_registrations_count, 1)
+        self.assertEqual(self.workshop.intermediate_registrations_count, 0)
+        self.assertEqual(self.workshop.advanced_registrations_count, 1)
+
+    def test_delete_decrements_counters(self):
+        registration = create_registration(self.workshop, 'alice@example.com')
+        create_registration(self.workshop, 'bob@example.com')
+
+        registration.delete()
+        WorkshopRegistration.objects.filter(user_email='bob@example.com').delete()
+
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.registrations_count, 0)
+        self.assertEqual(self.workshop.physical_registrations_count, 0)
+        self.assertEqual(self.workshop.beginner_registrations_count, 0)
+
+    def test_update_moves_registration_between_counters(self):
+        create_registration(self.workshop, 'alice@example.com')
+        registration = WorkshopRegistration.objects.get()
+        registration.will_attend_physical = False
+        registration.django_experience = DjangoExperience.INTERMEDIATE
+        registration.save()
+
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.registrations_count, 1)
+        self.assertEqual(self.workshop.physical_registrations_count, 0)
+        self.assertEqual(self.workshop.virtual_registrations_count, 1)
+        self.assertEqual(self.workshop.beginner_registrations_count, 0)
+        self.assertEqual(self.workshop.intermediate_registrations_count, 1)
+
+    def test_reconcile_command_fixes_drift(self):
+        create_registration(self.workshop, 'alice@example.com')
+        WorkShop.objects.filter(pk=self.workshop.pk).update(
+            registrations_count=7, virtual_registrations_count=3
+        )
+
+        call_command('reconcile_registration_counts', stdout=StringIO())
+
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.registrations_count, 1)
+        self.assertEqual(self.workshop.physical_registrations_count, 1)
+        self.assertEqual(self.workshop.virtual_registrations_count, 0)
+
+    def test_saving_a_stale_workshop_keeps_counters_and_sequence(self):
+        stale = WorkShop.objects.get(pk=self.workshop.pk)
+        create_registration(self.workshop, 'alice@example.com')
+        self.workshop.save()
+
+        stale.workshop_location = 'Innovation Center'
+        stale.save()
+
+        self.assertEqual(stale.sequence, 2)
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.workshop_location, 'Innovation Center')
+        self.assertEqual(self.workshop.registrations_count, 1)
+        self.assertEqual(self.workshop.physical_registrations_count, 1)
+        self.assertEqual(self.workshop.sequence, 2)
+
+
+class WorkshopListQueryTests(APITestCase):
+    def setUp(self):
+        # Writes below never commit, so they do not bump the cached version
+        cache.clear()
+
+    def test_list_does_not_count_per_workshop(self):
+        for index in range(5):
+            workshop = create_workshop(workshop_name=f'Workshop {index}')
+            create_registration(workshop, f'user{index}@example.com')
+
+        # One COUNT for pagination and one SELECT for the page
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('workshop-list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row['registrations_count'] for row in response.data['results']],
+            [1] * 5,
+        )
+
+
+class RegistrationEmailOutboxTests(APITestCase):
+    def setUp(self):
+        self.workshop = create_workshop()
+
+    def register(self, email='alice@example.com'):
+        return self.client.post(
+            reverse('register-workshop'),
+            registration_payload(self.workshop, email),
+            format='json'
+        )
+
+    def test_registration_queues_email_without_sending(self):
+        response = self.register()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data['email_queued'])
+        self.assertNotIn('email_sent', response.data)
+        self.assertEqual(len(mail.outbox), 0)
+
+        queued = OutboxEmail.objects.get()
+        self.assertEqual(queued.to_email, 'alice@example.com')
+        self.assertEqual(queued.status, EmailStatus.PENDING)
+        self.assertEqual(queued.attachments[0][0], 'workshop_invite.ics')
+
+    def test_worker_delivers_queued_emails(self):
+        self.register('alice@example.com')
+        self.register('bob@example.com')
+
+        call_command('send_queued_emails', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].attachments[0][2], 'text/calendar')
+        self.assertFalse(
+            OutboxEmail.objects.exclude(status=EmailStatus.SENT).exists()
+        )
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        self.register()
+
+        with mock.patch(
+            'django.core.mail.EmailMessage.send', side_effect=OSError('refused')
+        ):
+            call_command('send_queued_emails', stdout=StringIO())
+
+        queued = OutboxEmail.objects.get()
+        self.assertEqual(queued.status, EmailStatus.PENDING)
+        self.assertEqual(queued.attempts, 1)
+        self.assertEqual(queued.last_error, 'refused')
+        self.assertGreater(queued.next_attempt_at, queued.created_at)
+
+        # Not due yet, so the next run leaves it alone
+        call_command('send_queued_emails', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_gives_up_after_max_attempts(self):
+        self.register()
+
+        with mock.patch(
+            'django.core.mail.EmailMessage.send', side_effect=OSError('refused')
+        ):
+            call_command('send_queued_emails', '--max-attempts=1', stdout=StringIO())
+
+        self.assertEqual(OutboxEmail.objects.get().status, EmailStatus.FAILED)
+
+
+class WorkshopCapacityTests(APITestCase):
+    def setUp(self):
+        # Fresh throttle buckets
+        cache.clear()
+        self.workshop = create_workshop(physical_capacity=1, virtual_capacity=0)
+
+    def register(self, email, **kwargs):
+        return self.client.post(
+            reverse('register-workshop'),
+            registration_payload(self.workshop, email, **kwargs),
+            format='json'
+        )
+
+    def test_full_workshop_rejects_registration(self):
+        self.assertEqual(self.register('alice@example.com').status_code, 201)
+
+        response = self.register('bob@example.com')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(WorkshopRegistration.objects.count(), 1)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.physical_registrations_count, 1)
+
+    def test_capacity_is_per_attendance_type(self):
+        response = self.register('alice@example.com', will_attend_physical=False)
+
+        self.assertEqual(response.status_code, 409)
+
+    def test_duplicate_registration_is_rejected_by_constraint(self):
+        self.workshop.physical_capacity = None
+        self.workshop.save()
+        self.register('alice@example.com')
+
+        response = self.register('ALICE@example.com')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['error'], 'You are already registered for this workshop.'
+        )
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.registrations_count, 1)
+
+    def test_seat_is_claimed_before_the_registration_is_inserted(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.register('alice@example.com').status_code, 201)
+
+        writes = [
+            query['sql'].split(' (')[0].split(' SET ')[0]
+            for query in queries.captured_queries
+            if query['sql'].startswith(('UPDATE', 'INSERT'))
+        ]
+        self.assertEqual(
+            writes[:2], ['UPDATE "core_workshop"', 'INSERT INTO "core_workshopregistration"']
+        )
+
+    def test_lock_conflict_while_claiming_is_reported_as_full(self):
+        deadlock = OperationalError(1213, 'Deadlock found when trying to get lock')
+
+        with mock.patch('core.signals.claim_registration_seat', side_effect=deadlock):
+            response = self.register('alice@example.com')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertTrue(response.data['waitlist_available'])
+        self.assertFalse(WorkshopRegistration.objects.exists())
+
+
+class ConcurrentRegistrationTests(TransactionTestCase):
+    capacity = 5
+    attempts = 40
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('In-memory SQLite cannot serve concurrent connections')
+
+    def test_parallel_registrations_never_exceed_capacity(self):
+        workshop = create_workshop(physical_capacity=self.capacity)
+        url = reverse('register-workshop')
+
+        def register(index):
+            try:
+                # One client per address, so the per-IP throttle stays out of it
+                return APIClient(REMOTE_ADDR=f'10.0.0.{index}').post(
+                    url,
+                    registration_payload(workshop, f'user{index}@example.com'),
+                    format='json'
+                ).status_code
+            finally:
+                connection.close()
+
+        # Rejected registrations are logged as 409 warnings
+        with self.assertLogs('django.request', 'WARNING'):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                statuses = list(executor.map(register, range(self.attempts)))
+
+        self.assertEqual(statuses.count(201), self.capacity)
+        self.assertEqual(statuses.count(409), self.attempts - self.capacity)
+        workshop.refresh_from_db()
+        self.assertEqual(workshop.registrations_count, self.capacity)
+        self.assertEqual(WorkshopRegistration.objects.count(), self.capacity)
+
+
+class WaitlistTests(APITestCase):
+    def setUp(self):
+        self.workshop = create_workshop(physical_capacity=1)
+        self.registration = create_registration(self.workshop, 'alice@example.com')
+
+    def join(self, email, **kwargs):
+        return self.client.post(
+            reverse('waitlist-join'),
+            registration_payload(self.workshop, email, **kwargs),
+            format='json'
+        )
+
+    def cancel(self, token=None):
+        return self.client.post(
+            reverse('registration-cancel', args=[token or make_cancel_token(self.registration)]),
+            format='json'
+        )
+
+    def test_join_waitlist_only_when_full(self):
+        self.assertEqual(self.join('bob@example.com').status_code, 201)
+        self.assertEqual(self.join('bob@example.com').status_code, 400)
+        # Virtual attendance has no limit, so register instead
+        self.assertEqual(
+            self.join('carol@example.com', will_attend_physical=False).status_code, 400
+        )
+
+    def test_cancel_requires_signed_token(self):
+        forged = signing.Signer(salt='forged').sign_object(
+            [self.workshop.pk, 'alice@example.com']
+        )
+
+        self.assertEqual(self.cancel(forged).status_code, 400)
+        self.assertEqual(self.cancel('alice@example.com').status_code, 400)
+        self.assertTrue(WorkshopRegistration.objects.filter(pk=self.registration.pk).exists())
+
+    def test_cancel_link_is_mailed_to_the_registrant(self):
+        body = build_workshop_registration_email(self.registration).body
+
+        self.assertIn(cancel_url(self.registration), body)
+
+    def test_cancel_link_opened_in_browser(self):
+        url = reverse('registration-cancel', args=[make_cancel_token(self.registration)])
+
+        page = self.client.get(url, HTTP_ACCEPT='text/html')
+        self.assertContains(page, 'Cancel registration</button>')
+        self.assertTrue(WorkshopRegistration.objects.filter(pk=self.registration.pk).exists())
+
+        response = self.client.post(url, {}, format='multipart', HTTP_ACCEPT='text/html')
+        self.assertContains(response, 'Your registration has been cancelled.')
+        self.assertFalse(WorkshopRegistration.objects.exists())
+
+        # The link is spent once the registration is gone
+        self.assertEqual(self.client.post(url).status_code, 404)
+
+    def test_cancel_promotes_head_of_waitlist(self):
+        self.join('bob@example.com')
+        self.join('carol@example.com')
+
+        response = self.cancel()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['promoted_from_waitlist'], 1)
+        self.assertEqual(
+            list(self.workshop.registrations.values_list('user_email', flat=True)),
+            ['bob@example.com'],
+        )
+        self.assertEqual(
+            list(WaitlistEntry.objects.values_list('user_email', flat=True)),
+            ['carol@example.com'],
+        )
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.physical_registrations_count, 1)
+        self.assertEqual(
+            OutboxEmail.objects.filter(to_email='bob@example.com').get().subject,
+            'A seat opened up: Django Fundamentals',
+        )
+
+    def test_promotion_is_bounded_by_freed_seats(self):
+        WaitlistEntry.objects.bulk_create([
+            WaitlistEntry(
+                workshop=self.workshop,
+                user_name='Waiting Person',
+                user_email=f'waiting{index}@example.com',
+            )
+            for index in range(500)
+        ])
+        WorkShop.objects.filter(pk=self.workshop.pk).update(physical_capacity=4)
+
+        # Same number of queries however long the list is
+        with self.assertNumQueries(10):
+            promoted = promote_from_waitlist(self.workshop.pk)
+
+        self.assertEqual(
+            [registration.user_email for registration in promoted],
+            [f'waiting{index}@example.com' for index in range(3)],
+        )
+        self.assertEqual(WaitlistEntry.objects.count(), 497)
+        self.assertEqual(OutboxEmail.objects.count(), 3)
+
+    def test_unlimited_capacity_promotes_only_the_freed_seats(self):
+        WaitlistEntry.objects.bulk_create([
+            WaitlistEntry(
+                workshop=self.workshop,
+                user_name='Waiting Person',
+                user_email=f'waiting{index}@example.com',
+            )
+            for index in range(50)
+        ])
+        WorkShop.objects.filter(pk=self.workshop.pk).update(physical_capacity=None)
+
+        response = self.cancel()
+
+        self.assertEqual(response.data['promoted_from_waitlist'], 1)
+        self.assertEqual(
+            list(self.workshop.registrations.values_list('user_email', flat=True)),
+            ['waiting0@example.com'],
+        )
+        self.assertEqual(WaitlistEntry.objects.count(), 49)
+
+
+class IcsWriterTests(TestCase):
+    def setUp(self):
+        self.workshop = create_workshop(
+            workshop_description='Learn the basics; models, views and templates. ' * 5
+        )
+        self.registration = create_registration(self.workshop, 'alice@example.com')
+
+    def test_lines_are_folded_to_75_octets(self):
+        folded = fold_line('DESCRIPTION:' + 'é' * 100)
+
+        lines = folded.split('\r\n')[:-1]
+        self.assertTrue(all(len(line.encode('utf-8')) <= 75 for line in lines))
+        self.assertTrue(all(line.startswith(' ') for line in lines[1:]))
+        self.assertEqual(''.join(line.lstrip(' ') for line in lines), 'DESCRIPTION:' + 'é' * 100)
+
+    def test_invite_has_stable_uid_and_sequence(self):
+        invite = registration_calendar(self.registration)
+
+        self.assertIn(f'UID:workshop-{self.workshop.pk}@djangocampus.com\r\n', invite)
+        self.assertIn('SEQUENCE:0\r\n', invite)
+        self.assertIn('DTSTART:20300115T090000Z\r\n', invite)
+        self.assertIn('Attendance: Physical', invite.replace('\r\n ', ''))
+
+        self.workshop.workshop_location = 'Innovation Center'
+        self.workshop.save()
+        self.registration.refresh_from_db()
+        invite = registration_calendar(self.registration)
+
+        self.assertIn(f'UID:workshop-{self.workshop.pk}@djangocampus.com\r\n', invite)
+        self.assertIn('SEQUENCE:1\r\n', invite)
+        self.assertIn('LOCATION:Innovation Center\r\n', invite)
+
+    def test_workshop_part_is_rendered_once_per_revision(self):
+        with mock.patch.object(
+            ics_writer, 'render_event_template', wraps=ics_writer.render_event_template
+        ) as render:
+            render_event(self.workshop, True)
+            render_event(self.workshop, False)
+            self.assertEqual(render.call_count, 1)
+
+            self.workshop.save()
+            render_event(self.workshop, True)
+            self.assertEqual(render.call_count, 2)
+
+    def test_public_event_has_no_attendance_line(self):
+        self.assertNotIn('Attendance', render_event(self.workshop))
+
+
+class RegistrationPaginationTests(APITestCase):
+    def setUp(self):
+        self.workshop = create_workshop()
+        WorkshopRegistration.objects.bulk_create([
+            WorkshopRegistration(
+                workshop=self.workshop,
+                user_name='Attendee',
+                user_email=f'user{index:02}@example.com',
+            )
+            for index in range(45)
+        ])
+        self.url = reverse('workshop-registrations', args=[self.workshop.pk])
+
+    def test_page_number_mode_is_the_default(self):
+        response = self.client.get(self.url, {'page': 2})
+
+        self.assertEqual(response.data['count'], 45)
+        self.assertEqual(len(response.data['results']), 20)
+
+    def test_cursor_mode_walks_every_row_once_without_counting(self):
+        emails = []
+        url = self.url + '?pagination=cursor'
+        while url:
+            # One SELECT per page: no COUNT(*) and no per-row workshop lookups
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertNotIn('count', response.data)
+            emails.extend(row['user_email'] for row in response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(emails, sorted(emails))
+        self.assertEqual(len(set(emails)), 45)
+
+
+class RegistrationCsvExportTests(TestCase):
+    def setUp(self):
+        admin_user = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin_user)
+        fundamentals = create_workshop()
+        patterns = create_workshop(workshop_name='Advanced Django Patterns')
+        create_registration(fundamentals, 'alice@example.com', phone_number='0240000000')
+        create_registration(patterns, 'bob@example.com', will_attend_physical=False)
+        create_registration(fundamentals, 'carol@example.com')
+
+    def export(self, action):
+        response = self.client.post(
+            reverse('admin:core_workshopregistration_changelist'),
+            {
+                'action': action,
+                '_selected_action': list(
+                    WorkshopRegistration.objects.values_list('pk', flat=True)
+                ),
+            },
+        )
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode().splitlines()
+
+    def test_export_as_csv_streams_rows(self):
+        lines = self.export('export_as_csv')
+
+        self.assertEqual(
+            lines[0],
+            'Name,Email,Phone,Workshop,Workshop Date,Location,Experience,'
+            'Physical Attendance,Registration Date',
+        )
+        self.assertEqual(len(lines), 4)
+        self.assertIn(
+            'Alice Johnson,alice@example.com,0240000000,Django Fundamentals,'
+            '2030-01-15,"Tech Hub Building, Room 101",Beginner,Yes,',
+            '\n'.join(lines),
+        )
+
+    def test_grouped_export_groups_by_workshop(self):
+        lines = self.export('export_workshop_specific_csv')
+
+        self.assertEqual(lines[0], 'Workshop: Advanced Django Patterns')
+        self.assertTrue(lines[2].startswith('Alice Johnson,bob@example.com,N/A,Beginner,No,'))
+        self.assertEqual(lines[3], '')
+        self.assertEqual(lines[4], 'Workshop: Django Fundamentals')
+        self.assertEqual(
+            [line.split(',')[1] for line in lines[6:8]],
+            ['alice@example.com', 'carol@example.com'],
+        )
+
+
+class WorkShopAdminChangelistTests(TestCase):
+    def setUp(self):
+        admin_user = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin_user)
+        self.url = reverse('admin:core_workshop_changelist')
+
+    def create_workshops(self, count):
+        for index in range(count):
+            workshop = create_workshop(workshop_name=f'Workshop {index}')
+            create_registration(workshop, 'alice@example.com')
+            create_registration(
+                workshop, 'bob@example.com', will_attend_physical=False
+            )
+
+    def test_changelist_query_count_is_constant(self):
+        self.create_workshops(3)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url)
+
+        self.create_workshops(30)
+        with self.assertNumQueries(len(small.captured_queries)):
+            response = self.client.get(self.url)
+
+        self.assertContains(response, 'Workshop 29')
+
+    def test_changelist_sorts_by_registration_counters(self):
+        self.create_workshops(2)
+        busy = create_workshop(workshop_name='Busy Workshop')
+        for index in range(3):
+            create_registration(busy, f'user{index}@example.com')
+
+        # Column 6 is get_registrations_count; sort descending
+        response = self.client.get(self.url, {'o': '-6'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context['cl'].result_list[0].workshop_name, 'Busy Workshop'
+        )
+
+
+class RegistrationCsvImportTests(TestCase):
+    header = (
+        'Name,Email,Phone,Workshop,Workshop Date,Location,Experience,'
+        'Physical Attendance,Registration Date\n'
+    )
+
+    def setUp(self):
+        admin_user = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin_user)
+        self.workshop = create_workshop()
+        create_registration(self.workshop, 'existing@example.com')
+        self.url = reverse('admin:core_workshopregistration_import_csv')
+
+    def upload(self, body):
+        csv_file = SimpleUploadedFile(
+            'registrations.csv', (self.header + body).encode('utf-8'), 'text/csv'
+        )
+        return self.client.post(self.url, {'csv_file': csv_file})
+
+    def test_import_creates_valid_rows_and_reports_errors(self):
+        response = self.upload(
+            'bob smith,  BOB@Example.com ,N/A,Django Fundamentals,2030-01-15,,Advanced,No,\n'
+            'Existing,existing@example.com,,Django Fundamentals,2030-01-15,,,,\n'
+            'X,not-an-email,,Django Fundamentals,2030-01-15,,Expert,Maybe,\n'
+            'Carol,carol@example.com,,Unknown Workshop,2030-01-15,,,,\n'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        result = response.context['result']
+        self.assertEqual((result.rows, result.valid, result.created), (4, 2, 1))
+        self.assertEqual([line for line, _ in result.errors], [4, 5])
+        self.assertEqual(len(result.errors[0][1]), 4)
+        self.assertIn('Name must be at least 2 characters long.', result.errors[0][1][0])
+
+        bob = WorkshopRegistration.objects.get(user_email='bob@example.com')
+        self.assertEqual(bob.user_name, 'Bob Smith')
+        self.assertIsNone(bob.phone_number)
+        self.assertFalse(bob.will_attend_physical)
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.registrations_count, 2)
+        self.assertEqual(self.workshop.advanced_registrations_count, 1)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_import_streams_from_temporary_upload_in_chunks(self):
+        rows = ''.join(
+            f'Attendee {index},user{index}@example.com,,Django Fundamentals,'
+            f'2030-01-15,,Beginner,Yes,\n'
+            for index in range(2500)
+        )
+
+        with mock.patch(
+            'core.models.WorkshopRegistration.objects.bulk_create',
+            wraps=WorkshopRegistration.objects.bulk_create,
+        ) as bulk_create:
+            response = self.upload(rows)
+
+        self.assertEqual(response.context['result'].created, 2500)
+        self.assertEqual(bulk_create.call_count, 3)
+        self.workshop.refresh_from_db()
+        self.assertEqual(self.workshop.registrations_count, 2501)
+
+    def test_missing_columns_are_reported(self):
+        csv_file = SimpleUploadedFile('registrations.csv', b'Name,Email\n', 'text/csv')
+
+        response = self.client.post(self.url, {'csv_file': csv_file})
+
+        self.assertContains(response, 'Missing required column(s): Workshop, Workshop Date')
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.workshop = create_workshop()
+        self.list_url = reverse('workshop-list')
+        self.detail_url = reverse('workshop-detail', args=[self.workshop.pk])
+
+    def test_matching_etag_returns_304_without_queries(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self.client.get(self.detail_url)['Last-Modified']
+
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_differs_per_url(self):
+        self.assertNotEqual(
+            self.client.get(self.list_url)['ETag'],
+            self.client.get(self.detail_url)['ETag'],
+        )
+
+    def test_registration_invalidates_workshop_responses(self):
+        etag = self.client.get(self.detail_url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_registration(self.workshop, 'alice@example.com')
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['registrations_count'], 1)
+
+    def test_bulk_counter_updates_invalidate_workshop_responses(self):
+        etag = self.client.get(self.detail_url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            WorkShop.objects.filter(pk=self.workshop.pk).update(registrations_count=5)
+            call_command('reconcile_registration_counts', stdout=StringIO())
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.workshop = create_workshop()
+        self.url = reverse('workshop-list')
+
+    def test_cached_response_is_byte_identical(self):
+        uncached = self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(uncached['X-Cache'], 'MISS')
+        self.assertEqual(cached['X-Cache'], 'HIT')
+        self.assertEqual(cached.content, uncached.content)
+        self.assertEqual(cached['Content-Type'], uncached['Content-Type'])
+        self.assertEqual(cached['ETag'], uncached['ETag'])
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        response = self.client.get(self.url, {'page': 1}, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_scheme_and_host_are_part_of_the_key(self):
+        # A second page, so the body has an absolute "next" link
+        WorkShop.objects.bulk_create(
+            WorkShop(
+                workshop_name=f'Workshop {index}',
+                workshop_date=date(2030, 2, 1),
+                workshop_location='Online',
+            )
+            for index in range(20)
+        )
+        local = self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        public = self.client.get(
+            self.url, HTTP_ACCEPT='application/json',
+            HTTP_HOST='djangocampus.pythonanywhere.com', secure=True,
+        )
+
+        self.assertEqual(public['X-Cache'], 'MISS')
+        self.assertNotEqual(public['ETag'], local['ETag'])
+        self.assertTrue(local.json()['next'].startswith('http://testserver/'))
+        self.assertTrue(
+            public.json()['next'].startswith('https://djangocampus.pythonanywhere.com/')
+        )
+
+    def test_save_invalidates_cached_response(self):
+        self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.workshop.workshop_name = 'Advanced Django'
+            self.workshop.save()
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['workshop_name'], 'Advanced Django')
+
+    def test_browsable_api_is_not_cached(self):
+        self.client.get(self.url, HTTP_ACCEPT='text/html')
+        response = self.client.get(self.url, HTTP_ACCEPT='text/html')
+
+        self.assertNotIn('X-Cache', response)
+
+    def test_stats_command_reports_hits_and_misses(self):
+        self.client.get(self.url, HTTP_ACCEPT='application/json')
+        self.client.get(self.url, HTTP_ACCEPT='application/json')
+        out = StringIO()
+
+        call_command('response_cache_stats', '--reset', stdout=out)
+
+        self.assertIn('workshops             1        1     50.0%', out.getvalue())
+        self.assertEqual(
+            get_stats(['workshops']), {'workshops': {'hits': 0, 'misses': 0}}
+        )
+
+
+class WorkshopCalendarFeedTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upcoming = create_workshop(workshop_name='Upcoming Workshop')
+            self.later = create_workshop(
+                workshop_name='Later Workshop', workshop_date=date(2031, 3, 1)
+            )
+            create_workshop(workshop_name='Ended Workshop', is_ended=True)
+            create_workshop(workshop_name='Past Workshop', workshop_date=date(2020, 1, 1))
+        self.url = reverse('workshop-calendar')
+
+    def test_feed_lists_upcoming_workshops(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = response.content.decode()
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertEqual(body.count('BEGIN:VEVENT'), 2)
+        self.assertLess(body.index('SUMMARY:Upcoming Workshop'), body.index('SUMMARY:Later Workshop'))
+        self.assertNotIn('Ended Workshop', body)
+        self.assertNotIn('Past Workshop', body)
+        self.assertNotIn('Attendance:', body)
+
+    def test_only_changed_workshops_are_rendered_again(self):
+        self.client.get(self.url)
+
+        with mock.patch.object(
+            ics_writer, 'render_event_template', wraps=ics_writer.render_event_template
+        ) as render_template:
+            with self.assertNumQueries(1):
+                self.client.get(self.url)
+            self.assertEqual(render_template.call_count, 0)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.later.workshop_location = 'Main Hall'
+                self.later.save()
+            response = self.client.get(self.url)
+
+        self.assertEqual([call.args[0].pk for call in render_template.call_args_list], [self.later.pk])
+        self.assertIn('LOCATION:Main Hall', response.content.decode())
+
+    def test_feed_supports_etags(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Registrations only change counters, which the feed does not show
+        with self.captureOnCommitCallbacks(execute=True):
+            create_registration(self.upcoming, 'alice@example.com')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.upcoming.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class ExplainQueriesCommandTests(TestCase):
+    def test_no_api_or_admin_query_scans_a_table(self):
+        out = StringIO()
+
+        call_command('explain_queries', '--seed', '400', '--repeat', '1', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('Seeded 2 workshops and 400 registrations', output)
+        self.assertIn('15 queries explained, 0 flagged', output)
+        # The seeded rows are rolled back with the run
+        self.assertFalse(WorkShop.objects.exists())
+        self.assertFalse(WorkshopRegistration.objects.exists())
+
+    def test_compare_needs_a_scratch_database_without_ddl_rollback(self):
+        with mock.patch.object(connection.features, 'can_rollback_ddl', False):
+            with self.assertRaisesMessage(CommandError, '--database'):
+                call_command('explain_queries', '--compare', stdout=StringIO())
+
+    def test_seeded_rows_can_be_removed_without_a_rollback(self):
+        command = ExplainQueriesCommand(stdout=StringIO())
+        command.seed(400, 'default')
+        self.assertEqual(WorkshopRegistration.objects.count(), 400)
+
+        command.remove_seeded('default')
+
+        self.assertFalse(WorkShop.objects.exists())
+        self.assertFalse(WorkshopRegistration.objects.exists())
+
+
+class ExplainQueriesCompareTests(TransactionTestCase):
+    def index_names(self):
+        with connection.cursor() as cursor:
+            return set(connection.introspection.get_constraints(
+                cursor, WorkshopRegistration._meta.db_table
+            ))
+
+    def test_dropped_indexes_and_seeded_rows_are_rolled_back(self):
+        out = StringIO()
+
+        call_command(
+            'explain_queries', '--seed', '400', '--compare', '--repeat', '1', stdout=out
+        )
+
+        self.assertIn('15 queries explained, 0 flagged', out.getvalue())
+        self.assertFalse(WorkShop.objects.exists())
+        self.assertLessEqual(
+            {index.name for index in WorkshopRegistration._meta.indexes}, self.index_names()
+        )
+
+
+class WorkshopSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.rest = create_workshop(
+            workshop_name='Django REST Framework',
+            workshop_description='Build APIs with serializers and viewsets.',
+        )
+        self.testing = create_workshop(
+            workshop_name='Testing Django Apps',
+            workshop_description='Write tests for your REST endpoints <b>fast</b>.',
+        )
+        create_workshop(workshop_name='Deploying to Production', workshop_location='Accra')
+        self.url = reverse('workshop-search')
+
+    def search(self, q, **params):
+        return self.client.get(self.url, {'q': q, **params}, HTTP_ACCEPT='application/json')
+
+    def test_results_are_ranked_with_highlighted_snippets(self):
+        response = self.search('rest')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([row['id'] for row in results], [self.rest.pk, self.testing.pk])
+        self.assertGreater(results[0]['rank'], results[1]['rank'])
+        self.assertIn('<mark>REST</mark>', results[1]['snippet'])
+        # Workshop text is escaped; only the highlight markup is HTML
+        self.assertIn('&lt;b&gt;fast&lt;/b&gt;', results[1]['snippet'])
+
+    def test_all_terms_must_match_and_last_is_a_prefix(self):
+        results = self.search('django test').json()['results']
+
+        self.assertEqual([row['id'] for row in results], [self.testing.pk])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.rest.workshop_name = 'Async Django'
+        self.rest.save()
+        self.testing.delete()
+
+        self.assertEqual(self.search('async').json()['count'], 1)
+        self.assertEqual(self.search('testing').json()['count'], 0)
+        self.assertEqual(self.search('framework').json()['count'], 0)
+
+    def test_query_syntax_is_not_interpreted(self):
+        response = self.search('"rest" OR NEAR(* accra')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 0)
+
+    def test_missing_query_is_rejected(self):
+        response = self.search('  ')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'The "q" query parameter is required.'})
+
+    def test_limit_is_applied(self):
+        self.assertEqual(self.search('django', limit=1).json()['count'], 1)
+
+    def test_older_best_match_outranks_many_newer_matches(self):
+        WorkShop.objects.bulk_create(
+            WorkShop(
+                workshop_name=f'Meetup {index}',
+                workshop_date=date(2030, 3, 1),
+                workshop_location='Online',
+                workshop_description='We may touch on Django REST if time allows.',
+            )
+            for index in range(1100)
+        )
+
+        results = self.search('rest', limit=1).json()['results']
+
+        self.assertEqual([row['id'] for row in results], [self.rest.pk])
+
+    def test_admin_search_uses_the_index(self):
+        admin_user = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin_user)
+
+        response = self.client.get(reverse('admin:core_workshop_changelist'), {'q': 'accra'})
+
+        self.assertEqual(
+            [workshop.workshop_name for workshop in response.context['cl'].result_list],
+            ['Deploying to Production'],
+        )
+
+
+@override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {'registration_ip': '3/min', 'registration_email': '2/hour'},
+})
+class RegistrationThrottleTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.workshop = create_workshop()
+        self.url = reverse('register-workshop')
+
+    def register(self, email, ip='10.1.1.1'):
+        return self.client.post(
+            self.url, registration_payload(self.workshop, email), format='json',
+            REMOTE_ADDR=ip,
+        )
+
+    def test_ip_bucket_allows_a_burst_then_rejects_with_retry_after(self):
+        for index in range(3):
+            self.assertEqual(self.register(f'user{index}@example.com').status_code, 201)
+
+        with self.assertNumQueries(0):
+            response = self.register('user3@example.com')
+
+        self.assertEqual(response.status_code, 429)
+        # One token refills every 20 seconds at 3/min
+        self.assertEqual(response['Retry-After'], '20')
+        self.assertEqual(self.register('user3@example.com', ip='10.1.1.2').status_code, 201)
+
+    def test_bucket_refills_over_time(self):
+        with mock.patch('rest_framework.throttling.SimpleRateThrottle.timer') as timer:
+            timer.return_value = 1000.0
+            for index in range(3):
+                self.register(f'user{index}@example.com')
+            self.assertEqual(self.register('user3@example.com').status_code, 429)
+
+            timer.return_value = 1020.0
+            self.assertEqual(self.register('user3@example.com').status_code, 201)
+            self.assertEqual(self.register('user4@example.com').status_code, 429)
+
+    def test_email_bucket_spans_addresses(self):
+        self.register('Alice@Example.com', ip='10.1.1.1')
+        self.register('alice@example.com', ip='10.1.1.2')
+
+        response = self.register(' alice@example.com', ip='10.1.1.3')
+
+        self.assertEqual(response.status_code, 429)
+
+    def test_rejections_are_counted(self):
+        for index in range(5):
+            self.register(f'user{index}@example.com')
+        out = StringIO()
+
+        call_command('throttle_stats', '--reset', stdout=out)
+
+        self.assertIn('registration_ip                 2 rejected', out.getvalue())
+        self.assertEqual(rejection_counts(['registration_ip']), {'registration_ip': 0})
+
+    def test_unreachable_cache_falls_back_to_local_memory(self):
+        broken = mock.Mock(**{'add.side_effect': ConnectionError, 'incr.side_effect': ConnectionError})
+
+        with mock.patch.object(IPTokenBucketThrottle, 'get_cache', return_value=broken):
+            with self.assertLogs('core.throttling', 'WARNING'):
+                statuses = [
+                    self.register(f'user{index}@example.com', ip='10.9.9.9').status_code
+                    for index in range(4)
+                ]
+
+        self.assertEqual(statuses, [201, 201, 201, 429])
+
+    def test_reads_are_not_throttled(self):
+        for _ in range(5):
+            response = self.client.get(reverse('registration-list'), REMOTE_ADDR='10.1.1.1')
+            self.assertNotEqual(response.status_code, 429)
+
+    def test_concurrent_requests_cannot_share_a_token(self):
+        view = mock.Mock(throttle_scope='registration')
+        request = mock.Mock(method='POST', META={'REMOTE_ADDR': '10.7.7.7'})
+
+        def slow(method):
+            # Widen any window between reading and writing a bucket
+            def call(*args, **kwargs):
+                time.sleep(0.005)
+                return method(*args, **kwargs)
+            return call
+
+        def attempt(_):
+            return IPTokenBucketThrottle().allow_request(request, view)
+
+        slow_cache = mock.Mock(wraps=cache, **{
+            f'{name}.side_effect': slow(getattr(cache, name))
+            for name in ('get', 'set', 'add', 'incr', 'decr', 'touch')
+        })
+        with mock.patch.object(IPTokenBucketThrottle, 'get_cache', return_value=slow_cache):
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                allowed = list(executor.map(attempt, range(50)))
+
+        self.assertEqual(allowed.count(True), 3)
+
+
+@override_settings(SITE_SNAPSHOT_BACKGROUND=False)
+class SiteContentTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        # Later tests must not keep rebuilding a snapshot left behind
+        self.addCleanup(cache.clear)
+        with self.captureOnCommitCallbacks(execute=True):
+            gold = PartnerTier.objects.create(name='Gold', order=1)
+            silver = PartnerTier.objects.create(name='Silver', order=2)
+            Partner.objects.create(name='Zeta', tier=silver, partnership_date=date(2024, 1, 1))
+            Partner.objects.create(name='Alpha', tier=gold, partnership_date=date(2024, 1, 1))
+            Partner.objects.create(
+                name='Gone', tier=gold, partnership_date=date(2024, 1, 1), is_active=False
+            )
+            self.level = SponsorLevel.objects.create(name='Diamond', order=1)
+            Sponsor.objects.create(name='Acme', level=self.level)
+            TeamModel.objects.create(fullName='Ada Lovelace', position='Lead')
+            TeamModel.objects.create(fullName='Former Member', position='Lead', is_active=False)
+            Contributor.objects.create(full_name='Grace Hopper')
+            Supporter.objects.create(name='Venue Co')
+            create_workshop()
+            create_workshop(workshop_name='Past', is_ended=True)
+        self.url = reverse('site-content')
+
+    def test_groups_active_content(self):
+        data = self.client.get(self.url).json()
+
+        self.assertEqual(
+            [(group['tier']['name'], [item['name'] for item in group['items']])
+             for group in data['partners']],
+            [('Gold', ['Alpha']), ('Silver', ['Zeta'])],
+        )
+        self.assertEqual(data['sponsors'][0]['level']['name'], 'Diamond')
+        self.assertEqual([member['fullName'] for member in data['teams']], ['Ada Lovelace'])
+        self.assertEqual(len(data['contributors']), 1)
+        self.assertEqual(len(data['supporters']), 1)
+        self.assertEqual(
+            [workshop['workshop_name'] for workshop in data['workshops']],
+            ['Django Fundamentals'],
+        )
+
+    @override_settings(SITE_BASE_URL='https://djangocampus.pythonanywhere.com')
+    def test_media_urls_are_absolute_on_the_site_base_url(self):
+        # update(): no variants are generated for a file that does not exist
+        Sponsor.objects.filter(name='Acme').update(logo='sponsors/logos/acme.png')
+
+        data = self.client.get(self.url).json()
+
+        self.assertEqual(
+            data['sponsors'][0]['items'][0]['logo'],
+            'https://djangocampus.pythonanywhere.com/media/sponsors/logos/acme.png',
+        )
+
+    def test_warm_request_runs_no_queries(self):
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_unchanged_snapshot_returns_304(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_content_change_rebuilds_snapshot(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.level.name = 'Platinum'
+            self.level.save()
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['sponsors'][0]['level']['name'], 'Platinum')
+
+    def test_changes_do_not_build_an_unrequested_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Supporter.objects.create(name='Another')
+
+        self.assertIsNone(cache.get(SNAPSHOT_KEY))
+
+
+class PrerenderApiCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.output = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.level = SponsorLevel.objects.create(name='Gold')
+        self.sponsor = Sponsor.objects.create(name='Acme', level=self.level)
+        for index in range(21):
+            Supporter.objects.create(name=f'Supporter {index:02}')
+        self.past = create_workshop(workshop_name='Past', is_ended=True)
+        create_workshop(workshop_name='Upcoming')
+
+    def prerender(self):
+        out = StringIO()
+        call_command('prerender_api', str(self.output), stdout=out)
+        return out.getvalue()
+
+    def read(self, path):
+        return json.loads((self.output / path).read_text())
+
+    def test_writes_pages_details_and_compressed_siblings(self):
+        self.prerender()
+
+        first = self.read('api/supporters/index.json')
+        self.assertEqual(len(first['results']), 20)
+        self.assertEqual(first['next'], '/api/supporters/page/2/index.json')
+        second = self.read('api/supporters/page/2/index.json')
+        self.assertEqual(second['previous'], '/api/supporters/index.json')
+        self.assertEqual(
+            self.read(f'api/sponsors/{self.sponsor.pk}/index.json')['name'], 'Acme'
+        )
+        self.assertEqual(
+            self.read(f'api/workshops/{self.past.pk}/index.json')['workshop_name'], 'Past'
+        )
+        body = (self.output / 'api/sponsors/index.json').read_bytes()
+        self.assertEqual(
+            gzip.decompress((self.output / 'api/sponsors/index.json.gz').read_bytes()), body
+        )
+        manifest = self.read('manifest.json')['files']
+        self.assertEqual(
+            manifest['api/sponsors/index.json']['sha256'], hashlib.sha256(body).hexdigest()
+        )
+
+    @override_settings(SITE_BASE_URL='https://djangocampus.pythonanywhere.com')
+    def test_renders_for_the_site_origin_without_the_response_cache(self):
+        Sponsor.objects.filter(pk=self.sponsor.pk).update(logo='sponsors/logos/acme.png')
+
+        self.prerender()
+
+        self.assertEqual(
+            self.read(f'api/sponsors/{self.sponsor.pk}/index.json')['logo'],
+            'https://djangocampus.pythonanywhere.com/media/sponsors/logos/acme.png',
+        )
+        response = self.client.get(
+            reverse('sponsor-list'), HTTP_ACCEPT='application/json',
+            HTTP_HOST='djangocampus.pythonanywhere.com', secure=True,
+        )
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_rerun_rewrites_only_changed_files(self):
+        self.prerender()
+        unchanged = self.output / 'api/supporters/index.json'
+        mtime = unchanged.stat().st_mtime_ns
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sponsor.name = 'Acme Corp'
+            self.sponsor.save()
+        output = self.prerender()
+
+        self.assertIn('2 written', output)
+        self.assertEqual(unchanged.stat().st_mtime_ns, mtime)
+        self.assertEqual(self.read('api/sponsors/index.json')['results'][0]['name'], 'Acme Corp')
+
+    def test_removes_files_of_withdrawn_objects(self):
+        self.prerender()
+        detail = self.output / f'api/sponsors/{self.sponsor.pk}/index.json'
+        self.assertTrue(detail.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sponsor.is_active = False
+            self.sponsor.save()
+        output = self.prerender()
+
+        self.assertIn('1 removed', output)
+        self.assertFalse(detail.exists())
+        self.assertFalse(detail.with_name('index.json.gz').exists())
+
+
+def image_upload(name='logo.png', size=(2000, 1000), mode='RGBA'):
+    buffer = BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128) if mode == 'RGBA' else (200, 30, 30)).save(
+        buffer, 'PNG'
+    )
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class ImageVariantTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root, IMAGE_VARIANTS_BACKGROUND=False))
+        self.media_root = Path(media_root)
+
+    def create_sponsor(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            sponsor = Sponsor.objects.create(name='Acme', logo=image_upload(**kwargs))
+        sponsor.refresh_from_db()
+        return sponsor
+
+    def test_upload_generates_capped_webp_and_jpeg_variants(self):
+        sponsor = self.create_sponsor()
+
+        variants = sponsor.logo_variants
+        self.assertEqual(variants['source'], sponsor.logo.name)
+        self.assertEqual(list(variants['webp']), ['320', '640', '1024', '1600'])
+        with Image.open(self.media_root / variants['webp']['640']) as image:
+            self.assertEqual((image.format, image.size, image.mode), ('WEBP', (640, 320), 'RGBA'))
+        with Image.open(self.media_root / variants['jpeg']['320']) as image:
+            self.assertEqual((image.format, image.size), ('JPEG', (320, 160)))
+        self.assertEqual(
+            variants['jpeg']['320'], variant_name(sponsor.logo.name, 320, 'jpg')
+        )
+
+    def test_small_images_are_not_upscaled(self):
+        sponsor = self.create_sponsor(size=(200, 100), mode='RGB')
+
+        self.assertEqual(list(sponsor.logo_variants['jpeg']), ['200'])
+
+    def test_serializer_exposes_srcset(self):
+        sponsor = self.create_sponsor()
+
+        data = self.client.get(
+            reverse('sponsor-detail', args=[sponsor.pk]), HTTP_ACCEPT='application/json'
+        ).json()
+
+        webp = data['logo_srcset']['webp'].split(', ')
+        self.assertEqual(len(webp), 4)
+        self.assertTrue(webp[0].startswith('http://testserver/media/'))
+        self.assertTrue(webp[0].endswith('.w320.webp 320w'))
+
+    def test_backfill_command_generates_missing_variants(self):
+        sponsor = self.create_sponsor(size=(700, 350))
+        Sponsor.objects.filter(pk=sponsor.pk).update(logo_variants={})
+        member = TeamModel.objects.create(fullName='Ada Lovelace', position='Lead')
+        TeamModel.objects.filter(pk=member.pk).update(image=sponsor.logo.name)
+        out = StringIO()
+
+        call_command('generate_image_variants', workers=2, stdout=out)
+
+        self.assertIn('Generated variants for 2 images, 0 failed', out.getvalue())
+        sponsor.refresh_from_db()
+        self.assertEqual(list(sponsor.logo_variants['webp']), ['320', '640', '700'])
+        out = StringIO()
+        call_command('generate_image_variants', workers=0, stdout=out)
+        self.assertIn('Generated variants for 0 images', out.getvalue())
+
+
+def jpeg_upload(size, exif=None, name='photo.jpg'):
+    buffer = BytesIO()
+    Image.new('RGB', size, (10, 120, 200)).save(buffer, 'JPEG', exif=exif or b'')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+# Run in a fresh interpreter: ru_maxrss is a process-wide high-water mark
+RSS_SCRIPT = """
+import resource, sys
+from django.conf import settings
+settings.configure(IMAGE_UPLOAD_MAX_DIMENSION=1280)
+from django.core.files import File
+from core.uploads import ingest_image
+with open(sys.argv[1], 'rb') as source:
+    upload = File(source, name='photo.jpg')
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    ingested = ingest_image(upload)
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(after - before, ingested.size)
+"""
+
+
+@override_settings(
+    IMAGE_UPLOAD_MAX_PIXELS=50_000_000,
+    IMAGE_UPLOAD_MAX_DECODED_PIXELS=2_000_000,
+    IMAGE_UPLOAD_MAX_DIMENSION=800,
+)
+class ImageIngestionTests(TestCase):
+    def clean(self, upload):
+        return IngestedImageField().clean(upload)
+
+    def test_downsamples_and_strips_metadata(self):
+        exif = Image.Exif()
+        exif[0x010F] = 'PhoneMaker'
+        # Orientation 6: stored sideways, displayed rotated 90° clockwise
+        exif[0x0112] = 6
+
+        cleaned = self.clean(jpeg_upload((3000, 2000), exif=exif.tobytes()))
+
+        with Image.open(cleaned) as image:
+            self.assertEqual(image.format, 'JPEG')
+            self.assertEqual(image.size, (533, 800))
+            self.assertNotIn('exif', image.info)
+            self.assertEqual(len(image.getexif()), 0)
+
+    def test_small_images_keep_their_size(self):
+        cleaned = self.clean(jpeg_upload((400, 300)))
+
+        with Image.open(cleaned) as image:
+            self.assertEqual(image.size, (400, 300))
+
+    @override_settings(IMAGE_UPLOAD_MAX_PIXELS=1_000_000)
+    def test_rejects_oversized_dimensions_from_the_header(self):
+        upload = jpeg_upload((1500, 1000))
+
+        with self.assertRaises(ValidationError) as raised:
+            with mock.patch('PIL.ImageFile.ImageFile.load') as load:
+                self.clean(upload)
+
+        self.assertEqual(raised.exception.code, 'image_too_large')
+        load.assert_not_called()
+
+    def test_caps_decoded_size_of_formats_without_draft(self):
+        with self.assertRaises(ValidationError):
+            self.clean(image_upload(size=(2000, 1100)))
+
+    def test_rejects_files_that_are_not_images(self):
+        upload = SimpleUploadedFile('logo.png', b'not an image', content_type='image/png')
+
+        with self.assertRaises(ValidationError) as raised:
+            self.clean(upload)
+
+        self.assertEqual(raised.exception.code, 'invalid_image')
+
+    def test_admin_image_fields_use_ingestion(self):
+        request = mock.Mock(user=get_user_model()(is_superuser=True))
+        for model, field in (
+            (Sponsor, 'logo'), (TeamModel, 'image'), (WorkShop, 'workshop_image_header')
+        ):
+            form = admin.site._registry[model].get_form(request)()
+            self.assertIsInstance(form.fields[field], IngestedImageField)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'ru_maxrss is in KiB on Linux')
+    def test_peak_memory_of_a_40_megapixel_upload_is_capped(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        path = os.path.join(directory, 'photo.jpg')
+        # A full decode of this needs 7000 * 5700 * 4 bytes = 160 MB
+        Image.new('RGB', (7000, 5700), (10, 120, 200)).save(path, 'JPEG')
+
+        result = subprocess.run(
+            [sys.executable, '-c', RSS_SCRIPT, path],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent.parent,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': ''},
+        )
+        peak_growth_kib, size = map(int, result.stdout.split())
+
+        self.assertGreater(size, 0)
+        self.assertLess(peak_growth_kib, 40 * 1024)
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+class ServerTimingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_workshop()
+            create_workshop(workshop_name='Advanced Django Patterns')
+        self.url = reverse('workshop-list')
+
+    def metrics(self, response):
+        return {
+            metric.split(';')[0].strip(): metric.strip()
+            for metric in response['Server-Timing'].split(',')
+        }
+
+    def test_list_reports_queries_and_each_step(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        metrics = self.metrics(response)
+        self.assertEqual(
+            list(metrics), ['db', 'paginate', 'serialize', 'render', 'view', 'total']
+        )
+        self.assertIn(f'desc="{len(queries.captured_queries)} queries"', metrics['db'])
+        self.assertRegex(metrics['render'], r'^render;dur=\d+\.\d$')
+
+    def test_cache_hit_reports_no_queries_and_no_rendering(self):
+        self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+        metrics = self.metrics(response)
+        self.assertIn('desc="0 queries"', metrics['db'])
+        self.assertNotIn('render', metrics)
+        self.assertIn('view', metrics)
+
+    def test_one_log_line_per_request(self):
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            response = self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(len(logs.records), 1)
+        line = logs.records[0].getMessage()
+        self.assertTrue(line.startswith('method=GET path=/api/workshops/ status=200 db_queries='))
+        self.assertIn(f'size={len(response.content)}', line)
+        self.assertEqual(logs.records[0].timing['status'], 200)
+
+    def test_unsampled_requests_are_not_timed(self):
+        with override_settings(SERVER_TIMING_SAMPLE_RATE=0):
+            self.assertNotIn('Server-Timing', self.client.get(self.url))
+
+        with override_settings(SERVER_TIMING_SAMPLE_RATE=0.25):
+            with mock.patch('core.middleware.random.random', return_value=0.3):
+                self.assertNotIn('Server-Timing', self.client.get(self.url))
+            with mock.patch('core.middleware.random.random', return_value=0.2):
+                self.assertIn('Server-Timing', self.client.get(self.url))
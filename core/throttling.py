@@ -0,0 +1,170 @@
+"""
+Token-bucket throttles for the public write endpoints.
+
+Each client key (IP address or submitted email) owns a bucket holding up to
+N tokens that refills continuously at N per period, for a rate of "N/period"
+in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']. A request spends one token and
+is rejected with 429 and Retry-After when the bucket is empty. Bursts up to
+N pass, sustained traffic is held to the rate.
+
+Buckets live in the THROTTLE_CACHE cache (default: "default") as one
+integer each, changed only with add(), incr() and decr(), so concurrent
+requests (threads, processes or hosts sharing the cache) cannot spend the
+same token. If that cache is unreachable a per-process local-memory cache
+takes over, so an outage of the shared cache degrades throttling instead
+of failing requests. Deciding never touches the database.
+"""
+
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from core import metrics
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY_PREFIX = 'core:throttle:'
+
+_fallback_cache = LocMemCache('core-throttle-fallback', {'OPTIONS': {'MAX_ENTRIES': 10000}})
+
+
+def rejected_metric(scope):
+    return f'throttle:rejected:{scope}'
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Base token-bucket throttle; subclasses pick the client key.
+
+    The rate scope is ``<view.throttle_scope>_<scope_suffix>``, e.g.
+    "registration_ip". Views without a throttle_scope, safe methods and
+    scopes without a configured rate are not throttled.
+    """
+    scope_suffix = None
+    throttled_methods = ('POST',)
+
+    def __init__(self):
+        # The rate depends on the view, so it is resolved in allow_request()
+        pass
+
+    def get_cache(self):
+        return caches[getattr(settings, 'THROTTLE_CACHE', 'default')]
+
+    def get_client_key(self, request, view):
+        raise NotImplementedError('.get_client_key() must be overridden')
+
+    def get_cache_key(self, request, view):
+        client_key = self.get_client_key(request, view)
+        if not client_key:
+            return None
+        return f'{BUCKET_KEY_PREFIX}{self.scope}:{client_key}'
+
+    def _spend(self, store, now, interval, burst):
+        """
+        Take a token from the bucket at self.key in ``store``.
+
+        Returns the bucket's new theoretical arrival time and whether the
+        request fits the burst. Every step is a single atomic cache
+        operation, so concurrent requests cannot spend the same token.
+        """
+        timeout = interval // 1000 + 1
+        if store.add(self.key, now + interval, timeout):
+            return now + interval, True
+        try:
+            arrival = store.incr(self.key, interval)
+        except ValueError:
+            # Expired between add() and incr(): the bucket is full again
+            store.add(self.key, now + interval, timeout)
+            return now + interval, True
+        if arrival - now > burst:
+            # Rejected requests spend nothing
+            try:
+                store.decr(self.key, interval)
+            except ValueError:
+                pass
+            return arrival, False
+        # The entry goes once the bucket is full again
+        store.touch(self.key, (arrival - now) // 1000 + 1)
+        return arrival, True
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope or request.method not in self.throttled_methods:
+            return True
+        self.scope = f'{scope}_{self.scope_suffix}'
+        # Read at request time so rate changes in settings apply
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        # Milliseconds. The bucket is stored as its theoretical arrival
+        # time (GCRA): the instant it would be full again, pushed one
+        # interval further by every spent token. A request fits while that
+        # instant is at most one full burst ahead of now.
+        now = int(self.timer() * 1000)
+        interval = max(round(self.duration * 1000 / self.num_requests), 1)
+        burst = interval * self.num_requests
+        try:
+            arrival, allowed = self._spend(self.get_cache(), now, interval, burst)
+        except Exception:
+            logger.warning('Throttle cache unavailable; using local memory', exc_info=True)
+            arrival, allowed = self._spend(_fallback_cache, now, interval, burst)
+
+        self.wait_seconds = max((arrival - burst - now) / 1000, 0)
+        if not allowed:
+            try:
+                metrics.increment(rejected_metric(self.scope))
+            except Exception:
+                logger.warning('Could not record throttle metric', exc_info=True)
+        return allowed
+
+    def wait(self):
+        """Seconds until the next token is available."""
+        return self.wait_seconds
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Bucket per client IP (honours REST_FRAMEWORK['NUM_PROXIES'])."""
+    scope_suffix = 'ip'
+
+    def get_client_key(self, request, view):
+        return self.get_ident(request)
+
+
+class EmailTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Bucket per submitted email address, read from
+    ``view.throttle_email_field`` (default "email") in the request body.
+    """
+    scope_suffix = 'email'
+
+    def get_client_key(self, request, view):
+        field = getattr(view, 'throttle_email_field', 'email')
+        try:
+            email = request.data.get(field)
+        except AttributeError:
+            return None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        # Hashed: keeps keys short and addresses out of the cache
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+def rejection_counts(scopes):
+    """Return {scope: rejected calls} for throttle rate scopes."""
+    counts = metrics.get_counts([rejected_metric(scope) for scope in scopes])
+    return {scope: counts[rejected_metric(scope)] for scope in scopes}
+
+
+def get_rate_scopes():
+    return sorted(api_settings.DEFAULT_THROTTLE_RATES)
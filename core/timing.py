@@ -0,0 +1,72 @@
+"""
+Per-request timing collected for the Server-Timing header.
+
+ServerTimingMiddleware (core.middleware) starts a RequestTimings for a
+sampled request and makes it current for the request's context. Code on
+the request path times its steps with ``span(name)``; outside a sampled
+request a span costs one context variable lookup and records nothing.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Durations (seconds) of the named steps of one request, and its queries."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self.db_queries = 0
+        self.db_time = 0.0
+        self._open = set()
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """connection.execute_wrapper() hook counting and timing queries."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+def current():
+    """The RequestTimings of the sampled request being handled, or None."""
+    return _current.get()
+
+
+def activate(timings):
+    """Make ``timings`` current; returns a token for deactivate()."""
+    return _current.set(timings)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def span(name):
+    """
+    Add the time spent in the block to step ``name`` of the current request.
+
+    Nested spans of the same name (a renderer calling another) are counted
+    once, by the outermost.
+    """
+    timings = _current.get()
+    if timings is None or name in timings._open:
+        yield
+        return
+    timings._open.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings._open.discard(name)
+        timings.add(name, time.perf_counter() - start)
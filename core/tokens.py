@@ -0,0 +1,41 @@
+"""
+Signed links for cancelling a workshop registration.
+
+The token is the registration's workshop id and email, signed with
+SECRET_KEY (django.core.signing), and is only ever sent to that email
+address in the registration confirmation. Holding it is what proves the
+right to cancel; registration ids and emails listed by the API are not
+enough. The pair rather than the registration id is signed because
+waitlist promotions are bulk inserted and not every database hands the
+new ids back. Cancel tokens never expire: the link must keep working
+until the workshop takes place.
+"""
+
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+
+CANCEL_SALT = 'core.registration.cancel'
+
+BadToken = signing.BadSignature
+
+
+def make_cancel_token(registration):
+    return signing.Signer(salt=CANCEL_SALT).sign_object(
+        [registration.workshop_id, registration.user_email]
+    )
+
+
+def read_cancel_token(token):
+    """The (workshop id, email) pair in ``token``; BadToken if forged."""
+    try:
+        workshop_id, user_email = signing.Signer(salt=CANCEL_SALT).unsign_object(token)
+    except (TypeError, ValueError):
+        raise BadToken('Malformed cancel token')
+    return workshop_id, user_email
+
+
+def cancel_url(registration):
+    return settings.SITE_BASE_URL.rstrip('/') + reverse(
+        'registration-cancel', args=[make_cancel_token(registration)]
+    )
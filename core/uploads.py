@@ -0,0 +1,102 @@
+"""
+Bounded-memory ingestion of uploaded images.
+
+Pillow decodes a whole image into memory (4 bytes per pixel), so a
+40-megapixel phone photo costs 160 MB per worker. Ingestion avoids that:
+
+1. The dimensions are read from the header (Image.open() decodes nothing)
+   and images above IMAGE_UPLOAD_MAX_PIXELS are rejected.
+2. JPEGs are decoded with draft(), which lets libjpeg scale by 1/2, 1/4
+   or 1/8 while decoding, to the smallest size still covering
+   IMAGE_UPLOAD_MAX_DIMENSION. Other formats cannot be scaled while
+   decoding, so their decoded size is capped by
+   IMAGE_UPLOAD_MAX_DECODED_PIXELS instead.
+3. The image is reduced to IMAGE_UPLOAD_MAX_DIMENSION, the EXIF rotation
+   applied, and it is re-encoded without metadata (EXIF/GPS, XMP,
+   comments) except the colour profile, into a temporary file.
+
+Peak memory per upload is therefore bounded by the decoded-pixel cap, not
+by what the client sends.
+"""
+
+import os
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from PIL import Image, ImageOps
+
+# format -> save options of the re-encoded image
+REENCODED_FORMATS = {
+    'JPEG': {'quality': 90, 'optimize': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 90},
+}
+
+
+def get_limits():
+    return (
+        getattr(settings, 'IMAGE_UPLOAD_MAX_PIXELS', 100_000_000),
+        getattr(settings, 'IMAGE_UPLOAD_MAX_DECODED_PIXELS', 27_000_000),
+        getattr(settings, 'IMAGE_UPLOAD_MAX_DIMENSION', 2560),
+    )
+
+
+def ingest_image(uploaded):
+    """
+    Return ``uploaded`` downsampled and stripped of metadata, as a new
+    temporary upload; ValidationError if it is too large to take.
+
+    Formats other than JPEG, PNG and WebP (e.g. animated GIFs) are only
+    checked against the limits and kept as they are.
+    """
+    max_pixels, max_decoded_pixels, max_dimension = get_limits()
+    uploaded.seek(0)
+    image = Image.open(uploaded)
+    width, height = image.size
+    if width * height > max_pixels:
+        raise ValidationError(
+            f'The image is {width}×{height} pixels; at most '
+            f'{max_pixels // 1_000_000} megapixels are accepted.',
+            code='image_too_large',
+        )
+    image_format = image.format
+    if image_format not in REENCODED_FORMATS:
+        uploaded.seek(0)
+        return uploaded
+
+    # JPEG only: decode at the smallest scale still covering the final size
+    ratio = min(max_dimension / max(width, height), 1)
+    image.draft(None, (max(round(width * ratio), 1), max(round(height * ratio), 1)))
+    decoded_width, decoded_height = image.size
+    if decoded_width * decoded_height > max_decoded_pixels:
+        raise ValidationError(
+            f'The image is {width}×{height} pixels; images in this format are '
+            f'accepted up to {max_decoded_pixels // 1_000_000} megapixels.',
+            code='image_too_large',
+        )
+
+    icc_profile = image.info.get('icc_profile')
+    image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    image = ImageOps.exif_transpose(image)
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L', 'CMYK'):
+        image = image.convert('RGB')
+
+    # Drop EXIF/XMP/comments carried in info; transparency is image data
+    image.info = {
+        key: value for key, value in image.info.items() if key == 'transparency'
+    }
+    options = dict(REENCODED_FORMATS[image_format])
+    if icc_profile:
+        options['icc_profile'] = icc_profile
+    ingested = TemporaryUploadedFile(
+        os.path.basename(uploaded.name),
+        Image.MIME[image_format],
+        0,
+        None,
+    )
+    image.save(ingested, image_format, **options)
+    ingested.size = ingested.tell()
+    ingested.seek(0)
+    image.close()
+    return ingested
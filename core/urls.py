@@ -2,6 +2,11 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
+    # Landing page content
+    path('api/site/',
+         views.SiteContentView.as_view(),
+         name='site-content'),
+
     # Workshop API endpoints
     path('api/workshops/',
          views.WorkshopListView.as_view(),
@@ -9,6 +14,12 @@ urlpatterns = [
     path('api/workshops/<int:pk>/',
          views.WorkshopDetailView.as_view(),
          name='workshop-detail'),
+    path('api/workshops/search/',
+         views.WorkshopSearchView.as_view(),
+         name='workshop-search'),
+    path('api/workshops/calendar.ics',
+         views.WorkshopCalendarFeedView.as_view(),
+         name='workshop-calendar'),
     path('api/workshops/create/',
          views.WorkshopCreateView.as_view(),
          name='workshop-create'),
@@ -26,4 +37,12 @@ urlpatterns = [
     path('api/workshops/<int:workshop_id>/registrations/',
          views.WorkshopRegistrationsForWorkshopView.as_view(),
          name='workshop-registrations'),
+    path('api/registrations/cancel/<str:token>/',
+         views.WorkshopRegistrationCancelView.as_view(),
+         name='registration-cancel'),
+
+    # Waitlist API endpoints
+    path('api/workshops/waitlist/',
+         views.WaitlistEntryCreateView.as_view(),
+         name='waitlist-join'),
 ]
@@ -1,14 +1,33 @@
+from django.db import IntegrityError, OperationalError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from rest_framework import generics, status
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from core.serializers import (
     WorkShopSerializer,
     WorkshopRegistrationSerializer,
-    WorkShopListSerializer
+    WorkShopListSerializer,
+    WaitlistEntrySerializer,
+    WorkshopSearchResultSerializer
 )
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from core.models import WorkShop, WorkshopRegistration
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from core.models import WaitlistEntry, WorkShop, WorkshopRegistration
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from core.email_utils import send_workshop_registration_email
+from core.email_utils import queue_workshop_registration_email
+from core.counters import WorkshopFull, is_lock_conflict
+from core.waitlist import cancel_registration
+from core.tokens import BadToken, read_cancel_token
+from core.pagination import RegistrationPagination
+from core.response_cache import CachedResponseMixin
+from core.conditional import ConditionalGetMixin
+from core.ics_writer import render_feed
+from core.renderers import EmailLinkPageRenderer, ICalendarRenderer, TimedJSONRenderer
+from core.search import search_workshops
+from core.throttling import EmailTokenBucketThrottle, IPTokenBucketThrottle
+from core.site_snapshot import get_snapshot
 # Create your views here.
 
 
@@ -19,13 +38,14 @@ from core.email_utils import send_workshop_registration_email
         tags=["Workshops"]
     )
 )
-class WorkshopListView(generics.ListAPIView):
+class WorkshopListView(CachedResponseMixin, generics.ListAPIView):
     """
     API view to retrieve list of all workshops.
     """
     queryset = WorkShop.objects.all()
     serializer_class = WorkShopListSerializer
     permission_classes = [AllowAny]
+    cache_collections = ('workshops',)
 
 @extend_schema_view(
     get=extend_schema(
@@ -34,15 +54,132 @@ class WorkshopListView(generics.ListAPIView):
         tags=["Workshops"]
     )
 )
-class WorkshopDetailView(generics.RetrieveAPIView):
+class WorkshopDetailView(CachedResponseMixin, generics.RetrieveAPIView):
     """
     API view to retrieve a single workshop by ID.
     """
     queryset = WorkShop.objects.all()
     serializer_class = WorkShopSerializer
     permission_classes = [AllowAny]
+    cache_collections = ('workshops',)
     
 
+@extend_schema_view(
+    get=extend_schema(
+        summary="Search workshops",
+        description=(
+            "Full-text search over workshop name, location and description. "
+            "Results are ranked best first and carry an HTML snippet with "
+            "the matching terms wrapped in <mark>."
+        ),
+        parameters=[
+            OpenApiParameter('q', str, required=True, description='Search text'),
+            OpenApiParameter(
+                'limit', int, description='Maximum results (default 20, at most 50)'
+            ),
+        ],
+        tags=["Workshops"]
+    )
+)
+class WorkshopSearchView(CachedResponseMixin, generics.ListAPIView):
+    """
+    API view to search workshops.
+    """
+    serializer_class = WorkshopSearchResultSerializer
+    permission_classes = [AllowAny]
+    pagination_class = None
+    cache_collections = ('workshops',)
+    default_limit = 20
+    max_limit = 50
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'The "q" query parameter is required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        results = search_workshops(query, self.get_limit())
+        serializer = self.get_serializer(results, many=True)
+        return Response({
+            'query': query,
+            'count': len(results),
+            'results': serializer.data,
+        })
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Upcoming workshops calendar feed",
+        description=(
+            "iCalendar feed of all upcoming workshops for calendar "
+            "subscriptions. Supports If-None-Match/If-Modified-Since."
+        ),
+        responses={(200, 'text/calendar'): OpenApiTypes.STR},
+        tags=["Workshops"]
+    )
+)
+class WorkshopCalendarFeedView(ConditionalGetMixin, generics.ListAPIView):
+    """
+    API view serving upcoming workshops as an iCalendar feed.
+    """
+    queryset = WorkShop.objects.filter(is_ended=False)
+    renderer_classes = [ICalendarRenderer]
+    permission_classes = [AllowAny]
+    pagination_class = None
+    cache_collections = ('workshop-calendar',)
+    calendar_name = 'Django Campus Workshops'
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            workshop_date__gte=timezone.localdate()
+        ).order_by('workshop_date', 'workshop_time', 'id')
+
+    def get_etag_extra(self, request):
+        # Workshops drop out of the feed when their date passes
+        return [timezone.localdate().isoformat()]
+
+    def list(self, request, *args, **kwargs):
+        return Response(render_feed(self.get_queryset(), self.calendar_name))
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Landing page content",
+        description=(
+            "Everything the landing page shows in one response: active team "
+            "members, partners grouped by tier, sponsors grouped by level, "
+            "contributors, supporters and upcoming workshops. Served from a "
+            "precomputed snapshot; supports If-None-Match."
+        ),
+        responses={200: OpenApiTypes.OBJECT},
+        tags=["Site"]
+    )
+)
+class SiteContentView(APIView):
+    """
+    API view serving the precomputed landing-page snapshot.
+    """
+    permission_classes = [AllowAny]
+    # Public content: skipping authentication keeps the request off the database
+    authentication_classes = []
+
+    def get(self, request, *args, **kwargs):
+        snapshot = get_snapshot()
+        response = get_conditional_response(request, etag=snapshot['etag'])
+        if response is None:
+            response = HttpResponse(snapshot['body'], content_type='application/json')
+        response['ETag'] = snapshot['etag']
+        return response
+
+
 @extend_schema_view(
     post=extend_schema(
         summary="Create new workshop",
@@ -73,36 +210,42 @@ class WorkshopRegistrationCreateView(generics.CreateAPIView):
     queryset = WorkshopRegistration.objects.all()
     serializer_class = WorkshopRegistrationSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'registration'
+    throttle_email_field = 'user_email'
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            # Check if user is already registered for this workshop
-            workshop_id = serializer.validated_data.get('workshop').id
-            user_email = serializer.validated_data.get('user_email')
-            
-            if WorkshopRegistration.objects.filter(
-                workshop_id=workshop_id,
-                user_email=user_email
-            ).exists():
+            # Save the registration and queue the confirmation email with
+            # calendar invite together; the outbox worker delivers it.
+            # Saving claims a seat with a conditional UPDATE and then
+            # inserts the row, and the unique_together constraint rejects
+            # duplicates, so there is no pre-check here.
+            try:
+                with transaction.atomic():
+                    registration = serializer.save()
+                    email_queued = queue_workshop_registration_email(registration)
+            except IntegrityError:
                 return Response(
                     {'error': 'You are already registered for this workshop.'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
-            # Save the registration
-            registration = serializer.save()
-            
-            # Send confirmation email with calendar invite
-            email_sent = send_workshop_registration_email(registration)
+            except WorkshopFull:
+                return self.fully_booked()
+            except OperationalError as exc:
+                # Lost a lock race for the last seats
+                if not is_lock_conflict(exc):
+                    raise
+                return self.fully_booked()
             
             headers = self.get_success_headers(serializer.data)
             
             response_data = serializer.data
-            response_data['email_sent'] = email_sent
+            response_data['email_queued'] = email_queued
             response_data['message'] = (
                 'Registration successful! '
-                'A confirmation email has been sent to your inbox.'
+                'A confirmation email will be sent to your inbox shortly.'
             )
             
             return Response(
@@ -111,6 +254,15 @@ class WorkshopRegistrationCreateView(generics.CreateAPIView):
                 headers=headers
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    def fully_booked(self):
+        return Response(
+            {
+                'error': 'This workshop is fully booked.',
+                'waitlist_available': True,
+            },
+            status=status.HTTP_409_CONFLICT
+        )
 
 
 @extend_schema_view(
@@ -124,9 +276,10 @@ class WorkshopRegistrationListView(generics.ListAPIView):
     """
     API view to retrieve list of all workshop registrations.
     """
-    queryset = WorkshopRegistration.objects.all()
+    queryset = WorkshopRegistration.objects.select_related('workshop')
     serializer_class = WorkshopRegistrationSerializer
     permission_classes = [AllowAny]
+    pagination_class = RegistrationPagination
 
 
 class WorkshopRegistrationDetailView(generics.RetrieveAPIView):
@@ -144,8 +297,149 @@ class WorkshopRegistrationsForWorkshopView(generics.ListAPIView):
     """
     serializer_class = WorkshopRegistrationSerializer
     permission_classes = [AllowAny]
+    pagination_class = RegistrationPagination
     
     def get_queryset(self):
         workshop_id = self.kwargs['workshop_id']
-        return WorkshopRegistration.objects.filter(workshop_id=workshop_id)
+        return WorkshopRegistration.objects.filter(
+            workshop_id=workshop_id
+        ).select_related('workshop')
+
+
+INVALID_CANCEL_LINK = {'error': 'This cancellation link is invalid.'}
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Check a cancellation link",
+        description=(
+            "Check the signed cancellation link from the registration email "
+            "without cancelling anything."
+        ),
+        tags=["Workshop Registration"]
+    ),
+    post=extend_schema(
+        summary="Cancel a registration",
+        description=(
+            "Cancel a workshop registration from the signed link in its "
+            "confirmation email. The freed seat is offered to the head of "
+            "the workshop's waitlist."
+        ),
+        request=None,
+        tags=["Workshop Registration"]
+    )
+)
+class WorkshopRegistrationCancelView(APIView):
+    """
+    API view to cancel a workshop registration from its signed link.
+    """
+    permission_classes = [AllowAny]
+    # Opened from an email: no session, and no CSRF token to check
+    authentication_classes = []
+    # Browsers get a page with a button that POSTs back here
+    renderer_classes = [TimedJSONRenderer, EmailLinkPageRenderer]
+    link_title = 'Cancel your registration'
+    link_action = 'Cancel registration'
+
+    def get_registration(self, token):
+        """The registration ``token`` cancels; BadToken if forged, None if gone."""
+        workshop_id, user_email = read_cancel_token(token)
+        return WorkshopRegistration.objects.select_related('workshop').filter(
+            workshop_id=workshop_id, user_email=user_email
+        ).first()
+
+    def get(self, request, token):
+        try:
+            registration = self.get_registration(token)
+        except BadToken:
+            return Response(INVALID_CANCEL_LINK, status=status.HTTP_400_BAD_REQUEST)
+        if registration is None:
+            return Response(
+                {'error': 'This registration has already been cancelled.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        workshop = registration.workshop
+        return Response({
+            'detail': f'Give up your seat at {workshop.workshop_name} on '
+                      f'{workshop.workshop_date:%B %d, %Y}. '
+                      'Send a POST request to this URL to cancel.'
+        })
+
+    def post(self, request, token):
+        try:
+            registration = self.get_registration(token)
+        except BadToken:
+            return Response(INVALID_CANCEL_LINK, status=status.HTTP_400_BAD_REQUEST)
+        if registration is None:
+            return Response(
+                {'error': 'This registration has already been cancelled.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        promoted = cancel_registration(registration)
+
+        return Response(
+            {
+                'detail': 'Your registration has been cancelled.',
+                'promoted_from_waitlist': len(promoted),
+            },
+            status=status.HTTP_200_OK
+        )
 
+
+@extend_schema_view(
+    post=extend_schema(
+        summary="Join workshop waitlist",
+        description=(
+            "Join the waitlist of a fully booked workshop. Waitlisted people "
+            "are registered in joining order as seats free up."
+        ),
+        tags=["Workshop Registration"]
+    )
+)
+class WaitlistEntryCreateView(generics.CreateAPIView):
+    """
+    API view to join the waitlist for a full workshop.
+    """
+    queryset = WaitlistEntry.objects.all()
+    serializer_class = WaitlistEntrySerializer
+    permission_classes = [AllowAny]
+    # Shares the registration buckets: it is the same form
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'registration'
+    throttle_email_field = 'user_email'
+    
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        workshop = serializer.validated_data['workshop']
+        user_email = serializer.validated_data['user_email']
+        
+        if workshop.free_seats(serializer.validated_data.get('will_attend_physical', True)) != 0:
+            return Response(
+                {'error': 'Seats are still available. Please register instead.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if WorkshopRegistration.objects.filter(
+            workshop=workshop, user_email=user_email
+        ).exists():
+            return Response(
+                {'error': 'You are already registered for this workshop.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            return Response(
+                {'error': 'You are already on the waitlist for this workshop.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED,
+            headers=headers
+        )
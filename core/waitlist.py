@@ -0,0 +1,100 @@
+from collections import Counter
+
+from django.db import transaction
+
+from core.counters import apply_counter_deltas, registration_counter_fields
+from core.email_utils import build_waitlist_promotion_email
+from core.models import WaitlistEntry, WorkShop, WorkshopRegistration
+from core.outbox import enqueue_emails
+
+
+def promote_from_waitlist(workshop_id, freed=None):
+    """
+    Fill a workshop's free seats from the head of its waitlist.
+
+    ``freed`` maps an attendance type (True for physical) to the seats a
+    deletion just released. An attendance type without a capacity has no
+    free seat count to go by, so it promotes only that many entries and a
+    cancellation never does more work than the seats it freed. Without
+    ``freed`` (a capacity change in the admin) every free seat is filled.
+
+    Runs in one transaction holding the workshop row lock, so the free seat
+    count cannot change underneath it. Only as many entries as there are
+    free seats are read (through the waitlist head index), the promoted
+    registrations are inserted with one bulk INSERT, the counters are bumped
+    with one UPDATE and all notifications are queued with one INSERT.
+
+    Returns the list of promoted registrations.
+    """
+    with transaction.atomic():
+        try:
+            workshop = WorkShop.objects.select_for_update().get(pk=workshop_id)
+        except WorkShop.DoesNotExist:
+            return []
+
+        entries = []
+        for physical in (True, False):
+            queue = WaitlistEntry.objects.filter(
+                workshop_id=workshop_id, will_attend_physical=physical
+            ).order_by('joined_at', 'id')
+            free = workshop.free_seats(physical)
+            if free is None and freed is not None:
+                free = freed.get(physical, 0)
+            if free is not None:
+                queue = queue[:free]
+            if free != 0:
+                entries.extend(queue)
+
+        if not entries:
+            return []
+
+        # People who registered some other way since joining just leave the list
+        already_registered = set(
+            WorkshopRegistration.objects.filter(
+                workshop_id=workshop_id,
+                user_email__in=[entry.user_email for entry in entries],
+            ).values_list('user_email', flat=True)
+        )
+        registrations = [
+            WorkshopRegistration(
+                workshop=workshop,
+                user_name=entry.user_name,
+                user_email=entry.user_email,
+                phone_number=entry.phone_number,
+                will_attend_physical=entry.will_attend_physical,
+                django_experience=entry.django_experience,
+            )
+            for entry in entries
+            if entry.user_email not in already_registered
+        ]
+
+        # bulk_create skips the post_save seat claim; the seats were
+        # counted above under the row lock, so bump the counters directly.
+        WorkshopRegistration.objects.bulk_create(registrations)
+        deltas = Counter()
+        for registration in registrations:
+            deltas.update(registration_counter_fields(
+                registration.will_attend_physical, registration.django_experience
+            ))
+        apply_counter_deltas(workshop_id, deltas)
+
+        WaitlistEntry.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+        enqueue_emails([
+            build_waitlist_promotion_email(registration)
+            for registration in registrations
+        ])
+
+    return registrations
+
+
+def cancel_registration(registration):
+    """
+    Delete a registration and hand its seat to the waitlist in one transaction.
+
+    Returns the list of registrations promoted into the freed seat.
+    """
+    with transaction.atomic():
+        registration.delete()
+        return promote_from_waitlist(
+            registration.workshop_id, {registration.will_attend_physical: 1}
+        )
@@ -42,6 +42,8 @@ INSTALLED_APPS += [
 ]
 
 MIDDLEWARE = [
+    # First, so its total covers the other middlewares
+    "core.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -113,13 +115,25 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # Timed variants of DRF's own, reporting to Server-Timing (core.middleware)
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.TimedPageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "core.renderers.TimedJSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Token-bucket rates of the public POST endpoints (core.throttling):
+    # "<throttle_scope>_ip" per client IP, "<throttle_scope>_email" per
+    # submitted address
+    "DEFAULT_THROTTLE_RATES": {
+        "registration_ip": "20/hour",
+        "registration_email": "5/hour",
+        "newsletter_ip": "10/hour",
+        "newsletter_email": "3/hour",
+    },
+    # Client IPs come from REMOTE_ADDR unless a proxy count is configured
+    "NUM_PROXIES": 0,
 }
 
 # Add Spectacular settings
@@ -130,5 +144,52 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
     "SCHEMA_PATH_PREFIX": r"/api/v[0-9]",
 }
+
+# Seconds a rendered public API response stays in the cache. Entries are
+# invalidated by model signals long before this; it only bounds how long
+# unreachable entries linger.
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# Cache alias holding the throttle buckets
+THROTTLE_CACHE = "default"
+
+# Rebuild the api/site/ snapshot on a background thread after content
+# changes (core.site_snapshot); when False it is rebuilt inline
+SITE_SNAPSHOT_BACKGROUND = True
+
+# Public origin of the site, for absolute URLs built outside a request
+# (the api/site/ snapshot, prerendered API files)
+SITE_BASE_URL = "http://localhost:8000"
+
+# Resized image variants (core.images) are generated by a pool of this many
+# processes after an upload commits; when False they are generated inline
+IMAGE_VARIANTS_BACKGROUND = True
+IMAGE_VARIANT_WORKERS = 2
+
+# Admin image uploads (core.uploads): rejected above IMAGE_UPLOAD_MAX_PIXELS,
+# formats that cannot be scaled while decoding (all but JPEG) above
+# IMAGE_UPLOAD_MAX_DECODED_PIXELS, and downsampled to
+# IMAGE_UPLOAD_MAX_DIMENSION on their longest side. A JPEG decodes to less
+# than twice that dimension per side, so keep the decoded cap above
+# (2 * IMAGE_UPLOAD_MAX_DIMENSION) ** 2 or some JPEGs are refused. Uploads larger than
+# FILE_UPLOAD_MAX_MEMORY_SIZE (default 2.5 MB) are streamed to temp files.
+IMAGE_UPLOAD_MAX_PIXELS = 100_000_000
+IMAGE_UPLOAD_MAX_DECODED_PIXELS = 27_000_000
+IMAGE_UPLOAD_MAX_DIMENSION = 2560
+
+# Newsletter campaigns (newsletter.campaigns): parallel persistent email
+# connections and the overall sending cap in messages per second (0: none)
+NEWSLETTER_SMTP_CONNECTIONS = 2
+NEWSLETTER_SEND_RATE = 10
+
+# Origin of the signed confirm/unsubscribe links mailed to subscribers
+# (newsletter.tokens), and how long a confirmation link stays valid
+NEWSLETTER_BASE_URL = "http://localhost:8000"
+NEWSLETTER_CONFIRM_MAX_AGE = 7 * 24 * 60 * 60
+
+# Fraction of requests (0 to 1) timed by core.middleware.ServerTimingMiddleware:
+# Server-Timing header plus one log line on the "core.timing" logger
+SERVER_TIMING_SAMPLE_RATE = 0
+
 # Static files and other configurations will be set in
 # environment-specific files
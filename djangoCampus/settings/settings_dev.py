@@ -47,6 +47,17 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Take the write lock at BEGIN so concurrent registrations queue
+        # on the busy timeout instead of failing with "database is locked"
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
+        # A file-backed test database lets concurrency tests use real
+        # parallel connections
+        "TEST": {
+            "NAME": BASE_DIR / "test_db.sqlite3",
+        },
     }
 }
 
@@ -65,6 +76,9 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        # The default of 300 entries cannot hold one calendar feed block
+        # per workshop plus the API response cache
+        "OPTIONS": {"MAX_ENTRIES": 10000},
     }
 }
 
@@ -76,6 +90,10 @@ try:
 except ImportError:
     pass
 
+# Time every request; the Server-Timing header shows in the browser's
+# network panel
+SERVER_TIMING_SAMPLE_RATE = 1
+
 # Logging
 LOGGING = {
     "version": 1,
@@ -89,6 +107,12 @@ LOGGING = {
         "handlers": ["console"],
         "level": "INFO",
     },
+    "loggers": {
+        # The per-request timing lines; set to INFO to print them
+        "core.timing": {
+            "level": "WARNING",
+        },
+    },
 }
 
 # Default primary key field type
@@ -4,7 +4,7 @@ Production settings for DjangoCampus project.
 
 import os
 from .settings_base import *  # Import base settings  # noqa: E402,F403,F401
-from .settings_base import BASE_DIR  # noqa: E402
+from .settings_base import BASE_DIR, REST_FRAMEWORK  # noqa: E402
 
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.environ.get("SECRET_KEY", "django-insecure-fallback-key-change-me")
@@ -35,6 +35,12 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Take the write lock at BEGIN so concurrent registrations queue
+        # on the busy timeout instead of failing with "database is locked"
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
     }
 }
 
@@ -85,6 +91,13 @@ CACHES = {
     }
 }
 
+# Behind the TLS-terminating proxy: throttles take the client IP from
+# X-Forwarded-For, trusting this many proxies
+REST_FRAMEWORK["NUM_PROXIES"] = int(os.environ.get("NUM_PROXIES", 1))
+
+# Time a small sample of requests (Server-Timing header and a log line)
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get("SERVER_TIMING_SAMPLE_RATE", 0.01))
+
 # Email settings
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = os.environ.get("EMAIL_HOST", "smtp.gmail.com")
@@ -97,6 +110,11 @@ DEFAULT_FROM_EMAIL = os.environ.get(
     "Django Campus <noreply@djangocampus.com>"
 )
 
+# Public origin for absolute URLs built outside a request, and of the
+# newsletter confirm/unsubscribe links
+SITE_BASE_URL = os.environ.get("SITE_BASE_URL", "https://djangocampus.pythonanywhere.com")
+NEWSLETTER_BASE_URL = os.environ.get("NEWSLETTER_BASE_URL", SITE_BASE_URL)
+
 # Logging
 LOGGING = {
     "version": 1,
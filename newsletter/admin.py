@@ -1,11 +1,19 @@
 from django.contrib import admin
-from .models import NewsletterSubscriber
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from core.streaming import streaming_csv_response, streaming_ndjson_response
+from .exporters import csv_rows, ndjson_records
+from .forms import SubscriberImportForm
+from .importers import guess_format, import_subscribers
+from .models import Campaign, NewsletterSubscriber
 
 
 @admin.register(NewsletterSubscriber)
 class NewsletterSubscriberAdmin(admin.ModelAdmin):
-    list_display = ('email', 'name', 'created_at')
-    list_filter = ('created_at',)
+    list_display = ('email', 'name', 'status', 'created_at')
+    list_filter = ('status', 'created_at')
     search_fields = ('email', 'name')
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('-created_at',)
@@ -13,7 +21,7 @@ class NewsletterSubscriberAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('Subscriber Information', {
-            'fields': ('email', 'name')
+            'fields': ('email', 'name', 'status')
         }),
         ('Metadata', {
             'fields': ('created_at', 'updated_at'),
@@ -21,6 +29,64 @@ class NewsletterSubscriberAdmin(admin.ModelAdmin):
         }),
     )
     
+    actions = ['export_as_csv', 'export_as_ndjson']
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                'import/',
+                self.admin_site.admin_view(self.import_view),
+                name=f'{opts.app_label}_{opts.model_name}_import',
+            ),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        result = None
+        form = SubscriberImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            uploaded = form.cleaned_data['subscribers_file']
+            try:
+                result = import_subscribers(
+                    uploaded.file,
+                    guess_format(uploaded.name),
+                    default_status=form.cleaned_data['default_status'],
+                )
+            except (ValueError, UnicodeDecodeError) as e:
+                form.add_error('subscribers_file', str(e))
+            else:
+                self.message_user(
+                    request,
+                    f"Imported {result.created} subscriber(s); "
+                    f"{result.error_count} row(s) had errors."
+                )
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import subscribers',
+            'form': form,
+            'result': result,
+        }
+        return TemplateResponse(
+            request, 'admin/newsletter/newslettersubscriber/import.html', context
+        )
+
+    def export_as_csv(self, request, queryset):
+        return streaming_csv_response(csv_rows(queryset), 'newsletter_subscribers.csv')
+
+    export_as_csv.short_description = "Export selected subscribers as CSV"
+
+    def export_as_ndjson(self, request, queryset):
+        return streaming_ndjson_response(
+            ndjson_records(queryset), 'newsletter_subscribers.ndjson'
+        )
+
+    export_as_ndjson.short_description = "Export selected subscribers as NDJSON"
+
     def has_delete_permission(self, request, obj=None):
         # Allow deleting subscribers
         return True
@@ -31,3 +97,30 @@ class NewsletterSubscriberAdmin(admin.ModelAdmin):
             request, queryset, search_term
         )
         return queryset, use_distinct
+
+
+@admin.register(Campaign)
+class CampaignAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'sent_count', 'failed_count', 'skipped_count', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    readonly_fields = (
+        'status', 'sent_count', 'failed_count', 'skipped_count', 'last_subscriber_id',
+        'claimed_through_id', 'started_at', 'finished_at', 'created_at', 'updated_at',
+    )
+    fieldsets = (
+        ('Message', {
+            'fields': ('subject', 'from_email', 'body_text', 'body_html')
+        }),
+        ('Delivery', {
+            'description': 'Sent with: python manage.py send_campaign <id>',
+            'fields': (
+                'status', 'sent_count', 'failed_count', 'skipped_count',
+                'last_subscriber_id', 'claimed_through_id', 'started_at', 'finished_at',
+            ),
+        }),
+        ('Metadata', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
@@ -0,0 +1,349 @@
+"""
+Batched, resumable delivery of newsletter campaigns.
+
+Active subscribers are read by keyset on id, ``chunk_size`` at a time, so memory
+stays flat however long the list is. Each message is rendered from
+templates compiled once per run and sent over a small pool of persistent
+email connections, one per sending thread, spaced by a shared rate limit.
+Every message carries the subscriber's signed one-click unsubscribe link
+in its List-Unsubscribe headers (RFC 8058), and templates can show it as
+{{ unsubscribe_url }}.
+
+Progress is checkpointed per chunk on the Campaign row. Before a chunk
+is sent its last id is stored as claimed_through_id; once it is done,
+last_subscriber_id moves up to it. A run that stops on an SMTP failure
+also records which ids of the chunk it already handled, and the next run
+sends the rest. A run that died without recording that (killed process)
+leaves the chunk unaccounted for. It is skipped and counted as skipped,
+never sent twice, unless resend_interrupted is given. Delivery is
+therefore at most once, with at most one chunk to reconcile by hand.
+"""
+
+import logging
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.template import Context, Template
+from django.utils import timezone
+
+from newsletter.models import Campaign, CampaignStatus, NewsletterSubscriber, SubscriberStatus
+from newsletter.tokens import unsubscribe_url
+
+logger = logging.getLogger(__name__)
+
+# How long a run keeps the campaign reserved beyond the current chunk's
+# expected sending time
+CAMPAIGN_LEASE = timedelta(minutes=10)
+
+SENT, FAILED, ABORTED = 'sent', 'failed', 'aborted'
+
+
+class CampaignError(Exception):
+    pass
+
+
+class DeliveryAborted(CampaignError):
+    """The email server stayed unreachable; the campaign was paused."""
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            send_at = max(self.next_at, now)
+            self.next_at = send_at + self.interval
+        if send_at > now:
+            time.sleep(send_at - now)
+
+
+def message_refused(exc):
+    """
+    Whether ``exc`` is the server rejecting one message (bad recipient, or
+    a permanent 5xx for the sender or the content) over a session that is
+    still usable.
+    """
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    return (
+        isinstance(exc, (smtplib.SMTPDataError, smtplib.SMTPSenderRefused))
+        and exc.smtp_code >= 500
+    )
+
+
+class ConnectionPool:
+    """
+    Sends messages over ``size`` persistent connections, one per thread.
+
+    A message the server refuses (see message_refused()) is reported as
+    FAILED and sending goes on. Any other error is treated as a broken
+    connection, which is reopened once for the same message; if that
+    fails too the pool is aborted and every remaining message is reported
+    as ABORTED instead of being tried.
+    """
+
+    def __init__(self, size, rate=0):
+        self.limiter = RateLimiter(rate)
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='campaign-mail')
+        self.aborted = threading.Event()
+        self.connections = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = get_connection()
+            with self._lock:
+                self.connections.append(connection)
+        return connection
+
+    def _send(self, message):
+        if self.aborted.is_set():
+            return ABORTED
+        connection = self._connection()
+        self.limiter.wait()
+        for attempt in (1, 2):
+            try:
+                connection.open()
+                connection.send_messages([message])
+                return SENT
+            except Exception as exc:
+                if message_refused(exc):
+                    # The message is the problem, not the connection
+                    logger.warning('Campaign message to %s refused: %s', message.to[0], exc)
+                    return FAILED
+                connection.close()
+                if attempt == 2:
+                    logger.error('Campaign sending aborted: %s', exc)
+                    self.aborted.set()
+                    return ABORTED
+        return ABORTED
+
+    def send(self, messages):
+        """Send ``messages``; return their outcomes in the same order."""
+        return list(self.executor.map(self._send, messages))
+
+    def close(self):
+        self.executor.shutdown()
+        for connection in self.connections:
+            connection.close()
+
+
+class CampaignRenderer:
+    """Builds each subscriber's message from templates compiled once."""
+
+    def __init__(self, campaign):
+        self.campaign = campaign
+        self.subject = Template(campaign.subject)
+        self.text = Template(campaign.body_text)
+        self.html = Template(campaign.body_html) if campaign.body_html.strip() else None
+        self.from_email = campaign.from_email or settings.DEFAULT_FROM_EMAIL
+
+    def get_context(self, subscriber_id, email, name, unsubscribe_url):
+        return {
+            'campaign': self.campaign,
+            'subscriber': {'id': subscriber_id, 'email': email, 'name': name or ''},
+            'unsubscribe_url': unsubscribe_url,
+        }
+
+    def get_headers(self, unsubscribe_url):
+        return {
+            'List-Unsubscribe': f'<{unsubscribe_url}>',
+            'List-Unsubscribe-Post': 'List-Unsubscribe=One-Click',
+        }
+
+    def message(self, subscriber_id, email, name):
+        link = unsubscribe_url(subscriber_id)
+        context = self.get_context(subscriber_id, email, name, link)
+        message = EmailMultiAlternatives(
+            subject=' '.join(self.subject.render(Context(context, autoescape=False)).split()),
+            body=self.text.render(Context(context, autoescape=False)),
+            from_email=self.from_email,
+            to=[email],
+            headers=self.get_headers(link),
+        )
+        if self.html is not None:
+            message.attach_alternative(self.html.render(Context(context)), 'text/html')
+        return message
+
+
+def subscriber_chunks(after_id, chunk_size):
+    """Yield lists of (id, email, name) of active subscribers past ``after_id``."""
+    while True:
+        rows = list(
+            NewsletterSubscriber.objects.filter(id__gt=after_id, status=SubscriberStatus.ACTIVE)
+            .order_by('id')
+            .values_list('id', 'email', 'name')[:chunk_size]
+        )
+        if not rows:
+            return
+        yield rows
+        after_id = rows[-1][0]
+
+
+def _lease(chunk_size, rate):
+    sending_time = timedelta(seconds=chunk_size / rate) if rate else timedelta()
+    return timezone.now() + CAMPAIGN_LEASE + sending_time
+
+
+def claim_campaign(campaign_id, lease_until):
+    """
+    Reserve a campaign for this run; returns (campaign, previous status).
+
+    Raises CampaignError if it was already sent or another run holds it.
+    """
+    with transaction.atomic():
+        campaign = Campaign.objects.select_for_update().get(pk=campaign_id)
+        if campaign.status == CampaignStatus.SENT:
+            raise CampaignError(f'Campaign {campaign_id} was already sent.')
+        if campaign.lease_expires_at and campaign.lease_expires_at > timezone.now():
+            raise CampaignError(
+                f'Campaign {campaign_id} is being sent by another run '
+                f'(reserved until {campaign.lease_expires_at:%Y-%m-%d %H:%M:%S}).'
+            )
+        previous_status = campaign.status
+        campaign.status = CampaignStatus.SENDING
+        campaign.lease_expires_at = lease_until
+        campaign.started_at = campaign.started_at or timezone.now()
+        campaign.save(update_fields=['status', 'lease_expires_at', 'started_at', 'updated_at'])
+    return campaign, previous_status
+
+
+def _update(campaign, **fields):
+    Campaign.objects.filter(pk=campaign.pk).update(updated_at=timezone.now(), **fields)
+
+
+def _send_chunk(campaign, rows, pool, renderer, lease_until):
+    """Send one claimed chunk and checkpoint it; returns (sent, failed)."""
+    outcomes = pool.send([renderer.message(*row) for row in rows])
+    sent = outcomes.count(SENT)
+    failed = outcomes.count(FAILED)
+    counts = {'sent_count': F('sent_count') + sent, 'failed_count': F('failed_count') + failed}
+
+    if ABORTED in outcomes:
+        done = [row[0] for row, outcome in zip(rows, outcomes) if outcome != ABORTED]
+        _update(
+            campaign,
+            claimed_done_ids=campaign.claimed_done_ids + done,
+            status=CampaignStatus.PAUSED,
+            lease_expires_at=None,
+            **counts,
+        )
+        raise DeliveryAborted(
+            f'Campaign {campaign.pk} paused after {sent} messages of this chunk: '
+            f'the email server is unreachable. Run the command again to resume.'
+        )
+
+    _update(
+        campaign,
+        last_subscriber_id=campaign.claimed_through_id,
+        claimed_done_ids=[],
+        lease_expires_at=lease_until,
+        **counts,
+    )
+    campaign.last_subscriber_id = campaign.claimed_through_id
+    campaign.claimed_done_ids = []
+    return sent, failed
+
+
+def _resume_interrupted_chunk(campaign, previous_status, resend_interrupted, pool, renderer, lease):
+    """
+    Deal with the chunk an earlier run claimed but did not finish.
+    Returns (sent, failed, skipped).
+    """
+    pending = list(
+        NewsletterSubscriber.objects.filter(
+            id__gt=campaign.last_subscriber_id,
+            id__lte=campaign.claimed_through_id,
+            status=SubscriberStatus.ACTIVE,
+        ).exclude(id__in=campaign.claimed_done_ids)
+        .order_by('id')
+        .values_list('id', 'email', 'name')
+    )
+    if previous_status == CampaignStatus.SENDING and not resend_interrupted:
+        # The run died mid-chunk: any of these may have gone out already
+        _update(
+            campaign,
+            last_subscriber_id=campaign.claimed_through_id,
+            claimed_done_ids=[],
+            skipped_count=F('skipped_count') + len(pending),
+        )
+        campaign.last_subscriber_id = campaign.claimed_through_id
+        campaign.claimed_done_ids = []
+        logger.warning(
+            'Campaign %s: skipped %s subscribers of a chunk interrupted by a crash',
+            campaign.pk, len(pending),
+        )
+        return 0, 0, len(pending)
+    if not pending:
+        _update(campaign, last_subscriber_id=campaign.claimed_through_id, claimed_done_ids=[])
+        campaign.last_subscriber_id = campaign.claimed_through_id
+        campaign.claimed_done_ids = []
+        return 0, 0, 0
+    return (*_send_chunk(campaign, pending, pool, renderer, lease()), 0)
+
+
+def send_campaign(
+    campaign_id, chunk_size=200, connections=2, rate=0, resend_interrupted=False,
+    progress=None,
+):
+    """
+    Deliver a campaign to every subscriber not reached yet.
+
+    ``rate`` caps messages per second across all connections (0: no cap).
+    ``progress(last_subscriber_id, sent, failed)`` is called after each
+    chunk. Returns the totals of this run as a dict.
+    """
+    def lease():
+        return _lease(chunk_size, rate)
+
+    campaign, previous_status = claim_campaign(campaign_id, lease())
+    renderer = CampaignRenderer(campaign)
+    pool = ConnectionPool(connections, rate)
+    totals = {'sent': 0, 'failed': 0, 'skipped': 0}
+    try:
+        if campaign.claimed_through_id > campaign.last_subscriber_id:
+            sent, failed, skipped = _resume_interrupted_chunk(
+                campaign, previous_status, resend_interrupted, pool, renderer, lease
+            )
+            totals['sent'] += sent
+            totals['failed'] += failed
+            totals['skipped'] += skipped
+
+        for rows in subscriber_chunks(campaign.last_subscriber_id, chunk_size):
+            campaign.claimed_through_id = rows[-1][0]
+            _update(campaign, claimed_through_id=campaign.claimed_through_id, lease_expires_at=lease())
+            sent, failed = _send_chunk(campaign, rows, pool, renderer, lease())
+            totals['sent'] += sent
+            totals['failed'] += failed
+            if progress:
+                progress(campaign.last_subscriber_id, sent, failed)
+    except DeliveryAborted:
+        raise
+    except BaseException:
+        # Anything else leaves the claimed chunk for the next run to skip
+        _update(campaign, lease_expires_at=None)
+        raise
+    finally:
+        pool.close()
+
+    _update(
+        campaign, status=CampaignStatus.SENT, finished_at=timezone.now(), lease_expires_at=None
+    )
+    return totals
@@ -0,0 +1,39 @@
+"""
+Streaming export of newsletter subscribers as CSV or NDJSON.
+
+Rows are read with values_list().iterator(), so an export holds one chunk
+in memory however long the list is. The columns are the ones
+newsletter.importers reads back.
+"""
+
+from core.streaming import csv_lines, ndjson_lines
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+EXPORT_FIELDS = ('email', 'name', 'status', 'created_at')
+CSV_HEADER = ['Email', 'Name', 'Status', 'Subscribed At']
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _values(queryset):
+    return queryset.order_by('pk').values_list(*EXPORT_FIELDS).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+
+
+def csv_rows(queryset):
+    yield CSV_HEADER
+    for email, name, status, created_at in _values(queryset):
+        yield [email, name or '', status, created_at.strftime('%Y-%m-%d %H:%M:%S')]
+
+
+def ndjson_records(queryset):
+    for email, name, status, created_at in _values(queryset):
+        yield {'email': email, 'name': name or '', 'status': status, 'created_at': created_at}
+
+
+def export_lines(queryset, file_format):
+    """Yield the subscribers of ``queryset`` as text lines of ``file_format``."""
+    if file_format == 'ndjson':
+        return ndjson_lines(ndjson_records(queryset))
+    return csv_lines(csv_rows(queryset))
@@ -0,0 +1,19 @@
+from django import forms
+
+from newsletter.models import SubscriberStatus
+
+
+class SubscriberImportForm(forms.Form):
+    subscribers_file = forms.FileField(
+        label="File",
+        help_text=(
+            "CSV with an Email column and optional Name and Status columns (as written "
+            "by \"Export selected subscribers as CSV\"), or NDJSON (.ndjson/.jsonl) "
+            "with email, name and status keys. Addresses already subscribed are skipped."
+        ),
+    )
+    default_status = forms.ChoiceField(
+        label="Status of rows without one",
+        choices=SubscriberStatus.choices,
+        initial=SubscriberStatus.ACTIVE,
+    )
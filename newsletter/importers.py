@@ -0,0 +1,144 @@
+"""
+Streaming import of newsletter subscribers from CSV or NDJSON.
+
+The file is read one row at a time. Emails are normalized like the
+subscribe endpoint does, duplicates within a chunk are dropped, and each
+chunk is inserted with bulk_create(ignore_conflicts=True), so addresses
+already on the list (or repeated in an earlier chunk) are skipped by the
+case-insensitive unique index rather than by a lookup per row. Memory is
+bounded by the chunk size.
+
+CSV files need an Email column; Name and Status are optional (the
+columns written by newsletter.exporters). NDJSON lines are objects with
+the same keys in lower case.
+"""
+
+import csv
+import io
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from core.importers import ImportResult
+from newsletter.models import NewsletterSubscriber, SubscriberStatus
+from newsletter.subscriptions import normalize_email
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+_name_max_length = NewsletterSubscriber._meta.get_field('name').max_length
+_email_max_length = NewsletterSubscriber._meta.get_field('email').max_length
+_statuses = frozenset(SubscriberStatus.values)
+
+
+def guess_format(filename):
+    """'ndjson' for .ndjson/.jsonl files, 'csv' otherwise."""
+    return 'ndjson' if filename.lower().endswith(('.ndjson', '.jsonl')) else 'csv'
+
+
+def _csv_records(text):
+    reader = csv.reader(text)
+    header = [column.strip().lower() for column in next(reader, [])]
+    if 'email' not in header:
+        raise ValueError('Missing required column: Email')
+    positions = {
+        key: header.index(key) for key in ('email', 'name', 'status') if key in header
+    }
+    for line, values in enumerate(reader, start=2):
+        if not any(value.strip() for value in values):
+            continue
+        yield line, {
+            key: values[position] if position < len(values) else ''
+            for key, position in positions.items()
+        }
+
+
+def _ndjson_records(text):
+    for line, raw in enumerate(text, start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError as e:
+            yield line, ValueError(f'Invalid JSON: {e}')
+            continue
+        if not isinstance(record, dict):
+            yield line, ValueError('Each line must be a JSON object.')
+            continue
+        yield line, record
+
+
+def _subscriber(record, default_status):
+    """Return (NewsletterSubscriber, []) or (None, error messages)."""
+    errors = []
+    email = record.get('email')
+    if not isinstance(email, str) or not email.strip():
+        errors.append('Email: This field is required.')
+    else:
+        email = normalize_email(email)
+        try:
+            if len(email) > _email_max_length:
+                raise ValidationError(
+                    f'Ensure this field has no more than {_email_max_length} characters.'
+                )
+            validate_email(email)
+        except ValidationError as e:
+            errors.extend(f'Email: {message}' for message in e.messages)
+
+    name = record.get('name') or ''
+    name = name.strip() if isinstance(name, str) else str(name)
+    if len(name) > _name_max_length:
+        errors.append(f'Name: Ensure this field has no more than {_name_max_length} characters.')
+
+    status = record.get('status') or default_status
+    status = status.strip().lower() if isinstance(status, str) else status
+    if status not in _statuses:
+        errors.append(f'Status: "{status}" is not one of {", ".join(SubscriberStatus.values)}.')
+
+    if errors:
+        return None, errors
+    return NewsletterSubscriber(email=email, name=name or None, status=status), []
+
+
+def import_subscribers(
+    binary_file, file_format='csv', default_status=SubscriberStatus.ACTIVE, chunk_size=2000
+):
+    """
+    Stream subscribers from a CSV or NDJSON file into the database.
+
+    Rows without a status get ``default_status``: a list moved from another
+    provider has already opted in. Returns an ImportResult; ``created``
+    excludes addresses that were already subscribed. Raises ValueError for
+    an unusable CSV header.
+    """
+    text = io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline='')
+    try:
+        records = _ndjson_records(text) if file_format == 'ndjson' else _csv_records(text)
+        result = ImportResult()
+        chunk = {}
+        before = NewsletterSubscriber.objects.count()
+
+        for line, record in records:
+            result.rows += 1
+            if isinstance(record, Exception):
+                result.add_error(line, [str(record)])
+                continue
+            subscriber, errors = _subscriber(record, default_status)
+            if errors:
+                result.add_error(line, errors)
+                continue
+            result.valid += 1
+            # First occurrence wins within the chunk; the unique index
+            # takes care of repeats across chunks
+            chunk.setdefault(subscriber.email, subscriber)
+            if len(chunk) >= chunk_size:
+                NewsletterSubscriber.objects.bulk_create(chunk.values(), ignore_conflicts=True)
+                chunk = {}
+
+        if chunk:
+            NewsletterSubscriber.objects.bulk_create(chunk.values(), ignore_conflicts=True)
+        result.created = NewsletterSubscriber.objects.count() - before
+        return result
+    finally:
+        # Leave the uploaded file open for Django to clean up
+        text.detach()
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from newsletter.exporters import EXPORT_FORMATS, export_lines
+from newsletter.importers import guess_format
+from newsletter.models import NewsletterSubscriber, SubscriberStatus
+
+
+class Command(BaseCommand):
+    help = 'Stream newsletter subscribers to a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-', help='Output file (default: standard output)'
+        )
+        parser.add_argument(
+            '--format',
+            choices=EXPORT_FORMATS,
+            help='File format (default: guessed from the extension, else csv)',
+        )
+        parser.add_argument(
+            '--status',
+            choices=SubscriberStatus.values,
+            action='append',
+            dest='statuses',
+            help='Only export subscribers with this status (may be repeated)',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or guess_format(path)
+        queryset = NewsletterSubscriber.objects.all()
+        if options['statuses']:
+            queryset = queryset.filter(status__in=options['statuses'])
+
+        output = None
+        if path != '-':
+            try:
+                output = open(path, 'w', encoding='utf-8', newline='')
+            except OSError as exc:
+                raise CommandError(str(exc))
+        write = output.write if output is not None else lambda line: self.stdout.write(line, ending='')
+        # The CSV header is not a subscriber
+        count = -1 if file_format == 'csv' else 0
+        try:
+            for line in export_lines(queryset, file_format):
+                write(line)
+                count += 1
+        finally:
+            if output is not None:
+                output.close()
+
+        if path != '-':
+            self.stdout.write(self.style.SUCCESS(f'Exported {count} subscriber(s) to {path}'))
@@ -0,0 +1,68 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from newsletter.importers import IMPORT_FORMATS, guess_format, import_subscribers
+from newsletter.models import SubscriberStatus
+
+# Row errors printed before the rest are only counted
+MAX_PRINTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream newsletter subscribers from a CSV or NDJSON file into the list, '
+        'skipping addresses that are already subscribed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - for standard input')
+        parser.add_argument(
+            '--format',
+            choices=IMPORT_FORMATS,
+            help='File format (default: guessed from the extension, else csv)',
+        )
+        parser.add_argument(
+            '--status',
+            choices=SubscriberStatus.values,
+            default=SubscriberStatus.ACTIVE,
+            help='Status of rows without a Status column (default: active)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows inserted per statement (default: 2000)',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or guess_format(path)
+        try:
+            binary_file = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        except OSError as exc:
+            raise CommandError(str(exc))
+        try:
+            result = import_subscribers(
+                binary_file,
+                file_format,
+                default_status=options['status'],
+                chunk_size=options['chunk_size'],
+            )
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise CommandError(str(exc))
+        finally:
+            if binary_file is not sys.stdin.buffer:
+                binary_file.close()
+
+        for line, messages in result.errors[:MAX_PRINTED_ERRORS]:
+            self.stderr.write(f'Line {line}: {"; ".join(messages)}')
+        summary = (
+            f'Imported {result.created} subscriber(s) from {result.rows} row(s); '
+            f'{result.valid - result.created} already subscribed or repeated, '
+            f'{result.error_count} with errors'
+        )
+        if result.error_count:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
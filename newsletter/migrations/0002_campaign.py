@@ -0,0 +1,127 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newsletter", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Campaign",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255, verbose_name="Subject")),
+                (
+                    "body_text",
+                    models.TextField(
+                        help_text="Django template; {{ subscriber.name }} and {{ subscriber.email }} are available",
+                        verbose_name="Plain Text Body",
+                    ),
+                ),
+                (
+                    "body_html",
+                    models.TextField(
+                        blank=True,
+                        help_text="Optional Django template",
+                        verbose_name="HTML Body",
+                    ),
+                ),
+                (
+                    "from_email",
+                    models.CharField(
+                        blank=True,
+                        help_text="Defaults to DEFAULT_FROM_EMAIL",
+                        max_length=255,
+                        verbose_name="From",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("draft", "Draft"),
+                            ("sending", "Sending"),
+                            ("paused", "Paused"),
+                            ("sent", "Sent"),
+                        ],
+                        default="draft",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "last_subscriber_id",
+                    models.BigIntegerField(
+                        default=0, verbose_name="Last Subscriber ID"
+                    ),
+                ),
+                (
+                    "claimed_through_id",
+                    models.BigIntegerField(
+                        default=0, verbose_name="Claimed Through ID"
+                    ),
+                ),
+                (
+                    "claimed_done_ids",
+                    models.JSONField(
+                        blank=True, default=list, verbose_name="Claimed Done IDs"
+                    ),
+                ),
+                (
+                    "lease_expires_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Lease Expires At"
+                    ),
+                ),
+                (
+                    "sent_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Sent"),
+                ),
+                (
+                    "failed_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Failed"),
+                ),
+                (
+                    "skipped_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Skipped"),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Started At"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Finished At"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Campaign",
+                "verbose_name_plural": "Campaigns",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
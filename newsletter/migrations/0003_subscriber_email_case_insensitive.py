@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:38
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def lowercase_emails(apps, schema_editor):
+    NewsletterSubscriber = apps.get_model("newsletter", "NewsletterSubscriber")
+    kept = {}
+    rows = NewsletterSubscriber.objects.order_by("id").values_list(
+        "id", "email", "name"
+    )
+    for pk, email, name in rows.iterator():
+        normalized = email.strip().lower()
+        if normalized in kept:
+            # Same address in another case: keep the first subscription
+            kept_pk = kept[normalized]
+            if name:
+                NewsletterSubscriber.objects.filter(
+                    Q(name__isnull=True) | Q(name=""), pk=kept_pk
+                ).update(name=name)
+            NewsletterSubscriber.objects.filter(pk=pk).delete()
+            continue
+        kept[normalized] = pk
+        if email != normalized:
+            NewsletterSubscriber.objects.filter(pk=pk).update(email=normalized)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newsletter", "0002_campaign"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="newslettersubscriber",
+            name="email",
+            field=models.EmailField(max_length=254, verbose_name="Email Address"),
+        ),
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="newslettersubscriber",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"),
+                name="newsletter_subscriber_email_ci_unique",
+                violation_error_message="This email is already subscribed to our newsletter.",
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+STATUS_CHOICES = [
+    ("pending", "Pending confirmation"),
+    ("active", "Active"),
+    ("unsubscribed", "Unsubscribed"),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("newsletter", "0003_subscriber_email_case_insensitive"),
+    ]
+
+    operations = [
+        # Existing subscribers predate double opt-in and stay subscribed
+        migrations.AddField(
+            model_name="newslettersubscriber",
+            name="status",
+            field=models.CharField(
+                choices=STATUS_CHOICES,
+                default="active",
+                max_length=20,
+                verbose_name="Status",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="newslettersubscriber",
+            name="status",
+            field=models.CharField(
+                choices=STATUS_CHOICES,
+                default="pending",
+                max_length=20,
+                verbose_name="Status",
+            ),
+        ),
+    ]
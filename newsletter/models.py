@@ -1,13 +1,27 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 # Create your models here.
 
 
 ##Newsletter
 
+class SubscriberStatus(models.TextChoices):
+    PENDING = 'pending', 'Pending confirmation'
+    ACTIVE = 'active', 'Active'
+    UNSUBSCRIBED = 'unsubscribed', 'Unsubscribed'
+
+
 class NewsletterSubscriber(models.Model):
     name  = models.CharField(max_length=100, blank=True, null=True, verbose_name="Full Name")
-    email = models.EmailField(max_length=254, unique=True, verbose_name="Email Address")
+    # Stored lowercased; uniqueness is enforced case-insensitively below
+    email = models.EmailField(max_length=254, verbose_name="Email Address")
+    # Campaigns only go to active subscribers: confirmed through the signed
+    # link mailed on subscription (newsletter.tokens)
+    status = models.CharField(
+        max_length=20, choices=SubscriberStatus.choices, default=SubscriberStatus.PENDING,
+        verbose_name="Status",
+    )
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
@@ -15,6 +29,65 @@ class NewsletterSubscriber(models.Model):
     class Meta:
         verbose_name = "Newsletter Subscriber"
         verbose_name_plural = "Newsletter Subscribers"
+        constraints = [
+            models.UniqueConstraint(
+                Lower('email'),
+                name='newsletter_subscriber_email_ci_unique',
+                violation_error_message="This email is already subscribed to our newsletter.",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.email} - {self.name}"
+
+
+class CampaignStatus(models.TextChoices):
+    DRAFT = 'draft', 'Draft'
+    SENDING = 'sending', 'Sending'
+    PAUSED = 'paused', 'Paused'
+    SENT = 'sent', 'Sent'
+
+
+# A newsletter issue mailed to every subscriber by the send_campaign command
+class Campaign(models.Model):
+    subject = models.CharField(max_length=255, verbose_name="Subject")
+    body_text = models.TextField(
+        verbose_name="Plain Text Body",
+        help_text="Django template; {{ subscriber.name }} and {{ subscriber.email }} are available",
+    )
+    body_html = models.TextField(blank=True, verbose_name="HTML Body", help_text="Optional Django template")
+    from_email = models.CharField(
+        max_length=255, blank=True, verbose_name="From",
+        help_text="Defaults to DEFAULT_FROM_EMAIL",
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=CampaignStatus.choices,
+        default=CampaignStatus.DRAFT,
+        verbose_name="Status"
+    )
+
+    # Delivery checkpoint (newsletter.campaigns): every subscriber with
+    # id <= last_subscriber_id is done, claimed_through_id is the last id of
+    # the chunk being sent and claimed_done_ids lists the ids of that chunk
+    # already handled when a run stopped
+    last_subscriber_id = models.BigIntegerField(default=0, verbose_name="Last Subscriber ID")
+    claimed_through_id = models.BigIntegerField(default=0, verbose_name="Claimed Through ID")
+    claimed_done_ids = models.JSONField(default=list, blank=True, verbose_name="Claimed Done IDs")
+    lease_expires_at = models.DateTimeField(blank=True, null=True, verbose_name="Lease Expires At")
+
+    sent_count = models.PositiveIntegerField(default=0, verbose_name="Sent")
+    failed_count = models.PositiveIntegerField(default=0, verbose_name="Failed")
+    skipped_count = models.PositiveIntegerField(default=0, verbose_name="Skipped")
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name="Started At")
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name="Finished At")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
+
+    class Meta:
+        verbose_name = "Campaign"
+        verbose_name_plural = "Campaigns"
+        ordering = ['-created_at']
 
     def __str__(self):
-        return f"{self.email} - {self.name}"
\ No newline at end of file
+        return f"{self.subject} ({self.status})"
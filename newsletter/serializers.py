@@ -1,17 +1,15 @@
 from rest_framework import serializers
 from newsletter.models import NewsletterSubscriber
+from newsletter.subscriptions import normalize_email
 
 
 class NewsletterSubscriberSerializer(serializers.ModelSerializer):
     class Meta:
         model = NewsletterSubscriber
         fields = "__all__"
-        read_only_fields = ['created_at', 'updated_at']
+        read_only_fields = ['status', 'created_at', 'updated_at']
     
     def validate_email(self, value):
-        if NewsletterSubscriber.objects.filter(email=value).exists():
-            raise serializers.ValidationError(
-                "This email is already subscribed to our newsletter."
-            )
-        return value
+        # Existing subscribers are handled by the upsert in subscribe()
+        return normalize_email(value)
 
@@ -0,0 +1,101 @@
+"""
+Idempotent newsletter subscription.
+
+Subscribing is a single upsert keyed on the case-insensitive unique index
+over the email address, so repeated or concurrent submissions of one
+address never race between a lookup and an insert: the database either
+inserts the row or updates the existing one in the same statement.
+
+SQLite and PostgreSQL use INSERT ... ON CONFLICT ... RETURNING. A new row
+is told apart from an existing one by its timestamps: both are set to the
+same value on insert, while an update only moves updated_at. MySQL uses
+INSERT ... ON DUPLICATE KEY UPDATE, whose affected-rows count is 1 for an
+insert and 2 for an update, followed by a primary key lookup to return
+the row. Other backends fall back to get_or_create().
+
+New subscribers start pending; so does an address that unsubscribed and
+signs up again. Pending subscribers are mailed a confirmation link and
+receive campaigns once they follow it.
+"""
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import connection, transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from core.outbox import enqueue_email
+from newsletter.models import NewsletterSubscriber, SubscriberStatus
+from newsletter.tokens import confirm_url
+
+_table = NewsletterSubscriber._meta.db_table
+_columns = 'id, name, email, status, created_at, updated_at'
+
+ON_CONFLICT_SQL = f"""
+    INSERT INTO {_table} (name, email, status, created_at, updated_at)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT ((LOWER(email))) DO UPDATE SET
+        name = COALESCE(excluded.name, {_table}.name),
+        status = CASE WHEN {_table}.status = %s THEN excluded.status ELSE {_table}.status END,
+        updated_at = excluded.updated_at
+    RETURNING {_columns}, created_at = updated_at AS created
+"""
+
+ON_DUPLICATE_KEY_SQL = f"""
+    INSERT INTO {_table} (name, email, status, created_at, updated_at)
+    VALUES (%s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        id = LAST_INSERT_ID(id),
+        name = COALESCE(VALUES(name), name),
+        status = CASE WHEN status = %s THEN VALUES(status) ELSE status END,
+        updated_at = VALUES(updated_at)
+"""
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+def subscribe(email, name=None):
+    """
+    Subscribe ``email``, or update the name of an existing subscriber.
+    Returns (subscriber, created).
+
+    A blank ``name`` keeps the name already on record.
+    """
+    email = normalize_email(email)
+    name = name or None
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    params = [name, email, SubscriberStatus.PENDING, now, now, SubscriberStatus.UNSUBSCRIBED]
+
+    if connection.vendor in ('sqlite', 'postgresql'):
+        subscriber = next(iter(NewsletterSubscriber.objects.raw(ON_CONFLICT_SQL, params)))
+        return subscriber, bool(subscriber.created)
+
+    if connection.vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute(ON_DUPLICATE_KEY_SQL, params)
+            subscriber_id, created = cursor.lastrowid, cursor.rowcount == 1
+        return NewsletterSubscriber.objects.get(pk=subscriber_id), created
+
+    with transaction.atomic():
+        subscriber, created = NewsletterSubscriber.objects.select_for_update().get_or_create(
+            email=email, defaults={'name': name}
+        )
+        if not created:
+            subscriber.name = name or subscriber.name
+            if subscriber.status == SubscriberStatus.UNSUBSCRIBED:
+                subscriber.status = SubscriberStatus.PENDING
+            subscriber.save(update_fields=['name', 'status', 'updated_at'])
+    return subscriber, created
+
+
+def queue_confirmation_email(subscriber):
+    """Queue the double opt-in email with the subscriber's confirmation link."""
+    context = {'subscriber': subscriber, 'confirm_url': confirm_url(subscriber.pk)}
+    enqueue_email(EmailMessage(
+        subject='Confirm your Django Campus newsletter subscription',
+        body=render_to_string('emails/newsletter_confirmation.txt', context),
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@djangocampus.com'),
+        to=[subscriber.email],
+    ))
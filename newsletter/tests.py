@@ -1,3 +1,680 @@
-from django.test import TestCase
+import smtplib
+import socketserver
+import threading
+import time
+import tempfile
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core import mail
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.locmem import EmailBackend as LocmemBackend
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+
+from core.models import OutboxEmail
+
+from newsletter.campaigns import RateLimiter, send_campaign
+from newsletter.importers import import_subscribers
+from newsletter.models import Campaign, CampaignStatus, NewsletterSubscriber, SubscriberStatus
+from newsletter.tokens import (
+    make_confirm_token, make_unsubscribe_token, read_unsubscribe_token
+)
+
+
+@override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {'newsletter_ip': '2/min', 'newsletter_email': '1/hour'},
+})
+class SubscribeThrottleTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('newsletter:subscriber-list')
+
+    def test_burst_from_one_ip_is_rejected(self):
+        statuses = [
+            self.client.post(self.url, {'email': f'reader{index}@example.com'}).status_code
+            for index in range(3)
+        ]
+
+        self.assertEqual(statuses, [201, 201, 429])
+
+    def test_repeated_email_is_rejected(self):
+        self.client.post(self.url, {'email': 'reader@example.com'}, REMOTE_ADDR='10.0.0.1')
+
+        response = self.client.post(
+            self.url, {'email': 'reader@example.com'}, REMOTE_ADDR='10.0.0.2'
+        )
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+
+UNTHROTTLED = override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {'newsletter_ip': '1000/min', 'newsletter_email': '1000/min'},
+})
+
+
+@UNTHROTTLED
+class SubscribeUpsertTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('newsletter:subscriber-list')
+
+    def test_new_subscriber_is_upserted_and_sent_a_confirmation(self):
+        # The upsert, then the confirmation email queued in the outbox
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                self.url, {'email': ' Reader@Example.COM ', 'name': 'Ada'}
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['email'], 'reader@example.com')
+        self.assertEqual(response.data['name'], 'Ada')
+        self.assertEqual(response.data['status'], SubscriberStatus.PENDING)
+        queued = OutboxEmail.objects.get()
+        self.assertEqual(queued.to_email, 'reader@example.com')
+        self.assertIn('/api/subscribers/confirm/', queued.body)
+
+    def test_existing_subscriber_in_any_case_returns_200(self):
+        first = self.client.post(self.url, {'email': 'reader@example.com', 'name': 'Ada'})
+        NewsletterSubscriber.objects.update(status=SubscriberStatus.ACTIVE)
+
+        # Already confirmed: nothing to mail, a single statement
+        with self.assertNumQueries(1):
+            again = self.client.post(self.url, {'email': 'READER@example.com'})
+
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.data['id'], first.data['id'])
+        # No name given: the one on record is kept
+        self.assertEqual(again.data['name'], 'Ada')
+        self.assertEqual(NewsletterSubscriber.objects.count(), 1)
+
+    def test_resubscribing_with_a_name_updates_it(self):
+        self.client.post(self.url, {'email': 'reader@example.com'})
+
+        response = self.client.post(
+            self.url, {'email': 'reader@example.com', 'name': 'Ada Lovelace'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        subscriber = NewsletterSubscriber.objects.get()
+        self.assertEqual(subscriber.name, 'Ada Lovelace')
+        self.assertGreater(subscriber.updated_at, subscriber.created_at)
+
+    def test_invalid_email_is_rejected(self):
+        response = self.client.post(self.url, {'email': 'not-an-email'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(NewsletterSubscriber.objects.exists())
+
+
+@UNTHROTTLED
+class ParallelSubscribeTests(TransactionTestCase):
+    attempts = 40
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('In-memory SQLite cannot serve concurrent connections')
+        cache.clear()
+
+    def test_parallel_duplicates_create_one_subscriber(self):
+        url = reverse('newsletter:subscriber-list')
+        spellings = ['reader@example.com', 'Reader@Example.com', 'READER@EXAMPLE.COM']
+
+        def subscribe(index):
+            try:
+                response = APIClient(REMOTE_ADDR=f'10.0.1.{index}').post(
+                    url, {'email': spellings[index % len(spellings)]}, format='json'
+                )
+                return response.status_code, response.data['id']
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(subscribe, range(self.attempts)))
+
+        statuses = [status for status, _ in results]
+        self.assertEqual(statuses.count(201), 1)
+        self.assertEqual(statuses.count(200), self.attempts - 1)
+        self.assertEqual(len({subscriber_id for _, subscriber_id in results}), 1)
+        self.assertEqual(
+            list(NewsletterSubscriber.objects.values_list('email', flat=True)),
+            ['reader@example.com'],
+        )
+
+
+class SubscriptionLinkTests(APITestCase):
+    def setUp(self):
+        self.subscriber = NewsletterSubscriber.objects.create(email='reader@example.com')
+
+    def confirm_url(self, token):
+        return reverse('newsletter:subscriber-confirm', args=[token])
+
+    def unsubscribe_url(self, token):
+        return reverse('newsletter:subscriber-unsubscribe', args=[token])
+
+    def test_confirmation_link_activates_a_pending_subscriber(self):
+        response = self.client.post(self.confirm_url(make_confirm_token(self.subscriber.pk)))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], SubscriberStatus.ACTIVE)
+        self.subscriber.refresh_from_db()
+        self.assertEqual(self.subscriber.status, SubscriberStatus.ACTIVE)
+
+    def test_confirmation_link_does_not_resubscribe(self):
+        self.subscriber.status = SubscriberStatus.UNSUBSCRIBED
+        self.subscriber.save()
+
+        response = self.client.post(self.confirm_url(make_confirm_token(self.subscriber.pk)))
+
+        self.assertEqual(response.data['status'], SubscriberStatus.UNSUBSCRIBED)
+
+    def test_get_on_confirmation_link_changes_nothing(self):
+        url = self.confirm_url(make_confirm_token(self.subscriber.pk))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.subscriber.refresh_from_db()
+        self.assertEqual(self.subscriber.status, SubscriberStatus.PENDING)
+
+    def test_browser_can_confirm_through_the_link_page(self):
+        url = self.confirm_url(make_confirm_token(self.subscriber.pk))
+
+        page = self.client.get(url, HTTP_ACCEPT='text/html')
+
+        self.assertEqual(page.status_code, 200)
+        self.assertContains(page, '<form method="post">')
+        self.assertContains(page, 'Confirm subscription</button>')
+
+        response = self.client.post(url, {}, format='multipart', HTTP_ACCEPT='text/html')
+
+        self.assertContains(response, 'Your subscription is confirmed.')
+        self.subscriber.refresh_from_db()
+        self.assertEqual(self.subscriber.status, SubscriberStatus.ACTIVE)
+
+    def test_link_page_for_a_bad_link_has_no_button(self):
+        page = self.client.get(self.unsubscribe_url('forged'), HTTP_ACCEPT='text/html')
+
+        self.assertContains(page, 'This link is invalid or has expired.', status_code=400)
+        self.assertNotContains(page, '<form', status_code=400)
+
+    @override_settings(NEWSLETTER_CONFIRM_MAX_AGE=60)
+    def test_expired_confirmation_link_is_rejected(self):
+        with mock.patch('django.core.signing.time.time', return_value=time.time() - 120):
+            token = make_confirm_token(self.subscriber.pk)
+
+        response = self.client.post(self.confirm_url(token))
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_forged_or_misused_tokens_are_rejected(self):
+        unsubscribe_token = make_unsubscribe_token(self.subscriber.pk)
+        forged = unsubscribe_token.replace(str(self.subscriber.pk), str(self.subscriber.pk + 1), 1)
+
+        self.assertEqual(self.client.post(self.confirm_url(unsubscribe_token)).status_code, 400)
+        self.assertEqual(self.client.post(self.unsubscribe_url(forged)).status_code, 400)
+        self.subscriber.refresh_from_db()
+        self.assertEqual(self.subscriber.status, SubscriberStatus.PENDING)
+
+    def test_one_click_unsubscribe_is_a_single_update(self):
+        url = self.unsubscribe_url(make_unsubscribe_token(self.subscriber.pk))
+
+        with self.assertNumQueries(1):
+            response = self.client.post(url, 'List-Unsubscribe=One-Click',
+                                        content_type='application/x-www-form-urlencoded')
+
+        self.assertEqual(response.status_code, 200)
+        self.subscriber.refresh_from_db()
+        self.assertEqual(self.subscriber.status, SubscriberStatus.UNSUBSCRIBED)
+
+    def test_browser_can_unsubscribe_through_the_link_page(self):
+        url = self.unsubscribe_url(make_unsubscribe_token(self.subscriber.pk))
+
+        self.assertContains(self.client.get(url, HTTP_ACCEPT='text/html'), 'Unsubscribe</button>')
+        response = self.client.post(url, {}, format='multipart', HTTP_ACCEPT='text/html')
+
+        self.assertContains(response, 'You have been unsubscribed from the newsletter.')
+        self.subscriber.refresh_from_db()
+        self.assertEqual(self.subscriber.status, SubscriberStatus.UNSUBSCRIBED)
+
+    def test_get_on_unsubscribe_link_changes_nothing(self):
+        url = self.unsubscribe_url(make_unsubscribe_token(self.subscriber.pk))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.subscriber.refresh_from_db()
+        self.assertEqual(self.subscriber.status, SubscriberStatus.PENDING)
+
+    @UNTHROTTLED
+    def test_subscribing_again_after_unsubscribing_needs_confirmation(self):
+        cache.clear()
+        self.subscriber.status = SubscriberStatus.UNSUBSCRIBED
+        self.subscriber.save()
+
+        response = self.client.post(
+            reverse('newsletter:subscriber-list'), {'email': 'Reader@example.com'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], SubscriberStatus.PENDING)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+    def test_subscriber_detail_is_not_public(self):
+        url = reverse('newsletter:subscriber-detail', args=[self.subscriber.pk])
+
+        self.assertEqual(self.client.delete(url).status_code, 403)
+        self.assertTrue(NewsletterSubscriber.objects.filter(pk=self.subscriber.pk).exists())
+
+
+class FlakyBackend(LocmemBackend):
+    """Locmem backend whose "server" drops every message to ``failing``."""
+    failing = set()
+
+    def send_messages(self, messages):
+        if any(message.to[0] in self.failing for message in messages):
+            raise ConnectionResetError('connection reset by peer')
+        return super().send_messages(messages)
+
+
+class RejectingBackend(LocmemBackend):
+    """Locmem backend whose "server" answers DATA for ``rejected`` with ``code``."""
+    rejected = set()
+    code = 554
+
+    def send_messages(self, messages):
+        if any(message.to[0] in self.rejected for message in messages):
+            raise smtplib.SMTPDataError(self.code, b'Message rejected')
+        return super().send_messages(messages)
+
+
+class CountingBackend(BaseEmailBackend):
+    sent = 0
+
+    def send_messages(self, messages):
+        for message in messages:
+            message.message()
+        CountingBackend.sent += len(messages)
+        return len(messages)
+
+
+class SMTPSession(socketserver.StreamRequestHandler):
+    """The few SMTP commands Django's backend uses, answered blindly."""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply('220 localhost test server')
+        while line := self.rfile.readline():
+            command = line.decode().strip().upper()
+            if command.startswith('EHLO'):
+                self.reply('250 localhost')
+            elif command == 'DATA':
+                self.reply('354 end with .')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                with server.lock:
+                    server.messages += 1
+                self.reply('250 queued')
+            elif command == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+
+class TestSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPSession)
+        self.lock = threading.Lock()
+        self.connections = self.messages = 0
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class CampaignSendingTests(TestCase):
+    def setUp(self):
+        self.subscribers = NewsletterSubscriber.objects.bulk_create([
+            NewsletterSubscriber(
+                email=f'reader{index}@example.com', name=f'Reader {index}',
+                status=SubscriberStatus.ACTIVE,
+            )
+            for index in range(7)
+        ])
+        self.campaign = Campaign.objects.create(
+            subject='News for {{ subscriber.name }}',
+            body_text='Hi {{ subscriber.name }} & friends',
+            body_html='<p>Hi {{ subscriber.name }} &amp; friends</p>',
+        )
+
+    def recipients(self):
+        return sorted(message.to[0] for message in mail.outbox)
+
+    def test_sends_personalised_messages_to_every_subscriber(self):
+        totals = send_campaign(self.campaign.pk, chunk_size=3, connections=2)
+
+        self.assertEqual(totals, {'sent': 7, 'failed': 0, 'skipped': 0})
+        self.assertEqual(self.recipients(), sorted(s.email for s in self.subscribers))
+        message = next(m for m in mail.outbox if m.to == ['reader3@example.com'])
+        self.assertEqual(message.subject, 'News for Reader 3')
+        self.assertEqual(message.body, 'Hi Reader 3 & friends')
+        self.assertEqual(message.alternatives[0][0], '<p>Hi Reader 3 &amp; friends</p>')
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, CampaignStatus.SENT)
+        self.assertEqual(self.campaign.sent_count, 7)
+        self.assertEqual(self.campaign.last_subscriber_id, self.subscribers[-1].pk)
+
+    @override_settings(NEWSLETTER_BASE_URL='https://campus.example/')
+    def test_only_active_subscribers_get_a_one_click_unsubscribe_link(self):
+        NewsletterSubscriber.objects.filter(pk=self.subscribers[0].pk).update(
+            status=SubscriberStatus.PENDING
+        )
+        NewsletterSubscriber.objects.filter(pk=self.subscribers[1].pk).update(
+            status=SubscriberStatus.UNSUBSCRIBED
+        )
+        self.campaign.body_text = 'Leave: {{ unsubscribe_url }}'
+        self.campaign.save()
+
+        totals = send_campaign(self.campaign.pk, chunk_size=3, connections=2)
+
+        self.assertEqual(totals['sent'], 5)
+        self.assertNotIn('reader0@example.com', self.recipients())
+        self.assertNotIn('reader1@example.com', self.recipients())
+        message = next(m for m in mail.outbox if m.to == ['reader3@example.com'])
+        self.assertEqual(message.extra_headers['List-Unsubscribe-Post'], 'List-Unsubscribe=One-Click')
+        link = message.extra_headers['List-Unsubscribe'].strip('<>')
+        self.assertTrue(link.startswith('https://campus.example/api/subscribers/unsubscribe/'))
+        self.assertEqual(message.body, f'Leave: {link}')
+        token = link.rstrip('/').rsplit('/', 1)[1]
+        self.assertEqual(read_unsubscribe_token(token), self.subscribers[3].pk)
+
+    @override_settings(EMAIL_BACKEND='newsletter.tests.FlakyBackend')
+    def test_resumes_after_server_failure_without_double_sending(self):
+        FlakyBackend.failing = {'reader4@example.com'}
+        self.addCleanup(setattr, FlakyBackend, 'failing', set())
+
+        with self.assertRaises(CommandError):
+            call_command('send_campaign', self.campaign.pk, chunk_size=3, connections=1, stdout=StringIO())
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, CampaignStatus.PAUSED)
+        self.assertEqual(self.recipients(), [f'reader{index}@example.com' for index in range(4)])
+
+        FlakyBackend.failing = set()
+        call_command('send_campaign', self.campaign.pk, chunk_size=3, stdout=StringIO())
+
+        self.assertEqual(self.recipients(), sorted(s.email for s in self.subscribers))
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.status, self.campaign.sent_count), (CampaignStatus.SENT, 7))
+
+    @override_settings(EMAIL_BACKEND='newsletter.tests.RejectingBackend')
+    def test_rejected_message_fails_without_stopping_the_campaign(self):
+        RejectingBackend.rejected = {'reader4@example.com'}
+        self.addCleanup(setattr, RejectingBackend, 'rejected', set())
+
+        with self.assertLogs('newsletter.campaigns', 'WARNING'):
+            totals = send_campaign(self.campaign.pk, chunk_size=3, connections=1)
+
+        self.assertEqual(totals, {'sent': 6, 'failed': 1, 'skipped': 0})
+        self.assertNotIn('reader4@example.com', self.recipients())
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, CampaignStatus.SENT)
+
+    @override_settings(EMAIL_BACKEND='newsletter.tests.RejectingBackend')
+    def test_temporary_rejection_pauses_the_campaign(self):
+        RejectingBackend.rejected = {'reader4@example.com'}
+        self.addCleanup(setattr, RejectingBackend, 'rejected', set())
+        self.enterContext(mock.patch.object(RejectingBackend, 'code', 451))
+
+        with self.assertRaises(CommandError):
+            call_command('send_campaign', self.campaign.pk, chunk_size=3, connections=1, stdout=StringIO())
+
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, CampaignStatus.PAUSED)
+
+    def crash_during_first_chunk(self):
+        # What a run killed while sending subscribers 1-3 leaves behind
+        Campaign.objects.filter(pk=self.campaign.pk).update(
+            status=CampaignStatus.SENDING,
+            claimed_through_id=self.subscribers[2].pk,
+            lease_expires_at=timezone.now() - timedelta(seconds=1),
+        )
+
+    def test_skips_chunk_of_a_crashed_run(self):
+        self.crash_during_first_chunk()
+
+        totals = send_campaign(self.campaign.pk, chunk_size=3)
+
+        self.assertEqual(totals, {'sent': 4, 'failed': 0, 'skipped': 3})
+        self.assertEqual(self.recipients(), sorted(s.email for s in self.subscribers[3:]))
+
+    def test_resend_interrupted_sends_chunk_of_a_crashed_run(self):
+        self.crash_during_first_chunk()
+
+        totals = send_campaign(self.campaign.pk, chunk_size=3, resend_interrupted=True)
+
+        self.assertEqual(totals, {'sent': 7, 'failed': 0, 'skipped': 0})
+
+    def test_refuses_campaign_held_by_another_run_or_already_sent(self):
+        Campaign.objects.filter(pk=self.campaign.pk).update(
+            status=CampaignStatus.SENDING, lease_expires_at=timezone.now() + timedelta(minutes=5)
+        )
+        with self.assertRaisesMessage(CommandError, 'being sent by another run'):
+            call_command('send_campaign', self.campaign.pk, stdout=StringIO())
+
+        Campaign.objects.filter(pk=self.campaign.pk).update(status=CampaignStatus.SENT)
+        with self.assertRaisesMessage(CommandError, 'already sent'):
+            call_command('send_campaign', self.campaign.pk, stdout=StringIO())
+        self.assertEqual(mail.outbox, [])
+
+    def test_rate_limit_spaces_messages(self):
+        limiter = RateLimiter(100)
+        start = time.monotonic()
+        for _ in range(11):
+            limiter.wait()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+    def test_reuses_a_small_pool_of_smtp_connections(self):
+        server = TestSMTPServer()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        with override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1', EMAIL_PORT=server.server_address[1],
+            EMAIL_USE_TLS=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        ):
+            totals = send_campaign(self.campaign.pk, chunk_size=2, connections=2)
+
+        self.assertEqual(totals['sent'], 7)
+        self.assertEqual(server.messages, 7)
+        self.assertLessEqual(server.connections, 2)
+
+    @override_settings(EMAIL_BACKEND='newsletter.tests.CountingBackend')
+    def test_memory_stays_flat_for_a_large_list(self):
+        NewsletterSubscriber.objects.bulk_create([
+            NewsletterSubscriber(email=f'bulk{index}@example.com', status=SubscriberStatus.ACTIVE)
+            for index in range(6000)
+        ], batch_size=2000)
+        CountingBackend.sent = 0
+
+        tracemalloc.start()
+        try:
+            send_campaign(self.campaign.pk, chunk_size=200, connections=2)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(CountingBackend.sent, 6007)
+        # One chunk's messages at a time: all 6k would be ~6 MB
+        self.assertLess(peak, 3 * 1024 * 1024)
+
+
+class SubscriberImportExportTests(TestCase):
+    def setUp(self):
+        NewsletterSubscriber.objects.create(
+            email='existing@example.com', name='Existing', status=SubscriberStatus.UNSUBSCRIBED
+        )
+        self.directory = Path(self.enterContext(tempfile.TemporaryDirectory()))
+
+    def write(self, name, content):
+        path = self.directory / name
+        path.write_text(content, encoding='utf-8')
+        return str(path)
+
+    def test_csv_import_normalizes_and_skips_known_addresses(self):
+        path = self.write('subscribers.csv', (
+            'Name,Email\n'
+            'Ada, Ada@Example.com \n'
+            'Ada again,ada@EXAMPLE.com\n'
+            'Existing,EXISTING@example.com\n'
+            'Broken,not-an-email\n'
+            '\n'
+            'Grace,grace@example.com\n'
+        ))
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command('import_subscribers', path, stdout=stdout, stderr=stderr)
+
+        self.assertIn('Imported 2 subscriber(s) from 5 row(s)', stdout.getvalue())
+        self.assertIn('Line 5: Email:', stderr.getvalue())
+        self.assertEqual(
+            list(NewsletterSubscriber.objects.order_by('email').values_list('email', 'name', 'status')),
+            [
+                ('ada@example.com', 'Ada', SubscriberStatus.ACTIVE),
+                ('existing@example.com', 'Existing', SubscriberStatus.UNSUBSCRIBED),
+                ('grace@example.com', 'Grace', SubscriberStatus.ACTIVE),
+            ],
+        )
+
+    def test_ndjson_import_reads_status_and_reports_bad_lines(self):
+        path = self.write('subscribers.ndjson', (
+            '{"email": "ada@example.com", "status": "pending"}\n'
+            '{"email": "grace@example.com"\n'
+            '["grace@example.com"]\n'
+            '{"email": "alan@example.com", "status": "gone"}\n'
+        ))
+
+        call_command('import_subscribers', path, stdout=StringIO(), stderr=StringIO())
+
+        self.assertEqual(
+            NewsletterSubscriber.objects.get(email='ada@example.com').status,
+            SubscriberStatus.PENDING,
+        )
+        self.assertEqual(NewsletterSubscriber.objects.count(), 2)
+
+    def test_import_inserts_in_chunks(self):
+        rows = ''.join(f'reader{index}@example.com\n' for index in range(25))
+
+        with mock.patch(
+            'newsletter.models.NewsletterSubscriber.objects.bulk_create',
+            wraps=NewsletterSubscriber.objects.bulk_create,
+        ) as bulk_create:
+            result = import_subscribers(BytesIO(f'Email\n{rows}'.encode()), chunk_size=10)
+
+        self.assertEqual(result.created, 25)
+        self.assertEqual(bulk_create.call_count, 3)
+
+    def test_missing_email_column_fails(self):
+        path = self.write('subscribers.csv', 'Name\nAda\n')
+
+        with self.assertRaisesMessage(CommandError, 'Missing required column: Email'):
+            call_command('import_subscribers', path, stdout=StringIO())
+
+    def test_export_round_trips_through_import(self):
+        NewsletterSubscriber.objects.create(email='ada@example.com', name='Ada, Countess')
+        for file_format in ('csv', 'ndjson'):
+            path = str(self.directory / f'export.{file_format}')
+            call_command('export_subscribers', path, stdout=StringIO())
+            exported = NewsletterSubscriber.objects.order_by('email').values_list(
+                'email', 'name', 'status'
+            )
+            expected = list(exported)
+            NewsletterSubscriber.objects.all().delete()
+
+            call_command('import_subscribers', path, stdout=StringIO())
+
+            self.assertEqual(list(exported), expected)
+
+    def test_export_filters_by_status_to_stdout(self):
+        NewsletterSubscriber.objects.create(email='ada@example.com', status=SubscriberStatus.ACTIVE)
+        stdout = StringIO()
+
+        call_command('export_subscribers', '--format', 'ndjson', '--status', 'active', stdout=stdout)
+
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn('"email": "ada@example.com"', lines[0])
+
+
+class SubscriberAdminTransferTests(TestCase):
+    def setUp(self):
+        admin_user = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin_user)
+        NewsletterSubscriber.objects.create(email='ada@example.com', name='Ada')
+        NewsletterSubscriber.objects.create(email='grace@example.com')
+
+    def export(self, action):
+        response = self.client.post(
+            reverse('admin:newsletter_newslettersubscriber_changelist'),
+            {
+                'action': action,
+                '_selected_action': list(
+                    NewsletterSubscriber.objects.values_list('pk', flat=True)
+                ),
+            },
+        )
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode().splitlines()
+
+    def test_export_actions_stream_csv_and_ndjson(self):
+        csv_lines = self.export('export_as_csv')
+        ndjson_lines = self.export('export_as_ndjson')
+
+        self.assertEqual(csv_lines[0], 'Email,Name,Status,Subscribed At')
+        self.assertTrue(csv_lines[1].startswith('ada@example.com,Ada,pending,'))
+        self.assertEqual(len(ndjson_lines), 2)
+        self.assertIn('"email": "grace@example.com", "name": ""', ndjson_lines[1])
+
+    def test_import_view_uses_default_status(self):
+        upload = SimpleUploadedFile(
+            'subscribers.jsonl', b'{"email": "Alan@Example.com", "name": "Alan"}\n'
+        )
+
+        response = self.client.post(
+            reverse('admin:newsletter_newslettersubscriber_import'),
+            {'subscribers_file': upload, 'default_status': SubscriberStatus.PENDING},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['result'].created, 1)
+        self.assertEqual(
+            NewsletterSubscriber.objects.get(email='alan@example.com').status,
+            SubscriberStatus.PENDING,
+        )
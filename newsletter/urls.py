@@ -1,9 +1,16 @@
 from django.urls import path
-from .views import NewsletterSubscriberListCreateView, NewsletterSubscriberDetailView
+from .views import (
+    NewsletterConfirmView,
+    NewsletterSubscriberDetailView,
+    NewsletterSubscriberListCreateView,
+    NewsletterUnsubscribeView,
+)
 
 app_name = 'newsletter'
 
 urlpatterns = [
     path('api/subscribers/', NewsletterSubscriberListCreateView.as_view(), name='subscriber-list'),
     path('api/subscribers/<int:pk>/', NewsletterSubscriberDetailView.as_view(), name='subscriber-detail'),
+    path('api/subscribers/confirm/<str:token>/', NewsletterConfirmView.as_view(), name='subscriber-confirm'),
+    path('api/subscribers/unsubscribe/<str:token>/', NewsletterUnsubscribeView.as_view(), name='subscriber-unsubscribe'),
 ]
\ No newline at end of file
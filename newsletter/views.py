@@ -1,15 +1,31 @@
-from rest_framework import generics
-from rest_framework.permissions import AllowAny
+from django.utils import timezone
+from rest_framework import generics, status
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
-from .models import NewsletterSubscriber
+from core.renderers import EmailLinkPageRenderer, TimedJSONRenderer
+from core.throttling import EmailTokenBucketThrottle, IPTokenBucketThrottle
+
+from .models import NewsletterSubscriber, SubscriberStatus
 from .serializers import NewsletterSubscriberSerializer
+from .subscriptions import queue_confirmation_email, subscribe
+from .tokens import BadToken, read_confirm_token, read_unsubscribe_token
 
 
 @extend_schema_view(
     post=extend_schema(
         summary="Subscribe to newsletter",
-        description="Subscribe to the newsletter with email and optional name",
+        description=(
+            "Subscribe to the newsletter with email and optional name. Idempotent: "
+            "an address that is already subscribed (in any letter case) returns 200 "
+            "with the existing subscriber, updating its name if one is given; a new "
+            "subscriber returns 201. Pending subscribers (new, or signing up again "
+            "after unsubscribing) are emailed a confirmation link."
+        ),
+        responses={200: NewsletterSubscriberSerializer, 201: NewsletterSubscriberSerializer},
         tags=["Newsletter"]
     ),
     get=extend_schema(
@@ -22,6 +38,21 @@ class NewsletterSubscriberListCreateView(generics.ListCreateAPIView):
     queryset = NewsletterSubscriber.objects.all()
     serializer_class = NewsletterSubscriberSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = 'newsletter'
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        subscriber, created = subscribe(
+            serializer.validated_data['email'], serializer.validated_data.get('name')
+        )
+        if subscriber.status == SubscriberStatus.PENDING:
+            queue_confirmation_email(subscriber)
+        return Response(
+            self.get_serializer(subscriber).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
 
 
 @extend_schema_view(
@@ -31,12 +62,146 @@ class NewsletterSubscriberListCreateView(generics.ListCreateAPIView):
         tags=["Newsletter"]
     ),
     delete=extend_schema(
-        summary="Unsubscribe from newsletter",
-        description="Remove a subscriber from the newsletter list",
+        summary="Delete subscriber",
+        description=(
+            "Remove a subscriber from the newsletter list (admin only). "
+            "Subscribers leave through their signed unsubscribe link instead."
+        ),
         tags=["Newsletter"]
     )
 )
 class NewsletterSubscriberDetailView(generics.RetrieveDestroyAPIView):
     queryset = NewsletterSubscriber.objects.all()
     serializer_class = NewsletterSubscriberSerializer
+    permission_classes = [IsAdminUser]
+
+
+INVALID_LINK = {'error': 'This link is invalid or has expired.'}
+
+# What a confirmation link leaves the subscriber as, in words
+CONFIRM_RESULTS = {
+    SubscriberStatus.ACTIVE: 'Your subscription is confirmed.',
+    SubscriberStatus.UNSUBSCRIBED: (
+        'This address has unsubscribed since. Subscribe again to receive the newsletter.'
+    ),
+}
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Check confirmation link",
+        description=(
+            "Validate the signed link of the confirmation email without acting on "
+            "it, so link scanners cannot confirm anyone. POST to the same URL to "
+            "confirm; browsers (Accept: text/html) get a page with a button doing that."
+        ),
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+        tags=["Newsletter"]
+    ),
+    post=extend_schema(
+        summary="Confirm subscription",
+        description="Activate a pending subscriber from the signed link of the confirmation email",
+        request=None,
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+        tags=["Newsletter"]
+    ),
+)
+class NewsletterConfirmView(APIView):
+    """
+    API view confirming a subscription from its signed token.
+    """
     permission_classes = [AllowAny]
+    # Opened from an email: no session, and no CSRF token to check
+    authentication_classes = []
+    # Browsers get a page with a button that POSTs back here
+    renderer_classes = [TimedJSONRenderer, EmailLinkPageRenderer]
+    link_title = 'Confirm your subscription'
+    link_action = 'Confirm subscription'
+
+    def get(self, request, token):
+        try:
+            read_confirm_token(token)
+        except BadToken:
+            return Response(INVALID_LINK, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'detail': 'Confirm that you want to receive the Django Campus newsletter. '
+                      'Send a POST request to this URL to confirm.'
+        })
+
+    def post(self, request, token):
+        try:
+            subscriber_id = read_confirm_token(token)
+        except BadToken:
+            return Response(INVALID_LINK, status=status.HTTP_400_BAD_REQUEST)
+        confirmed = NewsletterSubscriber.objects.filter(
+            pk=subscriber_id, status=SubscriberStatus.PENDING
+        ).update(status=SubscriberStatus.ACTIVE, updated_at=timezone.now())
+        if confirmed:
+            current = SubscriberStatus.ACTIVE
+        else:
+            # Opened twice, or the subscriber left or was removed since
+            current = NewsletterSubscriber.objects.filter(pk=subscriber_id).values_list(
+                'status', flat=True
+            ).first()
+            if current is None:
+                return Response(INVALID_LINK, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'status': current, 'detail': CONFIRM_RESULTS.get(current, '')})
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Check unsubscribe link",
+        description=(
+            "Validate a signed unsubscribe link without acting on it, so link "
+            "scanners cannot unsubscribe anyone. POST to the same URL to unsubscribe; "
+            "browsers (Accept: text/html) get a page with a button doing that."
+        ),
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+        tags=["Newsletter"]
+    ),
+    post=extend_schema(
+        summary="Unsubscribe from newsletter",
+        description=(
+            "One-click unsubscribe (RFC 8058): the target of the List-Unsubscribe "
+            "header of every campaign email. Idempotent."
+        ),
+        request=None,
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+        tags=["Newsletter"]
+    ),
+)
+class NewsletterUnsubscribeView(APIView):
+    """
+    API view unsubscribing the subscriber named by a signed token.
+    """
+    permission_classes = [AllowAny]
+    # Mail providers POST here without cookies or a CSRF token
+    authentication_classes = []
+    # Browsers get a page with a button that POSTs back here
+    renderer_classes = [TimedJSONRenderer, EmailLinkPageRenderer]
+    link_title = 'Unsubscribe'
+    link_action = 'Unsubscribe'
+
+    def get(self, request, token):
+        try:
+            read_unsubscribe_token(token)
+        except BadToken:
+            return Response(INVALID_LINK, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'detail': 'Stop receiving the Django Campus newsletter. '
+                      'Send a POST request to this URL to unsubscribe.'
+        })
+
+    def post(self, request, token):
+        try:
+            subscriber_id = read_unsubscribe_token(token)
+        except BadToken:
+            return Response(INVALID_LINK, status=status.HTTP_400_BAD_REQUEST)
+        # The signature was checked without the database: one UPDATE by pk
+        NewsletterSubscriber.objects.filter(pk=subscriber_id).update(
+            status=SubscriberStatus.UNSUBSCRIBED, updated_at=timezone.now()
+        )
+        return Response({
+            'status': SubscriberStatus.UNSUBSCRIBED,
+            'detail': 'You have been unsubscribed from the newsletter.',
+        })
@@ -1,4 +1,6 @@
 from django.contrib import admin
+
+from core.forms import INGESTED_IMAGE_OVERRIDES
 from .models import (
     PartnerTier, PartnerType, Partner,
     ContributorRole, Contributor,
@@ -21,6 +23,7 @@ class PartnerTypeAdmin(admin.ModelAdmin):
 
 @admin.register(Partner)
 class PartnerAdmin(admin.ModelAdmin):
+    formfield_overrides = INGESTED_IMAGE_OVERRIDES
     list_display = ['name', 'tier', 'partner_type', 'partnership_date', 'is_active']
     list_filter = ['tier', 'partner_type', 'is_active']
     search_fields = ['name', 'description']
@@ -35,6 +38,7 @@ class ContributorRoleAdmin(admin.ModelAdmin):
 
 @admin.register(Contributor)
 class ContributorAdmin(admin.ModelAdmin):
+    formfield_overrides = INGESTED_IMAGE_OVERRIDES
     list_display = ['full_name', 'role', 'is_active']
     list_filter = ['role', 'is_active']
     search_fields = ['full_name', 'bio', 'achievements']
@@ -48,6 +52,7 @@ class SponsorLevelAdmin(admin.ModelAdmin):
 
 @admin.register(Sponsor)
 class SponsorAdmin(admin.ModelAdmin):
+    formfield_overrides = INGESTED_IMAGE_OVERRIDES
     list_display = ['name', 'level', 'sponsored_since', 'is_active']
     list_filter = ['level', 'is_active']
     search_fields = ['name', 'description']
@@ -56,6 +61,7 @@ class SponsorAdmin(admin.ModelAdmin):
 
 @admin.register(Supporter)
 class SupporterAdmin(admin.ModelAdmin):
+    formfield_overrides = INGESTED_IMAGE_OVERRIDES
     list_display = ['name', 'contribution_type', 'support_date', 'is_active']
     list_filter = ['contribution_type', 'is_active']
     search_fields = ['name', 'description']
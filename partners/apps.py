@@ -4,3 +4,28 @@ from django.apps import AppConfig
 class PartnersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "partners"
+
+    def ready(self):
+        from core.cache_versions import track_collection
+        from core.images import register_image_variants
+        from partners.models import (
+            Contributor,
+            ContributorRole,
+            Partner,
+            PartnerTier,
+            PartnerType,
+            Sponsor,
+            SponsorLevel,
+            Supporter,
+        )
+
+        # A collection also depends on the lookup tables it embeds
+        track_collection('partners', Partner, PartnerTier, PartnerType)
+        track_collection('contributors', Contributor, ContributorRole)
+        track_collection('sponsors', Sponsor, SponsorLevel)
+        track_collection('supporters', Supporter)
+
+        register_image_variants(Partner, 'logo')
+        register_image_variants(Contributor, 'photo')
+        register_image_variants(Sponsor, 'logo')
+        register_image_variants(Supporter, 'logo')
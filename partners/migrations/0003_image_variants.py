@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("partners", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contributor",
+            name="photo_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="partner",
+            name="logo_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="sponsor",
+            name="logo_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="supporter",
+            name="logo_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -36,6 +36,7 @@ class Partner(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(help_text="Short description of what the partner does")
     logo = models.ImageField(upload_to='partners/logos/', blank=True, null=True)
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
     website = models.URLField(blank=True, null=True)
     tier = models.ForeignKey(
         PartnerTier,
@@ -91,6 +92,7 @@ class Contributor(models.Model):
         null=True
     )
     photo = models.ImageField(upload_to='contributors/photos/', blank=True, null=True)
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(help_text="Short bio about the contributor", blank=True, null=True)
     achievements = models.CharField(
         max_length=255,
@@ -135,6 +137,7 @@ class Sponsor(models.Model):
     """Financial sponsors who support the initiative"""
     name = models.CharField(max_length=100)
     logo = models.ImageField(upload_to='sponsors/logos/', blank=True, null=True)
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
     website = models.URLField(blank=True, null=True)
     level = models.ForeignKey(
         SponsorLevel,
@@ -161,6 +164,7 @@ class Supporter(models.Model):
     """Recent supporters who contribute in various ways"""
     name = models.CharField(max_length=100)
     logo = models.ImageField(upload_to='supporters/logos/', blank=True, null=True)
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
     website = models.URLField(blank=True, null=True)
     contribution_type = models.CharField(
         max_length=100,
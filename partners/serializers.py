@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from core.images import ImageSrcsetField
 from .models import (
     PartnerTier, PartnerType, Partner,
     ContributorRole, Contributor,
@@ -20,6 +22,7 @@ class PartnerTypeSerializer(serializers.ModelSerializer):
 
 
 class PartnerSerializer(serializers.ModelSerializer):
+    logo_srcset = ImageSrcsetField(source='logo_variants')
     tier_name = serializers.CharField(source='tier.name', read_only=True)
     tier_badge_color = serializers.CharField(
         source='tier.badge_color',
@@ -33,7 +36,7 @@ class PartnerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Partner
         fields = [
-            'id', 'name', 'description', 'logo', 'website',
+            'id', 'name', 'description', 'logo', 'logo_srcset', 'website',
             'tier', 'tier_name', 'tier_badge_color',
             'partner_type', 'partner_type_name',
             'partnership_date', 'is_active'
@@ -47,6 +50,7 @@ class ContributorRoleSerializer(serializers.ModelSerializer):
 
 
 class ContributorSerializer(serializers.ModelSerializer):
+    photo_srcset = ImageSrcsetField(source='photo_variants')
     role_name = serializers.CharField(source='role.name', read_only=True)
     role_badge_color = serializers.CharField(
         source='role.badge_color',
@@ -57,7 +61,7 @@ class ContributorSerializer(serializers.ModelSerializer):
         model = Contributor
         fields = [
             'id', 'full_name', 'role', 'role_name', 'role_badge_color',
-            'photo', 'bio', 'achievements', 'linkedin', 'github',
+            'photo', 'photo_srcset', 'bio', 'achievements', 'linkedin', 'github',
             'twitter', 'website', 'email', 'is_active'
         ]
 
@@ -69,6 +73,7 @@ class SponsorLevelSerializer(serializers.ModelSerializer):
 
 
 class SponsorSerializer(serializers.ModelSerializer):
+    logo_srcset = ImageSrcsetField(source='logo_variants')
     level_name = serializers.CharField(source='level.name', read_only=True)
     level_badge_color = serializers.CharField(
         source='level.badge_color',
@@ -78,16 +83,18 @@ class SponsorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Sponsor
         fields = [
-            'id', 'name', 'logo', 'website', 'level',
+            'id', 'name', 'logo', 'logo_srcset', 'website', 'level',
             'level_name', 'level_badge_color', 'description',
             'sponsored_since', 'is_active'
         ]
 
 
 class SupporterSerializer(serializers.ModelSerializer):
+    logo_srcset = ImageSrcsetField(source='logo_variants')
+
     class Meta:
         model = Supporter
         fields = [
-            'id', 'name', 'logo', 'website', 'contribution_type',
+            'id', 'name', 'logo', 'logo_srcset', 'website', 'contribution_type',
             'description', 'support_date', 'is_active'
         ]
@@ -1,3 +1,46 @@
-from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from partners.models import Sponsor, SponsorLevel
+
+
+class SponsorConditionalGetTests(APITestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.level = SponsorLevel.objects.create(name='Gold')
+            Sponsor.objects.create(name='Acme', level=self.level)
+        self.url = reverse('sponsor-list')
+
+    def test_unchanged_list_returns_304(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_sponsor_level_change_invalidates_list(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.level.name = 'Platinum'
+            self.level.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['level_name'], 'Platinum')
+
+    def test_sponsor_level_change_purges_cached_sponsor_responses(self):
+        detail_url = reverse('sponsor-detail', args=[Sponsor.objects.get().pk])
+        self.client.get(detail_url, HTTP_ACCEPT='application/json')
+        self.assertEqual(
+            self.client.get(detail_url, HTTP_ACCEPT='application/json')['X-Cache'], 'HIT'
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.level.name = 'Platinum'
+            self.level.save()
+        response = self.client.get(detail_url, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['level_name'], 'Platinum')
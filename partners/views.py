@@ -1,6 +1,7 @@
 from rest_framework import generics
 from rest_framework.permissions import AllowAny
 from drf_spectacular.utils import extend_schema, extend_schema_view
+from core.response_cache import CachedResponseMixin
 from .models import (
     Partner,
      Contributor,
@@ -23,11 +24,12 @@ from .serializers import (
         tags=["Partners"]
     )
 )
-class PartnerListView(generics.ListAPIView):
+class PartnerListView(CachedResponseMixin, generics.ListAPIView):
     queryset = Partner.objects.filter(is_active=True).select_related(
         'tier', 'partner_type'
     )
     serializer_class = PartnerSerializer
+    cache_collections = ('partners',)
     permission_classes = [AllowAny]
 
 @extend_schema_view(
@@ -37,9 +39,10 @@ class PartnerListView(generics.ListAPIView):
         tags=["Partners"]
     )
 )
-class PartnerDetailView(generics.RetrieveAPIView):
+class PartnerDetailView(CachedResponseMixin, generics.RetrieveAPIView):
     queryset = Partner.objects.select_related('tier', 'partner_type')
     serializer_class = PartnerSerializer
+    cache_collections = ('partners',)
     permission_classes = [AllowAny]
     
 
@@ -55,9 +58,10 @@ class PartnerDetailView(generics.RetrieveAPIView):
         tags=["Contributors"]
     )
 )
-class ContributorListView(generics.ListAPIView):
+class ContributorListView(CachedResponseMixin, generics.ListAPIView):
     queryset = Contributor.objects.filter(is_active=True).select_related('role')
     serializer_class = ContributorSerializer
+    cache_collections = ('contributors',)
     permission_classes = [AllowAny]
 
 
@@ -68,9 +72,10 @@ class ContributorListView(generics.ListAPIView):
         tags=["Contributors"]
     )
 )
-class ContributorDetailView(generics.RetrieveAPIView):
+class ContributorDetailView(CachedResponseMixin, generics.RetrieveAPIView):
     queryset = Contributor.objects.select_related('role')
     serializer_class = ContributorSerializer
+    cache_collections = ('contributors',)
     permission_classes = [AllowAny]
 
 
@@ -82,9 +87,10 @@ class ContributorDetailView(generics.RetrieveAPIView):
         tags=["Sponsors"]
     )
 )
-class SponsorListView(generics.ListAPIView):
+class SponsorListView(CachedResponseMixin, generics.ListAPIView):
     queryset = Sponsor.objects.filter(is_active=True).select_related('level')
     serializer_class = SponsorSerializer
+    cache_collections = ('sponsors',)
     permission_classes = [AllowAny]
 
 
@@ -95,10 +101,10 @@ class SponsorListView(generics.ListAPIView):
         tags=["Sponsors"]
     )
 )
-class SponsorDetailView(generics.RetrieveAPIView):
+class SponsorDetailView(CachedResponseMixin, generics.RetrieveAPIView):
     queryset = Sponsor.objects.filter(is_active=True).select_related('level')
     serializer_class = SponsorSerializer
-    lookup_field = 'slug'
+    cache_collections = ('sponsors',)
     permission_classes = [AllowAny]
 
 
@@ -110,9 +116,10 @@ class SponsorDetailView(generics.RetrieveAPIView):
         tags=["Supporters"]
     )
 )
-class SupporterListView(generics.ListAPIView):
+class SupporterListView(CachedResponseMixin, generics.ListAPIView):
     queryset = Supporter.objects.filter(is_active=True)
     serializer_class = SupporterSerializer
+    cache_collections = ('supporters',)
     permission_classes = [AllowAny]
 
 
@@ -123,8 +130,8 @@ class SupporterListView(generics.ListAPIView):
         tags=["Supporters"]
     )
 )
-class SupporterDetailView(generics.RetrieveAPIView):
+class SupporterDetailView(CachedResponseMixin, generics.RetrieveAPIView):
     queryset = Supporter.objects.filter(is_active=True)
     serializer_class = SupporterSerializer
-    lookup_field = 'slug'
+    cache_collections = ('supporters',)
     permission_classes = [AllowAny]
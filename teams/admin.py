@@ -1,4 +1,5 @@
 from django.contrib import admin
+from core.forms import INGESTED_IMAGE_OVERRIDES
 from .models import TeamModel, SocialModel
 
 
@@ -10,6 +11,7 @@ class SocialInline(admin.TabularInline):
 
 @admin.register(TeamModel)
 class TeamModelAdmin(admin.ModelAdmin):
+    formfield_overrides = INGESTED_IMAGE_OVERRIDES
     list_display = [
         'fullName', 'position', 'is_active', 'join_date'
     ]
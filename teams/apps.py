@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class TeamsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "teams"
+
+    def ready(self):
+        from core.cache_versions import track_collection
+        from core.images import register_image_variants
+        from teams.models import SocialModel, TeamModel
+
+        track_collection('teams', TeamModel, SocialModel)
+        register_image_variants(TeamModel, 'image')
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-18 16:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teams", "0002_alter_teammodel_options_teammodel_order"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="teammodel",
+            name="image_variants",
+            field=models.JSONField(
+                blank=True, default=dict, editable=False, verbose_name="Image Variants"
+            ),
+        ),
+    ]
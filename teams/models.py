@@ -10,6 +10,7 @@ class TeamModel(models.Model):
     position = models.CharField(max_length=100,blank=False, null=False, verbose_name="Position")
     bio = models.TextField(blank=True, null=True, verbose_name="Bio")
     image = models.ImageField(upload_to='team_images/', blank=True, null=True, verbose_name="Profile Image")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Image Variants")
     is_active = models.BooleanField(default=True, verbose_name="Is Active")
     join_date = models.DateField(auto_now_add=True, verbose_name="Join Date")
     order = models.PositiveIntegerField(
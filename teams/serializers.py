@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from teams.models import TeamModel, SocialModel
 from drf_spectacular.utils import extend_schema_field
+from core.images import ImageSrcsetField
 
 
 class SocialSerializer(serializers.ModelSerializer):
@@ -12,6 +13,7 @@ class SocialSerializer(serializers.ModelSerializer):
 class TeamSerializer(serializers.ModelSerializer):
     socials = SocialSerializer(many=True, read_only=True)
     image_url = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source='image_variants')
     
     @extend_schema_field(serializers.URLField)
     def get_image_url(self, obj):
@@ -27,7 +29,7 @@ class TeamSerializer(serializers.ModelSerializer):
         model = TeamModel
         fields = [
             'id', 'fullName', 'position', 'bio', 'image', 'image_url',
-            'is_active', 'join_date', 'socials'
+            'image_srcset', 'is_active', 'join_date', 'socials'
         ]
         read_only_fields = ['join_date']
 
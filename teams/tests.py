@@ -1,3 +1,53 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from teams.models import SocialModel, TeamModel
+
+
+class TeamStatsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            ada = TeamModel.objects.create(fullName='Ada Lovelace', position='Organizer')
+            TeamModel.objects.create(fullName='Alan Turing', position='Organizer', is_active=False)
+            TeamModel.objects.create(fullName='Grace Hopper', position='Mentor')
+            SocialModel.objects.create(team=ada, platform='github', url='https://github.com/ada')
+            SocialModel.objects.create(team=ada, platform='linkedin', url='https://linkedin.com/in/ada')
+        self.ada = ada
+        self.url = reverse('team-stats')
+
+    def test_counts_members_positions_and_platforms(self):
+        with self.assertNumQueries(2):
+            data = self.client.get(self.url, HTTP_ACCEPT='application/json').json()
+
+        self.assertEqual(data['total_members'], 3)
+        self.assertEqual(data['active_members'], 2)
+        self.assertEqual(data['inactive_members'], 1)
+        self.assertEqual(data['position_statistics'], {
+            'Mentor': {'total': 1, 'active': 1},
+            'Organizer': {'total': 2, 'active': 1},
+        })
+        self.assertEqual(
+            list(data['platform_statistics']),
+            [platform for platform, _ in SocialModel.PLATFORM_CHOICES],
+        )
+        self.assertEqual(data['platform_statistics']['github'], 1)
+        self.assertEqual(data['platform_statistics']['email'], 0)
+
+    def test_repeated_requests_are_served_from_cache(self):
+        self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_social_change_invalidates_cached_stats(self):
+        self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SocialModel.objects.create(team=self.ada, platform='email', url='https://example.com/ada')
+        data = self.client.get(self.url, HTTP_ACCEPT='application/json').json()
+
+        self.assertEqual(data['platform_statistics']['email'], 1)
@@ -33,6 +33,6 @@ urlpatterns = [
     
     # Statistics
     path('api/teams/stats/',
-         views.team_stats,
+         views.TeamStatsView.as_view(),
          name='team-stats'),
 ]
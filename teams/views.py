@@ -1,7 +1,8 @@
 from teams.serializers import TeamSerializer, SocialSerializer
 from teams.models import TeamModel, SocialModel
+from core.response_cache import CachedResponseMixin
+from django.db.models import Count, Q
 from rest_framework import generics, status
-from rest_framework.decorators import api_view
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from drf_spectacular.utils import (
@@ -27,7 +28,7 @@ from drf_spectacular.types import OpenApiTypes
         tags=["Teams"]
     )
 )
-class TeamListCreateView(generics.ListCreateAPIView):
+class TeamListCreateView(CachedResponseMixin, generics.ListCreateAPIView):
     """
     API endpoint for listing all team members and creating new ones.
     """
@@ -36,6 +37,7 @@ class TeamListCreateView(generics.ListCreateAPIView):
     )
     serializer_class = TeamSerializer
     permission_classes = [AllowAny]
+    cache_collections = ('teams',)
 
 
 @extend_schema_view(
@@ -63,7 +65,7 @@ class TeamListCreateView(generics.ListCreateAPIView):
         tags=["Teams"]
     )
 )
-class TeamRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class TeamRetrieveUpdateDestroyView(CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API endpoint for retrieving, updating, and deleting individual
     team members.
@@ -71,6 +73,7 @@ class TeamRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     queryset = TeamModel.objects.prefetch_related('socials').all()
     serializer_class = TeamSerializer
     permission_classes = [AllowAny]
+    cache_collections = ('teams',)
     
 
 
@@ -81,7 +84,7 @@ class TeamRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         tags=["Teams"]
     )
 )
-class ActiveTeamMembersView(generics.ListAPIView):
+class ActiveTeamMembersView(CachedResponseMixin, generics.ListAPIView):
     """
     API endpoint for listing only active team members.
     """
@@ -90,6 +93,7 @@ class ActiveTeamMembersView(generics.ListAPIView):
     )
     serializer_class = TeamSerializer
     permission_classes = [AllowAny]
+    cache_collections = ('teams',)
 
 
 @extend_schema_view(
@@ -211,38 +215,50 @@ class TeamMembersByPlatformView(generics.ListAPIView):
         ).prefetch_related('socials').distinct()
 
 
-@extend_schema(
-    summary="Get team statistics",
-    description=(
-        "Get statistics about the team including total members, "
-        "active members, and platform counts."
-    ),
-    tags=["Teams"]
+@extend_schema_view(
+    get=extend_schema(
+        summary="Get team statistics",
+        description=(
+            "Get statistics about the team including total members, "
+            "active members, per-position and per-platform counts."
+        ),
+        responses={200: OpenApiTypes.OBJECT},
+        tags=["Teams"]
+    )
 )
-@api_view(['GET'])
-def team_stats(request):
+class TeamStatsView(CachedResponseMixin, generics.RetrieveAPIView):
     """
     API endpoint for getting team statistics.
     """
-    total_members = TeamModel.objects.count()
-    active_members = TeamModel.objects.filter(is_active=True).count()
-    inactive_members = total_members - active_members
-    
-    # Platform statistics
-    platform_stats = {}
-    platforms = [
-        'linkedin', 'twitter', 'github', 'instagram',
-        'facebook', 'portfolio', 'email'
-    ]
-    
-    for platform in platforms:
-        count = SocialModel.objects.filter(platform=platform).count()
-        platform_stats[platform] = count
-    
-    return Response({
-        'total_members': total_members,
-        'active_members': active_members,
-        'inactive_members': inactive_members,
-        'platform_statistics': platform_stats
-    }, status=status.HTTP_200_OK)
+    permission_classes = [AllowAny]
+    cache_collections = ('teams',)
+
+    def retrieve(self, request, *args, **kwargs):
+        # One grouped query per table; totals are summed from the groups
+        positions = TeamModel.objects.values('position').annotate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+        ).order_by('position')
+        position_stats = {
+            row['position']: {'total': row['total'], 'active': row['active']}
+            for row in positions
+        }
+        total_members = sum(row['total'] for row in position_stats.values())
+        active_members = sum(row['active'] for row in position_stats.values())
+
+        platform_counts = dict(
+            SocialModel.objects.values_list('platform')
+            .annotate(count=Count('id')).order_by()
+        )
+        platform_stats = {
+            platform: platform_counts.get(platform, 0)
+            for platform, _ in SocialModel.PLATFORM_CHOICES
+        }
 
+        return Response({
+            'total_members': total_members,
+            'active_members': active_members,
+            'inactive_members': total_members - active_members,
+            'position_statistics': position_stats,
+            'platform_statistics': platform_stats
+        }, status=status.HTTP_200_OK)